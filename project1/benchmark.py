@@ -0,0 +1,136 @@
+import gc
+import random
+import time
+from collections import namedtuple
+
+# BENCHMARK HARNESS
+#   A call is timed with perf_counter_ns, after warm-up runs and with the garbage collector off, and
+#   repeated until enough time was measured (at least min_time seconds and min_repeats samples).
+#   Calls slower than min_time are not repeated: their first run is the only sample.
+#
+#   The state of the `random` module is restored before every run, so every run sees the same
+#   random numbers and the results don't depend on how many times a call was repeated.
+
+Timing = namedtuple("Timing", ["median", "min", "iqr", "samples", "times"])  # ms, times = every sample
+
+
+def percentile(sorted_times, fraction):
+    position = (len(sorted_times) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(sorted_times) - 1)
+    return sorted_times[low] + (sorted_times[high] - sorted_times[low]) * (position - low)
+
+
+def summarize(times):
+    """
+    Timing of a list of samples (in ms).
+    """
+    ordered = sorted(times)
+    return Timing(percentile(ordered, 0.5), ordered[0],
+                  percentile(ordered, 0.75) - percentile(ordered, 0.25), len(times), list(times))
+
+
+def measure(function, *args, warmup=1, min_time=0.05, min_repeats=3, max_repeats=1000, **kwargs):
+    """
+    Time function(*args, **kwargs).
+
+    :param warmup: Untimed runs first (stopped early by a run longer than min_time, which becomes the sample).
+    :param min_time: Seconds of measured runs to reach before stopping.
+    :param min_repeats: Samples to take at least (unless a run takes longer than min_time).
+    :param max_repeats: Samples to take at most.
+    :return: (result of the last run, Timing)
+    """
+    random_state = random.getstate()
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+
+    times = []
+    try:
+        for _ in range(warmup):
+            random.setstate(random_state)
+            start = time.perf_counter_ns()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            if elapsed >= min_time * 1e9:
+                times.append(elapsed / 1e6)  # Too slow to repeat, warm-up effects don't matter here
+                return result, summarize(times)
+
+        total = 0
+        while len(times) < max_repeats and (total < min_time * 1e9 or len(times) < min_repeats):
+            random.setstate(random_state)
+            start = time.perf_counter_ns()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            times.append(elapsed / 1e6)
+            total += elapsed
+            if elapsed >= min_time * 1e9:
+                break  # A single run is enough measurement
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return result, summarize(times)
+
+
+# MODES: timing runs and operation counts are separate passes
+#   Algorithms whose counters sit in their inner loops take a `count` keyword: with count=False they run a
+#   kernel without counters (and return None counts), which is the one timed. The counts come from one
+#   more run with count=True, which gives the same counts whether or not the timing pass ran.
+MODES = ("both", "timing", "counts")
+
+
+def measure_counts(function, *args, mode="both", timing=None, counted=True, **kwargs):
+    """
+    Time and/or count function(*args, **kwargs), whose result is (chromatic_number, *counts).
+
+    :param mode: "timing" (timed runs only), "counts" (one untimed run for the counts) or "both".
+    :param timing: Keyword arguments for measure.
+    :param counted: Whether the function takes the `count` keyword. Without it (counts computed outside
+                    the hot loops, e.g. from the colors) the timed result already holds the counts.
+    :return: (result, Timing or None when not timed)
+    """
+    random_state = random.getstate()
+    result = timed = None
+
+    if mode != "counts":
+        if counted:
+            kwargs["count"] = False
+        result, timed = measure(function, *args, **(timing or {}), **kwargs)
+
+    if mode != "timing" and (counted or result is None):
+        random.setstate(random_state)  # Same random numbers as the timed runs
+        if counted:
+            kwargs["count"] = True
+        result = function(*args, **kwargs)
+
+    return result, timed
+
+
+# RAW SAMPLES: one CSV row per timed run, next to the results CSVs
+RAW_HEADERS = ['Algorithm', 'Vertices', 'Edges', 'Sample', 'Time (ms)']
+
+
+def sample_rows(algorithm, num_vertices, edges, timing):
+    if timing is None:
+        return []
+    return [[algorithm, num_vertices, edges, i, f"{sample:.6f}"] for i, sample in enumerate(timing.times)]
+
+
+def time_column(timing):
+    """
+    Exec Time column: the median, empty when the algorithm wasn't timed.
+    """
+    return f"{timing.median:.4f}" if timing is not None else ""
+
+
+def timing_columns(timing):
+    """
+    Columns appended to the results rows: min, IQR and number of samples (the median is the Exec Time).
+    """
+    if timing is None:
+        return ["", "", ""]
+    return [f"{timing.min:.4f}", f"{timing.iqr:.4f}", timing.samples]
+
+
+TIMING_HEADERS = ['Min Time', 'Time IQR', 'Samples']
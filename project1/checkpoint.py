@@ -0,0 +1,112 @@
+import json
+import sqlite3
+
+# SWEEP CHECKPOINTS: the rows of every finished (vertices, edge %, algorithm) cell of a sweep, in an SQLite file
+#
+#   cells(vertices, edge_percentage, algorithm, row, raw)    row: the algorithm's CSV row (JSON, null when it
+#                                                            didn't run on that cell), raw: its timed runs
+#
+#   Each cell is committed in one transaction as soon as it comes back from the workers (in cell order), so an interrupted
+#   sweep loses at most the cells still running. A resumed sweep skips the stored cells, runs only the
+#   algorithms a cell is missing (a new one, or one dropped to run it again) and rewrites the CSVs from the store.
+#   The other algorithms of such a cell don't run at all: run_cell gets their stored rows as settings["kept"]
+#   and takes what the missing ones need from them (chromatic numbers, the clique bound).
+#   A checkpoint belongs to one sweep: opening it with another seed or mode is an error.
+#   The web graph sweep keys its cells by (vertices, graph file): the file name goes in the edge_percentage column.
+
+
+def open_checkpoint(path, sweep):
+    """
+    Open (or create) a checkpoint file.
+
+    :param sweep: What makes two runs the same sweep (e.g. {"seed": ..., "mode": ...}), kept in the file.
+    :return: sqlite3 connection.
+    """
+    checkpoint = sqlite3.connect(path)
+    with checkpoint:
+        checkpoint.execute("CREATE TABLE IF NOT EXISTS sweep (key TEXT PRIMARY KEY)")
+        checkpoint.execute("CREATE TABLE IF NOT EXISTS cells (vertices INTEGER, edge_percentage REAL, algorithm TEXT, "
+                           "row TEXT, raw TEXT, PRIMARY KEY (vertices, edge_percentage, algorithm))")
+        key = json.dumps(sweep, sort_keys=True)
+        stored = checkpoint.execute("SELECT key FROM sweep").fetchone()
+        if stored is None:
+            checkpoint.execute("INSERT INTO sweep VALUES (?)", (key,))
+
+    if stored is not None and stored[0] != key:
+        checkpoint.close()
+        raise ValueError(f"Checkpoint {path} belongs to another sweep ({stored[0]}), not {key}")
+    return checkpoint
+
+
+def drop_algorithms(checkpoint, algorithms):
+    """
+    Forget the stored rows of some algorithms, so the next run of the sweep runs them again.
+    """
+    with checkpoint:
+        checkpoint.executemany("DELETE FROM cells WHERE algorithm = ?", [(algorithm,) for algorithm in algorithms])
+
+
+def load_cells(checkpoint):
+    """
+    :return: {(vertices, edge_percentage): {algorithm: (row, raw rows)}}
+    """
+    cells = {}
+    for vertices, edge_percentage, algorithm, row, raw in checkpoint.execute("SELECT * FROM cells"):
+        cells.setdefault((vertices, edge_percentage), {})[algorithm] = (json.loads(row), json.loads(raw))
+    return cells
+
+
+def split_rows(rows, algorithms):
+    """
+    {algorithm: (row, raw rows)} of some algorithms from the rows of run_cell, the raw rows split by their
+    first column (the algorithm).
+    """
+    return {algorithm: (rows[algorithm], [sample for sample in rows["raw"] if sample[0] == algorithm])
+            for algorithm in algorithms}
+
+
+def save_cell(checkpoint, cell, entries):
+    """
+    Store {algorithm: (row, raw rows)} of a cell in one transaction.
+    """
+    with checkpoint:
+        checkpoint.executemany("INSERT OR REPLACE INTO cells VALUES (?, ?, ?, ?, ?)",
+                               [(*cell, algorithm, json.dumps(row, default=plain_number), json.dumps(raw))
+                                for algorithm, (row, raw) in entries.items()])
+
+
+def plain_number(value):
+    return value.item()  # NumPy scalars in the rows
+
+
+def resume_cells(map_cells, function, cells, settings, workers, checkpoint, algorithms):
+    """
+    Rows of every cell, in cell order, like map_cells(function, cells, settings, workers), but with the
+    cells (or the algorithms of a cell) already in the checkpoint taken from it and the others stored.
+
+    :param checkpoint: Connection from open_checkpoint, or None to run every cell without one.
+    :param algorithms: Algorithms of a finished cell (the keys of run_cell's rows other than "raw").
+    """
+    if checkpoint is None:
+        yield from map_cells(function, cells, settings, workers)
+        return
+
+    stored = load_cells(checkpoint)
+    missing = {cell: [algorithm for algorithm in algorithms if algorithm not in stored.get(cell, {})] for cell in cells}
+    pending = [cell for cell in cells if missing[cell]]
+    # A partly stored cell gets the stored rows of the algorithms it doesn't run again
+    kept = {cell: {algorithm: stored[cell][algorithm][0] for algorithm in algorithms if algorithm in stored[cell]}
+            for cell in pending if cell in stored}
+    fresh = map_cells(function, pending, [dict(settings, kept=kept[cell]) if cell in kept else settings for cell in pending],
+                      workers)
+
+    for cell in cells:
+        entries = stored.get(cell, {})
+        if missing[cell]:
+            new_entries = split_rows(next(fresh), missing[cell])
+            save_cell(checkpoint, cell, new_entries)
+            entries.update(new_entries)
+
+        rows = {"raw": [sample for algorithm in algorithms for sample in entries[algorithm][1]]}
+        rows.update((algorithm, entries[algorithm][0]) for algorithm in algorithms)
+        yield rows
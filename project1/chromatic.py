@@ -1,48 +1,20 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+import argparse
 import numpy as np
 import random
-import time
 import csv
-from itertools import combinations, product
+from itertools import product
+from graph_utils import generate_random_graph, graph_to_csr, csr_degrees, csr_greedy_coloring, csr_smallest_last_order
+from exhaustive import batch_exhaustive_chromatic_number
+from max_clique import maximum_clique
+from benchmark import measure, sample_rows, TIMING_HEADERS, RAW_HEADERS
+from results_store import open_store, start_run, append_results
+from checkpoint import open_checkpoint, drop_algorithms, resume_cells
+from sweep import cell_seed, map_cells
 
 studentN = 103199
 random.seed(studentN)
 
 
-def generate_unique_points(num_points, min_distance=10):
-    points = set()
-    while len(points) < num_points:
-        x = random.randint(1, 1000)
-        y = random.randint(1, 1000)
-        point = (x, y)
-
-        # Ensure points are unique and not too close to each other
-        if all(np.linalg.norm(np.array(point) - np.array(p)) >= min_distance for p in points):
-            points.add(point)
-
-    return list(points)
-
-
-def generate_random_graph(num_vertices, edge_percentage):
-    points = generate_unique_points(num_vertices)
-    G = nx.Graph()
-    
-    for i, point in enumerate(points):
-        G.add_node(i, pos=point)
-    
-    max_edges = num_vertices * (num_vertices - 1) // 2
-    num_edges = int(max_edges * edge_percentage)
-
-    possible_edges = list(combinations(range(num_vertices), 2))
-    random_edges = random.sample(possible_edges, num_edges)
-
-    G.add_edges_from(random_edges)
-    
-    return G
-
-
-
 # EXAUSTIVE SEARCH
 
 def is_valid_coloring(graph, coloring):
@@ -109,70 +81,166 @@ def greedy_chromatic_number_bottom(graph):
     return chromatic_number
 
 
+# GREEDY HEURISTIC (TOP / BOTTOM) over the CSR adjacency (same orders and colors as above)
+
+def csr_greedy_chromatic_number_top(csr):
+    # Descending degree, ties kept in node order (like the stable sorted() above)
+    vertices = np.argsort(-csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+    return int(colors.max()) + 1
+
+def csr_greedy_chromatic_number_bottom(csr):
+    # Ascending degree, ties kept in node order
+    vertices = np.argsort(csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+    return int(colors.max()) + 1
+
+
+# GREEDY HEURISTIC (SMALLEST LAST): minimum degree vertices removed first and colored last,
+# so every vertex has at most degeneracy neighbors colored before it
+
+def csr_greedy_chromatic_number_smallest_last(csr):
+    vertices, degeneracy = csr_smallest_last_order(csr)
+    colors = csr_greedy_coloring(csr, vertices)
+    return int(colors.max()) + 1, degeneracy  # At most degeneracy + 1 colors
+
+
+
+# ONE (VERTICES, EDGE %) CELL OF THE SWEEP: average times of every algorithm on one random graph
+def timed_row(num_vertices, possible_edges, chromatic_number, timing):
+    # Row of a timed algorithm (checkpointed as is): its chromatic number and its runs' median, min, IQR and samples
+    return [num_vertices, possible_edges, chromatic_number, timing.median, timing.min, timing.iqr, timing.samples]
 
 
-def main():
+def run_cell(num_vertices, possible_edges, settings):
+    timing = settings["timing"]  # Benchmark harness options (see benchmark.measure)
+    exhaustive_max_vertices = settings["exhaustive_max_vertices"]
+    # A resumed cell runs only the algorithms it is missing, the others' rows are in the checkpoint (see checkpoint.py)
+    kept = settings.get("kept", {})
+    random.seed(cell_seed(settings["seed"], num_vertices, possible_edges))
+
+    rows = {"exhaustive": None, "raw": []}
+
+    G = generate_random_graph(num_vertices, possible_edges / 100)  # Generate the graph
+    csr = graph_to_csr(G)  # Compact adjacency used by the greedy kernels
+
+    # Greedy Top
+    if "greedy_top" not in kept:
+        chromatic_num_greedy_top, greedy_top_timing = measure(csr_greedy_chromatic_number_top, csr, **timing)
+        rows["raw"] += sample_rows("greedy_top", num_vertices, possible_edges, greedy_top_timing)
+        rows["greedy_top"] = timed_row(num_vertices, possible_edges, chromatic_num_greedy_top, greedy_top_timing)
+
+    # Greedy Bottom
+    if "greedy_bottom" not in kept:
+        chromatic_num_greedy_bottom, greedy_bottom_timing = measure(csr_greedy_chromatic_number_bottom, csr, **timing)
+        rows["raw"] += sample_rows("greedy_bottom", num_vertices, possible_edges, greedy_bottom_timing)
+        rows["greedy_bottom"] = timed_row(num_vertices, possible_edges, chromatic_num_greedy_bottom, greedy_bottom_timing)
+
+    # Greedy Smallest Last (its row ends with the degeneracy)
+    if "greedy_smallest_last" not in kept:
+        (chromatic_num_greedy_smallest_last, degeneracy), greedy_smallest_last_timing = measure(
+            csr_greedy_chromatic_number_smallest_last, csr, **timing)
+        rows["raw"] += sample_rows("greedy_smallest_last", num_vertices, possible_edges, greedy_smallest_last_timing)
+        rows["greedy_smallest_last"] = (timed_row(num_vertices, possible_edges, chromatic_num_greedy_smallest_last,
+                                                  greedy_smallest_last_timing) + [degeneracy])
+
+    # Exhaustive Search (max 11 vertices)
+    if "exhaustive" not in kept and num_vertices <= exhaustive_max_vertices:
+        # Bounds for the exhaustive search: a clique from below, the greedy coloring from above
+        upper_bound = csr_greedy_chromatic_number_top(csr)
+        clique, _ = maximum_clique(csr, settings["clique_time_budget"], upper_bound=upper_bound)
+
+        # Times only, no counters: the batched search in this process (a process pool costs more than it saves)
+        (chromatic_num_exhaustive, _, _), exhaustive_timing = measure(
+            batch_exhaustive_chromatic_number, G,
+            lower_bound=len(clique), upper_bound=upper_bound, count=False, **timing)
+        rows["raw"] += sample_rows("exhaustive", num_vertices, possible_edges, exhaustive_timing)
+        rows["exhaustive"] = timed_row(num_vertices, possible_edges, chromatic_num_exhaustive, exhaustive_timing)
+
+    # Rows of the algorithms that ran (exhaustive: None above its size limit)
+    return rows
+
+
+def main(workers=1, store_path="results.db", checkpoint_path=None, rerun=()):
     edges = [12.5, 25, 50, 75]
-    trials = 3
     maxVertices = 500
+    settings = {
+        "timing": {"warmup": 1, "min_time": 0.05, "min_repeats": 3},  # Per algorithm and graph (see benchmark.py)
+        "seed": studentN,  # Every cell is seeded from this and its (vertices, edge %)
+        "exhaustive_max_vertices": 11,
+        "clique_time_budget": 1.0,  # Seconds of maximum clique search per graph (lower bound)
+    }
+    algorithms = ["greedy_top", "greedy_bottom", "greedy_smallest_last", "exhaustive"]
+
+    # The times and chromatic numbers are also appended to the results store, read by plots.py (see results_store.py)
+    store = open_store(store_path)
+    run = start_run(store, "chromatic.py")
+    store_header = ['Vertices', 'Chromatic Number', 'Exec Time'] + TIMING_HEADERS
+
+    # With a checkpoint, finished cells are skipped and the CSVs rewritten from it (see checkpoint.py)
+    checkpoint = open_checkpoint(checkpoint_path, {"seed": settings["seed"], "mode": "timing"}) if checkpoint_path else None
+    if checkpoint is not None and rerun:
+        drop_algorithms(checkpoint, rerun)
 
     with open('exec_times/greedy_top_times.csv', mode='w', newline='') as greedy_top_file, \
          open('exec_times/greedy_bottom_times.csv', mode='w', newline='') as greedy_bottom_file, \
-         open('exec_times/exhaustive_times.csv', mode='w', newline='') as exhaustive_file:
+         open('exec_times/greedy_smallest_last_times.csv', mode='w', newline='') as greedy_smallest_last_file, \
+         open('exec_times/greedy_colors.csv', mode='w', newline='') as greedy_colors_file, \
+         open('exec_times/exhaustive_times.csv', mode='w', newline='') as exhaustive_file, \
+         open('exec_times/timing_summary.csv', mode='w', newline='') as summary_file, \
+         open('exec_times/raw_times.csv', mode='w', newline='') as raw_file:
 
         greedy_top_writer = csv.writer(greedy_top_file)
         greedy_bottom_writer = csv.writer(greedy_bottom_file)
+        greedy_smallest_last_writer = csv.writer(greedy_smallest_last_file)
+        greedy_colors_writer = csv.writer(greedy_colors_file)  # Colors used by each order, next to the degeneracy
         exhaustive_writer = csv.writer(exhaustive_file)
+        # The grids hold the median times; the min, IQR and number of samples of every cell are in the summary
+        summary_writer = csv.writer(summary_file)
+        raw_writer = csv.writer(raw_file)  # Every timed run (see benchmark.py)
 
         headers = ['Vertices / Edge %'] + [f'{edge}%' for edge in edges]
         greedy_top_writer.writerow(headers)
         greedy_bottom_writer.writerow(headers)
+        greedy_smallest_last_writer.writerow(headers)
+        greedy_colors_writer.writerow(['Vertices', 'Edge %', 'Greedy Top', 'Greedy Bottom', 'Greedy Smallest Last', 'Degeneracy'])
         exhaustive_writer.writerow(headers)
+        summary_writer.writerow(['Algorithm', 'Vertices', 'Edge %', 'Exec Time'] + TIMING_HEADERS)
+        raw_writer.writerow(RAW_HEADERS)
 
+        cells = [(num_vertices, possible_edges) for num_vertices in range(4, maxVertices + 1) for possible_edges in edges]
+        results = resume_cells(map_cells, run_cell, cells, settings, workers, checkpoint, algorithms)
+
+        # Cells come back in order, one CSV row per number of vertices
         for num_vertices in range(4, maxVertices + 1):  # Adjusted range to include maxVertices
 
             greedy_top_row = [num_vertices]
             greedy_bottom_row = [num_vertices]
+            greedy_smallest_last_row = [num_vertices]
             exhaustive_row = [num_vertices]
 
             for possible_edges in edges:
+                cell = next(results)
+                raw_writer.writerows(cell["raw"])
+                timed = {name: cell[name] for name in algorithms if cell[name] is not None}
+                for name, (_, _, _, median, minimum, iqr, samples, *_) in timed.items():
+                    summary_writer.writerow([name, num_vertices, possible_edges, f"{median:.4f}", f"{minimum:.4f}", f"{iqr:.4f}", samples])
+
+                chromatic_num_greedy_top, avg_greedy_top_time = cell["greedy_top"][2:4]
+                chromatic_num_greedy_bottom, avg_greedy_bottom_time = cell["greedy_bottom"][2:4]
+                chromatic_num_greedy_smallest_last, avg_greedy_smallest_last_time = cell["greedy_smallest_last"][2:4]
+                degeneracy = cell["greedy_smallest_last"][-1]
+                chromatic_num_exhaustive, avg_exhaustive_time = cell["exhaustive"][2:4] if cell["exhaustive"] is not None else (None, None)
 
-                greedy_top_times = []
-                greedy_bottom_times = []
-                exhaustive_times = []
-
-                G = generate_random_graph(num_vertices, possible_edges / 100)  # Generate the graph
-
-                for trial in range(trials):
-                    # Greedy Top
-                    start = time.time()
-                    chromatic_num_greedy_top = greedy_chromatic_number_top(G)
-                    end = time.time()
-                    greedy_top_times.append((end - start) * 10**3)
-
-                    # Greedy Bottom
-                    start = time.time()
-                    chromatic_num_greedy_bottom = greedy_chromatic_number_bottom(G)
-                    end = time.time()
-                    greedy_bottom_times.append((end - start) * 10**3)
-
-                    # Exhaustive Search (max 11 vertices)
-                    if num_vertices <= 11:
-                        start = time.time()
-                        chromatic_num_exhaustive = None
-                        chromatic_num_exhaustive = exhaustive_chromatic_number(G)
-                        end = time.time()
-                        exhaustive_times.append((end - start) * 10**3)
-
-
-                avg_greedy_top_time = sum(greedy_top_times) / trials
-                avg_greedy_bottom_time = sum(greedy_bottom_times) / trials
-                
                 greedy_top_row.append(avg_greedy_top_time)
                 greedy_bottom_row.append(avg_greedy_bottom_time)
+                greedy_smallest_last_row.append(avg_greedy_smallest_last_time)
+                greedy_colors_writer.writerow([num_vertices, possible_edges, chromatic_num_greedy_top, chromatic_num_greedy_bottom,
+                                               chromatic_num_greedy_smallest_last, degeneracy])
+                store_rows = {name: [num_vertices] + row[2:7] for name, row in timed.items()}
+                append_results(store, run, "random", store_rows, dict.fromkeys(store_rows, store_header), possible_edges)
 
-                if num_vertices <= 11:
-                    avg_exhaustive_time = sum(exhaustive_times) / trials
+                if avg_exhaustive_time is not None:
                     exhaustive_row.append(avg_exhaustive_time)
 
 
@@ -185,16 +253,33 @@ def main():
                 print(f"\nGreedy Chromatic Number (Bottom): "+str(chromatic_num_greedy_bottom))
                 print(f"Greedy (Bottom) Execution Time: {avg_greedy_bottom_time:.4f} ms")
 
-                print(f"\nExaustive Chromatic Number: "+str(chromatic_num_exhaustive))
-                print(f"Exhaustive Execution Time: {avg_exhaustive_time:.4f} ms")
+                print(f"\nGreedy Chromatic Number (Smallest Last): "+str(chromatic_num_greedy_smallest_last)+f" (degeneracy {degeneracy})")
+                print(f"Greedy (Smallest Last) Execution Time: {avg_greedy_smallest_last_time:.4f} ms")
+
+                if avg_exhaustive_time is not None:
+                    print(f"\nExaustive Chromatic Number: "+str(chromatic_num_exhaustive))
+                    print(f"Exhaustive Execution Time: {avg_exhaustive_time:.4f} ms")
 
                 
             # Write rows to CSV files
             greedy_top_writer.writerow(greedy_top_row)
             greedy_bottom_writer.writerow(greedy_bottom_row)
-            if num_vertices <= 11:
+            greedy_smallest_last_writer.writerow(greedy_smallest_last_row)
+            if num_vertices <= settings["exhaustive_max_vertices"]:
                 exhaustive_writer.writerow(exhaustive_row)
 
+    store.close()
+    if checkpoint is not None:
+        checkpoint.close()
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Time the greedy and exhaustive searches on random graphs.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes running sweep cells in parallel")
+    parser.add_argument("--store", default="results.db", help="Results store the times are appended to")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file: store every finished cell there and skip the stored ones (resume)")
+    parser.add_argument("--rerun", action="append", default=[],
+                        help="Time an algorithm again on every cell of the checkpoint (e.g. greedy_top), keeping the others")
+    args = parser.parse_args()
+    main(args.workers, args.store, args.checkpoint, args.rerun)
@@ -6,46 +6,13 @@ import numpy as np
 import random
 import time
 import csv
-from itertools import combinations, product
+from itertools import product
+from graph_utils import generate_random_graph, csr_degrees, csr_greedy_coloring
 
 studentN = 103199
 random.seed(studentN)
 
 
-def generate_unique_points(num_points, min_distance=10):
-    points = set()
-    while len(points) < num_points:
-        x = random.randint(1, 1000)
-        y = random.randint(1, 1000)
-        point = (x, y)
-
-        # Ensure points are unique and not too close to each other
-        if all(np.linalg.norm(np.array(point) - np.array(p)) >= min_distance for p in points):
-            points.add(point)
-
-    return list(points)
-
-
-
-def generate_random_graph(num_vertices, edge_percentage):
-    points = generate_unique_points(num_vertices)
-    G = nx.Graph()
-    
-    for i, point in enumerate(points):
-        G.add_node(i, pos=point)
-    
-    max_edges = num_vertices * (num_vertices - 1) // 2
-    num_edges = int(max_edges * edge_percentage)
-
-    possible_edges = list(combinations(range(num_vertices), 2))
-    random_edges = random.sample(possible_edges, num_edges)
-
-    G.add_edges_from(random_edges)
-    
-    return G
-
-
-
 def visualize_graph(G, coloring, filename):
     plt.figure(figsize=(8, 6))
     
@@ -132,24 +99,42 @@ def greedy_chromatic_number_bottom(graph):
     return chromatic_number
 
 
+# GREEDY HEURISTIC (TOP / BOTTOM) over the CSR adjacency (same orders and colors as above)
+
+def csr_greedy_chromatic_number_top(csr):
+    # Descending degree, ties kept in node order (like the stable sorted() above)
+    vertices = np.argsort(-csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+    return int(colors.max()) + 1
+
+def csr_greedy_chromatic_number_bottom(csr):
+    # Ascending degree, ties kept in node order
+    vertices = np.argsort(csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+    return int(colors.max()) + 1
+
+
 
 def main():
     # edges = [12.5, 25, 50, 75]
     edges = [12.5]
 
     max_vertices = 10000    
+    rng = np.random.default_rng(studentN)  # O(edges) edge sampler, no list of every pair
 
     for num_vertices in range(4750, max_vertices+1):
 
         for possible_edges in edges:
             start = time.time()    
-            G = generate_random_graph(num_vertices, possible_edges/100) # calculate points
+            # Straight to the compact adjacency, no nx.Graph and no points (a full graph is needed to visualize it).
+            # Only the edges are generated, so this times the edge generation: beyond ~7000 vertices the points
+            # wouldn't even fit (see generate_unique_points)
+            csr = generate_random_graph(num_vertices, possible_edges/100, rng=rng, as_csr=True)
             end = time.time()
-            graph_generation_time = (end-start)*10**3
-
+            edge_generation_time = (end-start)*10**3
 
             start = time.time()    
-            chromatic_num_greedy_top = greedy_chromatic_number_top(G)
+            chromatic_num_greedy_top = csr_greedy_chromatic_number_top(csr)
             end = time.time()
             greedy_time_top = (end-start)*10**3
 
@@ -158,7 +143,7 @@ def main():
             print(f"Edges: "+str(possible_edges))
             print(f"Greedy Chromatic Number: "+str(chromatic_num_greedy_top))
             print(f"Greedy Execution Time: {greedy_time_top:.4f} ms")
-            print(f"Graph Generation Time: {graph_generation_time:.4f} ms")
+            print(f"Edge Generation Time: {edge_generation_time:.4f} ms")
 
             # visualize_graph(G, coloring, f"graph_{num_vertices}_{possible_edges}.png")
 
@@ -1,40 +1,23 @@
+import argparse
 import numpy as np
 import networkx as nx
 import random
-import time
 import csv
-from itertools import combinations, product
+from contextlib import nullcontext
+from itertools import product
+from graph_utils import generate_random_graph, graph_to_csr, csr_degrees, csr_greedy_coloring, csr_smallest_last_order
+from max_clique import maximum_clique
+from components import component_chromatic_number
+from reduction import reduce_graph, csr_reduced_greedy_coloring
+from results_store import open_store, start_run, append_results
+from checkpoint import open_checkpoint, drop_algorithms, resume_cells
+from sweep import cell_seed, map_cells
+from benchmark import measure_counts, sample_rows, time_column, timing_columns, MODES, TIMING_HEADERS, RAW_HEADERS
 
 # Set the random seed for reproducibility
 studentN = 103199
 random.seed(studentN)
 
-def generate_unique_points(num_points, min_distance=10):
-    points = set()
-    while len(points) < num_points:
-        x = random.randint(1, 1000)
-        y = random.randint(1, 1000)
-        point = (x, y)
-        
-        # Ensure points are unique and not too close to each other
-        if all(np.linalg.norm(np.array(point) - np.array(p)) >= min_distance for p in points):
-            points.add(point)
-
-    return list(points)
-
-def generate_random_graph(num_vertices, edge_percentage):
-    points = generate_unique_points(num_vertices)
-    G = nx.Graph()
-    for i, point in enumerate(points):
-        G.add_node(i, pos=point)
-
-    max_edges = num_vertices * (num_vertices - 1) // 2
-    num_edges = int(max_edges * edge_percentage)
-    possible_edges = list(combinations(range(num_vertices), 2))
-    random_edges = random.sample(possible_edges, num_edges)
-    G.add_edges_from(random_edges)
-    return G
-
 # Exhaustive Search with tracking of operations and configurations tested
 def is_valid_coloring(graph, coloring):
     basic_operations = 0
@@ -44,19 +27,119 @@ def is_valid_coloring(graph, coloring):
             return False, basic_operations
     return True, basic_operations
 
-def exhaustive_chromatic_number(graph):
+# Same check without counters, for the timed runs
+def is_proper_coloring(edges, coloring):
+    for u, v in edges:
+        if coloring[u] == coloring[v]:
+            return False
+    return True
+
+def exhaustive_chromatic_number(graph, lower_bound=1, upper_bound=None, count=True):
+    # Only colors between a lower bound (a clique size) and an upper bound (a known coloring) are tried
     n = len(graph.nodes())
+    if any(node != i for i, node in enumerate(graph.nodes())):
+        graph = nx.convert_node_labels_to_integers(graph)  # Colorings are indexed by vertex (e.g. components)
+    if not count:
+        return uncounted_exhaustive_chromatic_number(graph, n, lower_bound, upper_bound)
     basic_operations = 0
     configurations_tested = 0
 
-    for num_colors in range(1, n + 1):
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
         for coloring in product(range(num_colors), repeat=n):
             configurations_tested += 1
             is_valid, edge_operations = is_valid_coloring(graph, coloring)  # Check if valid and get edge operations
             basic_operations += edge_operations    
             if is_valid:                            # If the coloring is valid
                 return num_colors, basic_operations, configurations_tested
-    return n, basic_operations, configurations_tested  # Worst case
+    return n if upper_bound is None else upper_bound, basic_operations, configurations_tested  # Worst case
+
+def uncounted_exhaustive_chromatic_number(graph, n, lower_bound, upper_bound):
+    # The search above without counters (count=False): same colorings in the same order
+    edges = list(graph.edges())
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
+        for coloring in product(range(num_colors), repeat=n):
+            if is_proper_coloring(edges, coloring):
+                return num_colors, None, None
+    return n if upper_bound is None else upper_bound, None, None  # Worst case
+
+# Backtracking Exhaustive Search with tracking of operations and configurations tested
+#   Vertices are colored one at a time and each new color is only compared with the already colored
+#   neighbors. Only canonical colorings are enumerated (vertex i may use at most 1 + the largest color
+#   so far), so the k! relabelings of a coloring are tried once, and with k colors only colorings that
+#   use all k of them are tried (colorings with fewer colors were already rejected with k - 1).
+#   Each (vertex, color) assignment tried counts as a configuration and each neighbor comparison
+#   as a basic operation.
+def backtracking_chromatic_number(graph, lower_bound=1, upper_bound=None, count=True):
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    # Neighbors that come earlier in the order, the only ones already colored when a vertex is reached
+    previous_neighbors = [[index[u] for u in graph.neighbors(v) if index[u] < i] for i, v in enumerate(nodes)]
+    if not count:
+        return uncounted_backtracking_chromatic_number(previous_neighbors, lower_bound, upper_bound)
+
+    coloring = [0] * n
+    basic_operations = 0
+    configurations_tested = 0
+
+    def extend(i, max_color, num_colors):
+        nonlocal basic_operations, configurations_tested
+        # Not enough vertices left to use every one of the num_colors colors
+        if n - i < num_colors - (max_color + 1):
+            return False
+        if i == n:
+            return True
+
+        for color in range(min(max_color + 2, num_colors)):
+            configurations_tested += 1
+            valid = True
+            for u in previous_neighbors[i]:
+                basic_operations += 1
+                if coloring[u] == color:
+                    valid = False
+                    break
+
+            if valid:
+                coloring[i] = color
+                if extend(i + 1, max(max_color, color), num_colors):
+                    return True
+        return False
+
+    # Only colors between a lower bound (a clique size) and an upper bound (a known coloring) are tried
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
+        if extend(0, -1, num_colors):
+            return num_colors, basic_operations, configurations_tested
+    return n if upper_bound is None else upper_bound, basic_operations, configurations_tested  # Worst case
+
+def uncounted_backtracking_chromatic_number(previous_neighbors, lower_bound, upper_bound):
+    # The search above without counters (count=False): same assignments in the same order
+    n = len(previous_neighbors)
+    coloring = [0] * n
+
+    def extend(i, max_color, num_colors):
+        if n - i < num_colors - (max_color + 1):
+            return False
+        if i == n:
+            return True
+
+        for color in range(min(max_color + 2, num_colors)):
+            for u in previous_neighbors[i]:
+                if coloring[u] == color:
+                    break
+            else:
+                coloring[i] = color
+                if extend(i + 1, max(max_color, color), num_colors):
+                    return True
+        return False
+
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
+        if extend(0, -1, num_colors):
+            return num_colors, None, None
+    return n if upper_bound is None else upper_bound, None, None  # Worst case
 
 # Greedy Heuristic (Top) with tracking of operations and configurations tested
 def greedy_chromatic_number_top(graph):
@@ -80,77 +163,222 @@ def greedy_chromatic_number_top(graph):
     chromatic_number = max(coloring.values()) + 1
     return chromatic_number, basic_operations, configurations_tested
 
-# Main experiment function to log data to separate CSVs
-def main():
+# Greedy Heuristic (Top) over the CSR adjacency (same order, colors and counts as above)
+def csr_greedy_chromatic_number_top(csr):
+    # Descending degree, ties kept in node order (like the stable sorted() above)
+    vertices = np.argsort(-csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested
+
+# Greedy Heuristic (Smallest Last): degeneracy order from a bucket queue, at most degeneracy + 1 colors
+def csr_greedy_chromatic_number_smallest_last(csr):
+    vertices, degeneracy = csr_smallest_last_order(csr)
+    colors = csr_greedy_coloring(csr, vertices)
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested, degeneracy
+
+# Greedy Heuristic (Top) on the lower_bound-core, the peeled low-degree vertices colored last (see reduction.py)
+def csr_reduced_greedy_chromatic_number_top(csr, lower_bound):
+    colors, _ = csr_reduced_greedy_coloring(csr, lower_bound, lambda core: np.argsort(-csr_degrees(core), kind='stable'))
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested
+
+
+# ONE (VERTICES, EDGE %) CELL OF THE SWEEP: the CSV rows of every algorithm on one random graph
+CHROMATIC_COLUMN = 2  # 'Chromatic Number' in every algorithm's row
+LOWER_BOUND_COLUMN = 7  # 'Lower Bound' in the greedy rows
+
+def run_cell(num_vertices, edge_percentage, settings):
+    timing = settings["timing"]  # Benchmark harness options (see benchmark.measure)
+    mode = settings["mode"]
+    # A resumed cell runs only the algorithms it is missing: the stored rows of the others are kept, and their
+    # chromatic numbers and clique bound feed the ones that run (see checkpoint.py)
+    kept = settings.get("kept", {})
+    exhaustive_max_vertices = settings["exhaustive_max_vertices"]
+    random.seed(cell_seed(settings["seed"], num_vertices, edge_percentage))
+    rows = {"exhaustive": None, "raw": []}
+
+    G = generate_random_graph(num_vertices, edge_percentage / 100)
+    num_edges = G.number_of_edges()  # Get the number of edges
+    csr = graph_to_csr(G)  # Compact adjacency used by the greedy kernels
+    edges_formatted = f"{num_edges} ({edge_percentage}%)"
+
+    # Greedy Heuristic (Top)
+    if "greedy" in kept:
+        chromatic_num_greedy = kept["greedy"][CHROMATIC_COLUMN]
+    else:
+        (chromatic_num_greedy, greedy_ops, greedy_configs), greedy_timing = measure_counts(
+            csr_greedy_chromatic_number_top, csr, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("greedy", num_vertices, edges_formatted, greedy_timing)
+
+    # Greedy Heuristic (Smallest Last)
+    if "greedy_smallest_last" not in kept:
+        (chromatic_num_smallest_last, smallest_last_ops, smallest_last_configs, degeneracy), smallest_last_timing = measure_counts(
+            csr_greedy_chromatic_number_smallest_last, csr, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("greedy_smallest_last", num_vertices, edges_formatted, smallest_last_timing)
+
+    # Clique lower bound: when it reaches the greedy colors, greedy is optimal and the exact searches stop at once
+    bound_row = next((kept[name] for name in ("greedy", "greedy_smallest_last") if name in kept), None)
+    if bound_row is None:
+        clique, _ = maximum_clique(csr, settings["clique_time_budget"], upper_bound=chromatic_num_greedy)
+        lower_bound = len(clique)
+    else:
+        lower_bound = bound_row[LOWER_BOUND_COLUMN]
+
+    # Vertices left for the exact searches once the ones of degree below the clique bound are peeled
+    reduce = settings["reduce"]
+    core_vertices = reduce_graph(G, lower_bound)[2]["core_vertices"] if reduce else num_vertices
+
+    # Greedy Heuristic (Top) on the clique bound's core (optional), the removed vertices colored last
+    runs_reduced_greedy = settings["reduced_greedy"] and "reduced_greedy" not in kept
+    if runs_reduced_greedy:
+        (chromatic_num_reduced_greedy, reduced_greedy_ops, reduced_greedy_configs), reduced_greedy_timing = measure_counts(
+            csr_reduced_greedy_chromatic_number_top, csr, lower_bound, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("reduced_greedy", num_vertices, edges_formatted, reduced_greedy_timing)
+
+    # Exhaustive Search (only for smaller instances)
+    if "exhaustive" not in kept and num_vertices <= exhaustive_max_vertices:
+        (chromatic_num_exhaustive, exhaustive_ops, exhaustive_configs), exhaustive_timing = measure_counts(
+            component_chromatic_number, G, exhaustive_chromatic_number, lower_bound, settings["component_workers"],
+            settings["split_components"], reduce, upper_bound=chromatic_num_greedy, mode=mode, timing=timing)
+        rows["raw"] += sample_rows("exhaustive", num_vertices, edges_formatted, exhaustive_timing)
+        rows["exhaustive"] = ([num_vertices, edges_formatted, chromatic_num_exhaustive, 
+                               time_column(exhaustive_timing), exhaustive_ops, exhaustive_configs, lower_bound]
+                              + timing_columns(exhaustive_timing) + [core_vertices])
+
+
+    # Backtracking Exhaustive Search (every instance, it is exact as well)
+    if "backtracking" in kept:
+        chromatic_num_backtracking = kept["backtracking"][CHROMATIC_COLUMN]
+    else:
+        (chromatic_num_backtracking, backtracking_ops, backtracking_configs), backtracking_timing = measure_counts(
+            component_chromatic_number, G, backtracking_chromatic_number, lower_bound, settings["component_workers"],
+            settings["split_components"], reduce, upper_bound=chromatic_num_greedy, mode=mode, timing=timing)
+        rows["raw"] += sample_rows("backtracking", num_vertices, edges_formatted, backtracking_timing)
+        rows["backtracking"] = ([num_vertices, edges_formatted, chromatic_num_backtracking,
+                                 time_column(backtracking_timing), backtracking_ops, backtracking_configs, lower_bound]
+                                + timing_columns(backtracking_timing) + [core_vertices])
+
+    # Greedy heuristic results with precision (times are the medians of the timed runs), for the ones that ran
+    if "greedy" not in kept:
+        precision = abs(chromatic_num_backtracking - chromatic_num_greedy)
+        rows["greedy"] = ([num_vertices, edges_formatted, chromatic_num_greedy, time_column(greedy_timing), greedy_ops, greedy_configs, precision, lower_bound]
+                          + timing_columns(greedy_timing))
+    if "greedy_smallest_last" not in kept:
+        smallest_last_precision = abs(chromatic_num_backtracking - chromatic_num_smallest_last)
+        rows["greedy_smallest_last"] = ([num_vertices, edges_formatted, chromatic_num_smallest_last, time_column(smallest_last_timing), smallest_last_ops, smallest_last_configs, smallest_last_precision, lower_bound]
+                                        + timing_columns(smallest_last_timing) + [degeneracy])
+    if runs_reduced_greedy:
+        reduced_greedy_precision = abs(chromatic_num_backtracking - chromatic_num_reduced_greedy)
+        rows["reduced_greedy"] = ([num_vertices, edges_formatted, chromatic_num_reduced_greedy, time_column(reduced_greedy_timing), reduced_greedy_ops, reduced_greedy_configs, reduced_greedy_precision, lower_bound]
+                                  + timing_columns(reduced_greedy_timing) + [core_vertices])
+
+    return rows
+
+
+def main(workers=1, mode="both", split_components=True, component_workers=1, reduce=True, reduced_greedy=False,
+         checkpoint_path=None, rerun=(), store_path="results.db"):
     edges = [12.5, 25, 50, 75]
-    trials = 3
     maxVertices = 15
+    settings = {
+        "timing": {"warmup": 1, "min_time": 0.05, "min_repeats": 3},  # Per algorithm and graph (see benchmark.py)
+        "mode": mode,  # "timing" leaves the counts empty, "counts" the times
+        "seed": studentN,  # Every cell is seeded from this and its (vertices, edge %)
+        "exhaustive_max_vertices": 11,
+        "clique_time_budget": 1.0,  # Seconds of maximum clique search per graph (lower bound)
+        "split_components": split_components,  # Exact searches per connected component (see components.py)
+        "component_workers": component_workers,  # Processes solving the components of a graph
+        "reduce": reduce,  # Peel the vertices of degree below the clique bound before the exact searches
+        "reduced_greedy": reduced_greedy,  # Also run greedy on the peeled graph (metrics/reduced_greedy_results.csv)
+    }
+
+    # Every run's rows are also appended to the results store (see results_store.py)
+    store = open_store(store_path)
+    run = start_run(store, "chromatic_metrics.py")
+
+    # With a checkpoint, finished cells are skipped and the CSVs rewritten from it (see checkpoint.py)
+    checkpoint = open_checkpoint(checkpoint_path, {"seed": settings["seed"], "mode": mode}) if checkpoint_path else None
+    if checkpoint is not None and rerun:
+        drop_algorithms(checkpoint, rerun)
 
     with open('metrics/greedy_results.csv', mode='w', newline='') as greedy_file, \
-         open('metrics/exhaustive_results.csv', mode='w', newline='') as exhaustive_file:
+         open('metrics/greedy_smallest_last_results.csv', mode='w', newline='') as greedy_smallest_last_file, \
+         open('metrics/exhaustive_results.csv', mode='w', newline='') as exhaustive_file, \
+         open('metrics/backtracking_results.csv', mode='w', newline='') as backtracking_file, \
+         (open('metrics/reduced_greedy_results.csv', mode='w', newline='') if reduced_greedy else nullcontext()) as reduced_greedy_file, \
+         open('metrics/raw_times.csv', mode='w', newline='') as raw_file:
         
-        greedy_writer = csv.writer(greedy_file)
-        exhaustive_writer = csv.writer(exhaustive_file)
+        writers = {
+            "greedy": csv.writer(greedy_file),
+            "greedy_smallest_last": csv.writer(greedy_smallest_last_file),
+            "exhaustive": csv.writer(exhaustive_file),
+            "backtracking": csv.writer(backtracking_file),
+            "raw": csv.writer(raw_file),  # Every timed run (see benchmark.py)
+        }
 
         # CSV headers
         headers = ['Vertices', 'Edge %', 'Chromatic Number', 'Avg Time (ms)', 
                    'Basic Operations', 'Configurations Tested', 'Precision']
-        greedy_writer.writerow(headers)
-        exhaustive_writer.writerow(headers[:-1])  # Exhaustive doesn't need precision
-
-        for num_vertices in range(4, maxVertices + 1):
-            print("Vertices: "+str(num_vertices))
-            for edge_percentage in edges:
-                G = generate_random_graph(num_vertices, edge_percentage / 100)
-                num_edges = G.number_of_edges()  # Get the number of edges
-                edges_formatted = f"{num_edges} ({edge_percentage}%)"
-
-                # Greedy Heuristic (Top)
-                greedy_times = []
-                greedy_basic_ops = 0
-                greedy_configs = 0
-                chromatic_num_greedy = None
-                
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_greedy, basic_ops_greedy, configs_greedy = greedy_chromatic_number_top(G)
-                    end = time.time()
-                    greedy_times.append((end - start) * 10**3)
-                    greedy_basic_ops += basic_ops_greedy
-                    greedy_configs += configs_greedy
-                
-                avg_greedy_time = sum(greedy_times) / trials
-                avg_greedy_ops = greedy_basic_ops // trials
-                avg_greedy_configs = greedy_configs // trials
-
-                # Exhaustive Search (only for smaller instances)
-                if num_vertices <= 11:
-                    exhaustive_times = []
-                    exhaustive_basic_ops = 0
-                    exhaustive_configs = 0
-                    chromatic_num_exhaustive = None
-
-                    for _ in range(trials):
-                        start = time.time()
-                        chromatic_num_exhaustive, basic_ops_exhaustive, configs_exhaustive = exhaustive_chromatic_number(G)
-                        end = time.time()
-                        exhaustive_times.append((end - start) * 10**3)
-                        exhaustive_basic_ops += basic_ops_exhaustive
-                        exhaustive_configs += configs_exhaustive
-
-                    avg_exhaustive_time = sum(exhaustive_times) / trials
-                    avg_exhaustive_ops = exhaustive_basic_ops // trials
-                    avg_exhaustive_configs = exhaustive_configs // trials
-                    exhaustive_writer.writerow([num_vertices, edges_formatted, chromatic_num_exhaustive, 
-                                                f"{avg_exhaustive_time:.4f}", avg_exhaustive_ops, avg_exhaustive_configs])
-
-                    # Calculate precision
-                    precision = abs(chromatic_num_exhaustive - chromatic_num_greedy)
-                else:
-                    precision = None  # Precision not applicable when exhaustive not run
-
-                # Write greedy heuristic results with precision
-                greedy_writer.writerow([num_vertices, edges_formatted, chromatic_num_greedy, f"{avg_greedy_time:.4f}", avg_greedy_ops, avg_greedy_configs, precision])
+        algorithm_headers = {
+            "greedy": headers + ['Lower Bound'] + TIMING_HEADERS,
+            "greedy_smallest_last": headers + ['Lower Bound'] + TIMING_HEADERS + ['Degeneracy'],
+            "exhaustive": headers[:-1] + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices'],  # Exhaustive doesn't need precision
+            "backtracking": headers[:-1] + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices'],
+        }
+        if reduced_greedy:
+            writers["reduced_greedy"] = csv.writer(reduced_greedy_file)
+            algorithm_headers["reduced_greedy"] = headers + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices']
+        for name, header in algorithm_headers.items():
+            writers[name].writerow(header)
+        writers["raw"].writerow(RAW_HEADERS)
+
+        algorithms = list(algorithm_headers)
+        cells = [(num_vertices, edge_percentage) for num_vertices in range(4, maxVertices + 1) for edge_percentage in edges]
+        for (num_vertices, edge_percentage), rows in zip(cells, resume_cells(map_cells, run_cell, cells, settings, workers,
+                                                                            checkpoint, algorithms)):
+            if edge_percentage == edges[0]:
+                print("Vertices: "+str(num_vertices))
+
+            # Rows come back in cell order, whatever order the workers finish them in
+            writers["raw"].writerows(rows.pop("raw"))
+            for name, row in rows.items():
+                if row is not None:
+                    writers[name].writerow(row)
+            append_results(store, run, "random", rows, algorithm_headers, edge_percentage)  # Same rows, typed
+
+    store.close()
+    if checkpoint is not None:
+        checkpoint.close()
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Measure the greedy and exact searches on random graphs.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes running sweep cells in parallel")
+    parser.add_argument("--mode", choices=MODES, default="both",
+                        help="Timed runs (without counters), operation counts, or both")
+    parser.add_argument("--whole-graph", action="store_true",
+                        help="Run the exact searches on the whole graph instead of per connected component")
+    parser.add_argument("--component-workers", type=int, default=1,
+                        help="Processes solving the connected components of a graph in parallel")
+    parser.add_argument("--no-reduction", action="store_true",
+                        help="Don't peel the vertices of degree below the clique bound before the exact searches")
+    parser.add_argument("--reduced-greedy", action="store_true",
+                        help="Also run greedy on the peeled graph, the removed vertices colored last")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file: store every finished cell there and skip the stored ones (resume)")
+    parser.add_argument("--rerun", action="append", default=[],
+                        help="Run an algorithm again on every cell of the checkpoint (e.g. greedy), keeping the others")
+    parser.add_argument("--store", default="results.db", help="Results store the rows are appended to")
+    args = parser.parse_args()
+    main(args.workers, args.mode, not args.whole_graph, args.component_workers, not args.no_reduction,
+         args.reduced_greedy, args.checkpoint, args.rerun, args.store)
@@ -0,0 +1,350 @@
+import math
+import random
+import networkx as nx
+import numpy as np
+from collections import namedtuple
+
+
+RANDOM_PACKING_DENSITY = 0.547  # Area covered by disks placed at random until none fits
+LIST_COLORING_MAX_DEGREE = 128  # Average degree below which csr_greedy_coloring uses Python lists
+
+
+def generate_unique_points(num_points, min_distance=10, max_rejections=100000):
+    """
+    Random integer points in the 1000x1000 box, at least min_distance apart.
+
+    Candidates are drawn and accepted exactly as before (so seeded runs give the same points), but
+    each candidate is only compared with the points in the nearby cells of a grid whose cells are
+    small enough to hold a single point, instead of with every accepted point.
+
+    :param num_points: Number of points.
+    :param min_distance: Minimum distance between any two points.
+    :param max_rejections: Consecutive rejected candidates after which the box is considered full.
+    :return: List of (x, y) points.
+    """
+    box_size = 1000
+    if min_distance > 1:
+        # Disks of radius min_distance / 2 around the points can't overlap, and points placed at random one by one
+        # jam once the disks cover about 54.7% of the box (random sequential adsorption), well before the 90.7% of
+        # the hexagonal packing: beyond that the candidates would be rejected until max_rejections
+        capacity = int(RANDOM_PACKING_DENSITY * (box_size - 1 + min_distance) ** 2 / (math.pi * min_distance ** 2 / 4))
+    else:
+        capacity = box_size * box_size  # Distinct integer points are always at least 1 apart
+    if num_points > capacity:
+        raise ValueError(f"{num_points} points can't be placed at random {min_distance} apart in a {box_size}x{box_size} "
+                         f"box (random placement jams at about {capacity})")
+
+    points = set()
+    grid = {}  # (cell x, cell y) -> point in that cell
+    cell_size = min_distance / math.sqrt(2) if min_distance > 0 else 1
+    reach = math.ceil(min_distance / cell_size)  # Cells away that can still hold a point too close
+    min_distance_squared = min_distance * min_distance
+    rejections = 0
+
+    while len(points) < num_points:
+        x = random.randint(1, box_size)
+        y = random.randint(1, box_size)
+        point = (x, y)
+
+        # Ensure points are unique and not too close to each other
+        cell_x, cell_y = int(x // cell_size), int(y // cell_size)
+        nearby = (grid.get((i, j)) for i in range(cell_x - reach, cell_x + reach + 1)
+                                   for j in range(cell_y - reach, cell_y + reach + 1))
+        if all(p is None or (x - p[0]) ** 2 + (y - p[1]) ** 2 >= min_distance_squared for p in nearby):
+            points.add(point)
+            grid[(cell_x, cell_y)] = point
+            rejections = 0
+        else:
+            rejections += 1
+            if rejections >= max_rejections:
+                raise RuntimeError(f"Could only place {len(points)} of {num_points} points {min_distance} apart: "
+                                   f"{max_rejections} candidates in a row were rejected")
+
+    return list(points)
+
+
+def sample_pair_indices(total, count, rng=None):
+    """
+    Sample count distinct integers from [0, total).
+
+    With a generator, memory and time are O(count) whatever total is. Without one, random.sample is
+    used on a range, kept because it picks the same indices a seeded random.sample over the list of all
+    pairs would pick (the seeded graphs stay the same); it copies the range into a list when total is
+    within its set size threshold (3 to 12 times count), so that path is O(total) there and O(count) above.
+
+    :param rng: numpy Generator, or None for the seed-compatible random.sample path.
+    :return: int64 array of indices.
+    """
+    if rng is None:
+        return np.array(random.sample(range(total), count), dtype=np.int64)
+
+    if count > total // 2:
+        # Dense: sample the indices to leave out instead (O(total) = O(count) here anyway)
+        keep = np.ones(total, dtype=bool)
+        keep[sample_pair_indices(total, total - count, rng)] = False
+        return np.flatnonzero(keep)
+
+    # Sparse: draw with replacement until there are enough distinct indices, then keep a random subset
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < count:
+        missing = count - len(chosen)
+        drawn = np.sort(np.concatenate((chosen, rng.integers(0, total, size=missing + missing // 8 + 16))))
+        chosen = drawn[np.concatenate(([True], drawn[1:] != drawn[:-1]))]
+    return rng.choice(chosen, size=count, replace=False)
+
+
+def unrank_pairs(indices, num_vertices):
+    """
+    Pairs (u, v), u < v, at the given positions of the combinations(range(num_vertices), 2) order.
+
+    :return: (m, 2) int64 array of pairs.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    n = num_vertices
+
+    def first_index(u):  # Position of the pair (u, u + 1)
+        return u * (2 * n - u - 1) // 2
+
+    u = np.floor((2 * n - 1 - np.sqrt((2.0 * n - 1) ** 2 - 8.0 * indices)) / 2).astype(np.int64)
+    # Fix the float estimate where it is off by one
+    u = np.clip(u, 0, max(n - 2, 0))
+    u -= first_index(u) > indices
+    u += first_index(u + 1) <= indices
+    v = indices - first_index(u) + u + 1
+    return np.stack((u, v), axis=1)
+
+
+def generate_random_edges(num_vertices, edge_percentage, rng=None):
+    """
+    Random distinct edges of a graph with the given edge percentage, in O(edges) memory.
+
+    :param rng: numpy Generator for the O(edges) sampler, or None for the same edges as the
+                original list-of-all-pairs sampling under random.seed.
+    :return: (m, 2) int64 array of edges.
+    """
+    max_edges = num_vertices * (num_vertices - 1) // 2
+    num_edges = int(max_edges * edge_percentage)
+    return unrank_pairs(sample_pair_indices(max_edges, num_edges, rng), num_vertices)
+
+
+
+# NESTED (COUPLED) EDGE SETS
+#   Every pair (u, v), u < v, gets a fixed uniform key in [0, 1) from a hash of (seed, pair), and a
+#   graph with edge percentage p holds the pairs whose key is below p. The pair index v*(v-1)/2 + u
+#   doesn't depend on the number of vertices, so with the same seed the p graph is a subgraph of
+#   every denser one, and the graph on n vertices is the graph on n + 1 vertices minus vertex n.
+#   The number of edges is max_edges * p on average instead of exactly.
+
+def pair_keys(seed, pair_indices):
+    """
+    Uniform keys in [0, 1) for the given pair indices (splitmix64 of seed and index).
+    """
+    with np.errstate(over='ignore'):
+        z = ((np.asarray(pair_indices, dtype=np.uint64) + np.uint64(1)) * np.uint64(0x9E3779B97F4A7C15)
+             ^ np.uint64(seed) * np.uint64(0xD1B54A32D192ED03))
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def nested_vertex_edges(vertex, edge_percentage, seed):
+    """
+    Neighbors u < vertex of vertex in the nested graphs of the given seed and edge percentage.
+
+    :return: int64 array of neighbors, ascending.
+    """
+    lower = np.arange(vertex, dtype=np.int64)
+    return lower[pair_keys(seed, vertex * (vertex - 1) // 2 + lower) < edge_percentage]
+
+
+def generate_nested_edges(num_vertices, edge_percentage, seed):
+    """
+    Edges of the nested graph on num_vertices vertices (see pair_keys), one vertex at a time.
+
+    :return: (m, 2) int64 array of edges (u, v), u < v, ordered by v then u.
+    """
+    edges = [np.stack((neighbors, np.full(len(neighbors), vertex)), axis=1)
+             for vertex in range(1, num_vertices)
+             for neighbors in [nested_vertex_edges(vertex, edge_percentage, seed)]]
+    return np.concatenate(edges) if edges else np.empty((0, 2), dtype=np.int64)
+
+
+def generate_random_graph(num_vertices, edge_percentage, rng=None, as_csr=False, nested_seed=None):
+    """
+    Random graph over unique points, with int(max_edges * edge_percentage) random edges (nested edge
+    sets hold each pair with probability edge_percentage, so about that many).
+
+    The points are drawn first and the edges after them, as always, so seeded runs give the same graphs.
+
+    :param rng: numpy Generator for the O(edges) edge sampler (see generate_random_edges).
+    :param as_csr: Return a CSRGraph built straight from the edge array instead of a NetworkX
+                   graph. The edges don't depend on the points, so no points are generated then
+                   (under random.seed, its edges are then not those of the NetworkX graph).
+    :param nested_seed: Use the nested edge sets of this seed (see generate_nested_edges): graphs of
+                        the same seed are subgraphs of the denser and larger ones.
+    """
+    points = None if as_csr else generate_unique_points(num_vertices)
+
+    if nested_seed is not None:
+        random_edges = generate_nested_edges(num_vertices, edge_percentage, nested_seed)
+    else:
+        random_edges = generate_random_edges(num_vertices, edge_percentage, rng)
+
+    if as_csr:
+        return edges_to_csr(num_vertices, random_edges)
+
+    G = nx.Graph()
+    
+    for i, point in enumerate(points):
+        G.add_node(i, pos=point)
+
+    G.add_edges_from(random_edges.tolist())
+    
+    return G
+
+
+# CSR GRAPH (compressed sparse row adjacency)
+#   offsets[i]:offsets[i+1] is the slice of `neighbors` holding the neighbors of vertex i,
+#   nodes[i] is the original label of vertex i (vertex i is the i-th node of the source graph)
+CSRGraph = namedtuple("CSRGraph", ["offsets", "neighbors", "nodes"])
+
+
+def graph_to_csr(graph):
+    """
+    Build a CSR adjacency from a NetworkX graph, keeping the graph's node order.
+
+    :param graph: NetworkX graph.
+    :return: CSRGraph with int64 offsets and int32 neighbor indices.
+    """
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    adjacency = graph.adj
+
+    offsets = np.zeros(len(nodes) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(adjacency[node]) for node in nodes])
+    neighbors = np.fromiter((index[neighbor] for node in nodes for neighbor in adjacency[node]),
+                            dtype=np.int32, count=int(offsets[-1]))
+    return CSRGraph(offsets, neighbors, nodes)
+
+
+def edges_to_csr(num_vertices, edges):
+    """
+    Build a CSR adjacency straight from an edge list, without going through NetworkX.
+
+    :param num_vertices: Number of vertices (vertices are 0..num_vertices-1).
+    :param edges: Sequence or (m, 2) array of undirected edges (u, v), without duplicates.
+    :return: CSRGraph with int64 offsets and int32 neighbor indices.
+    """
+    edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+    sources = np.concatenate((edges[:, 0], edges[:, 1]))
+    targets = np.concatenate((edges[:, 1], edges[:, 0]))
+
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(sources, minlength=num_vertices))
+    return CSRGraph(offsets, targets[order], list(range(num_vertices)))
+
+
+def csr_degrees(csr):
+    return np.diff(csr.offsets)
+
+
+def csr_smallest_last_order(csr):
+    """
+    Smallest-last (degeneracy) ordering of a CSR graph: vertices are removed one at a time, always one
+    of minimum remaining degree, and visited in reverse removal order. The vertices wait in buckets by
+    remaining degree; a vertex whose degree drops is pushed again to its new bucket and its old entry is
+    skipped when reached, so every vertex and edge is handled a constant number of times (O(n + m)).
+
+    Greedy coloring in this order needs at most degeneracy + 1 colors: every vertex has at most
+    degeneracy neighbors before it.
+
+    :return: (int64 array with the vertex order, degeneracy of the graph)
+    """
+    offsets = csr.offsets.tolist()
+    neighbors = csr.neighbors.tolist()
+    n = len(offsets) - 1
+    degrees = csr_degrees(csr).tolist()
+
+    buckets = [[] for _ in range(max(degrees, default=0) + 1)]
+    for vertex in reversed(range(n)):  # Ties are removed in node order
+        buckets[degrees[vertex]].append(vertex)
+
+    removed = [False] * n
+    removal_order = []
+    degeneracy = 0
+    lowest = 0
+    while len(removal_order) < n:
+        if not buckets[lowest]:
+            lowest += 1
+            continue
+        vertex = buckets[lowest].pop()
+        if removed[vertex] or degrees[vertex] != lowest:
+            continue  # Old entry, the vertex has moved to a lower bucket
+        removed[vertex] = True
+        removal_order.append(vertex)
+        degeneracy = max(degeneracy, lowest)
+
+        for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]:
+            if not removed[neighbor]:
+                degrees[neighbor] -= 1
+                buckets[degrees[neighbor]].append(neighbor)
+        lowest = max(lowest - 1, 0)  # A neighbor may have dropped one bucket below
+
+    return np.array(removal_order[::-1], dtype=np.int64), degeneracy
+
+
+def csr_greedy_coloring(csr, order):
+    """
+    Greedy coloring over a CSR graph, visiting vertices in the given order.
+
+    Instead of building a set of neighbor colors per vertex, a single stamp array is reused:
+    marks[c] == stamp means color c is taken by a neighbor of the current vertex.
+
+    Marking the neighbors with one NumPy fancy index per vertex costs a few microseconds of call
+    overhead per vertex, which only pays off for long neighbor lists: below an average degree of
+    LIST_COLORING_MAX_DEGREE the marks and colors are plain Python lists (4x faster at 50 vertices
+    and 50% edges, 1.5x at average degree 100, slower from about 150 on).
+
+    :param csr: CSRGraph.
+    :param order: Sequence of vertex indices (a permutation of 0..n-1).
+    :return: int32 array with the color of each vertex.
+    """
+    offsets = csr.offsets.tolist()
+    neighbors = csr.neighbors
+    n = len(offsets) - 1
+    max_degree = int(csr_degrees(csr).max()) if n > 0 else 0
+
+    if len(neighbors) < LIST_COLORING_MAX_DEGREE * n:
+        return list_greedy_coloring(offsets, neighbors.tolist(), max_degree, order)
+
+    colors = np.full(n, -1, dtype=np.int32)
+    # Uncolored neighbors (-1) land on the last slot, which is never a candidate color
+    marks = np.zeros(max_degree + 2, dtype=np.int64)
+
+    for stamp, vertex in enumerate(np.asarray(order).tolist(), start=1):
+        start, end = offsets[vertex], offsets[vertex + 1]
+        marks[colors[neighbors[start:end]]] = stamp
+
+        # Smallest color not taken by a neighbor (at most the degree of the vertex)
+        colors[vertex] = np.argmin(marks[:end - start + 1] == stamp)
+
+    return colors
+
+
+def list_greedy_coloring(offsets, neighbors, max_degree, order):
+    # csr_greedy_coloring with the offsets, neighbors, marks and colors as Python lists (small degrees)
+    colors = [-1] * (len(offsets) - 1)
+    marks = [0] * (max_degree + 2)  # Uncolored neighbors (-1) land on the last slot, as above
+
+    for stamp, vertex in enumerate(np.asarray(order).tolist(), start=1):
+        for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]:
+            marks[colors[neighbor]] = stamp
+
+        color = 0
+        while marks[color] == stamp:
+            color += 1
+        colors[vertex] = color
+
+    return np.array(colors, dtype=np.int32)
@@ -1,92 +1,59 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
+from results_store import open_store
+from plotting import aligned_results, render, save
 
 if not os.path.exists('plots'):
     os.makedirs('plots')
 
-# Read the CSVs for Greedy Top and Greedy Bottom heuristics
-greedy_top_data = pd.read_csv('exec_times/greedy_top_times.csv')
-greedy_bottom_data = pd.read_csv('exec_times/greedy_bottom_times.csv')
-exhaustive_data = pd.read_csv('exec_times/exhaustive_times.csv')
+KEY = ["density", "vertices", "trial"]  # A graph of chromatic.py's sweep
 
-# Strip the '%' symbol for easier handling of edge percentage values
-edges = greedy_top_data.columns[1:].str.rstrip('%').astype(float)
 
-# Extract vertices from each dataset
-greedy_vertices = greedy_top_data['Vertices / Edge %']
-exhaustive_vertices = exhaustive_data['Vertices / Edge %']
-
-# Find common vertices across datasets for accurate plotting
-common_vertices = greedy_vertices[greedy_vertices.isin(exhaustive_vertices)].values
-
-# Filter the datasets to include only the common vertices
-greedy_top_execution_times = greedy_top_data[greedy_top_data['Vertices / Edge %'].isin(greedy_vertices)].iloc[:, 1:].values
-greedy_bottom_execution_times = greedy_bottom_data[greedy_bottom_data['Vertices / Edge %'].isin(greedy_vertices)].iloc[:, 1:].values
-exhaustive_execution_times = exhaustive_data[exhaustive_data['Vertices / Edge %'].isin(common_vertices)].iloc[:, 1:].values
-
-# --- Plot for Greedy Top Heuristic ---
-plt.figure(figsize=(10, 6))
-for i, edge_percentage in enumerate(edges):
-    plt.plot(greedy_vertices, greedy_top_execution_times[:, i], label=f'{edge_percentage}% Edges (Greedy Top)')
-plt.title('Greedy Algorithm Execution Times (Top Heuristic)')
-plt.xlabel('Number of Vertices')
-plt.ylabel('Execution Time (ms)')
-plt.legend(title='Edge Percentage')
-plt.grid(True, which="both", ls="--")
-# plt.yscale('log')
-plt.savefig('plots/greedy_top_plot.png')
-plt.show()
-
-# --- Plot for Greedy Bottom Heuristic ---
-plt.figure(figsize=(10, 6))
-for i, edge_percentage in enumerate(edges):
-    plt.plot(greedy_vertices, greedy_bottom_execution_times[:, i], label=f'{edge_percentage}% Edges (Greedy Bottom)')
-plt.title('Greedy Algorithm Execution Times (Bottom Heuristic)')
-plt.xlabel('Number of Vertices')
-plt.ylabel('Execution Time (ms)')
-plt.legend(title='Edge Percentage')
-plt.grid(True, which="both", ls="--")
-plt.yscale('log')
-plt.savefig('plots/greedy_bottom_plot.png')
-plt.show()
-
-# --- Plot for Exhaustive Algorithm ---
-plt.figure(figsize=(10, 6))
-for i, edge_percentage in enumerate(edges):
-    plt.plot(common_vertices, exhaustive_execution_times[:, i], label=f'{edge_percentage}% Edges (Exhaustive)')
-plt.title('Exhaustive Algorithm Execution Times vs Number of Vertices')
-plt.xlabel('Number of Vertices')
-plt.ylabel('Execution Time (ms)')
-plt.legend(title='Edge Percentage')
-plt.grid(True)
-# plt.yscale('log')
-plt.savefig('plots/exhaustive_algorithm_plot.png')
-plt.show()
-
-
-greedy_top_execution_times = greedy_top_data[greedy_top_data['Vertices / Edge %'].isin(common_vertices)].iloc[:, 1:].values
-greedy_bottom_execution_times = greedy_bottom_data[greedy_bottom_data['Vertices / Edge %'].isin(common_vertices)].iloc[:, 1:].values
+# --- Execution times of one algorithm, one line per edge percentage ---
+def plot_algorithm_times(times, algorithm, label, title, path, log_scale, grid_options):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for edge_percentage, subset in times.groupby("density"):
+        ax.plot(subset["vertices"], subset[("exec_time", algorithm)], label=f'{edge_percentage}% Edges ({label})')
+    ax.set_title(title)
+    ax.set_xlabel('Number of Vertices')
+    ax.set_ylabel('Execution Time (ms)')
+    ax.legend(title='Edge Percentage')
+    ax.grid(True, **grid_options)
+    if log_scale:
+        ax.set_yscale('log')
+    save(fig, path)
 
 
 # --- Plot comparison of greedy and exhaustive for a specific edge percentage ---
-def plot_comparison_for_edge_percentage(edge_percentage):
-    edge_index = edges.tolist().index(edge_percentage)
-    
-    plt.figure(figsize=(10, 6))
-    plt.plot(common_vertices, greedy_top_execution_times[:, edge_index], label=f'{edge_percentage}% Edges (Greedy (Top))', marker='o', linestyle='-')
-    plt.plot(common_vertices, exhaustive_execution_times[:, edge_index], label=f'{edge_percentage}% Edges (Exhaustive)', marker='o', linestyle='--')
-    
-    plt.title(f'Greedy (Top) vs Exhaustive Algorithm Execution Times ({edge_percentage}% Edges)')
-    plt.xlabel('Number of Vertices')
-    plt.ylabel('Execution Time (ms)')
-    plt.legend()
-    plt.grid(True)
-    plt.yscale('log')
-
-    
-    plt.savefig(f'plots/greedy_vs_exhaustive_{edge_percentage}_percent_edges.png')
-    plt.show()
-
-for edge_percentage in [12.5, 25, 50, 75]:
-    plot_comparison_for_edge_percentage(edge_percentage)
+def plot_comparison_for_edge_percentage(subset, edge_percentage):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(subset["vertices"], subset[("exec_time", "greedy_top")], label=f'{edge_percentage}% Edges (Greedy (Top))', marker='o', linestyle='-')
+    ax.plot(subset["vertices"], subset[("exec_time", "exhaustive")], label=f'{edge_percentage}% Edges (Exhaustive)', marker='o', linestyle='--')
+
+    ax.set_title(f'Greedy (Top) vs Exhaustive Algorithm Execution Times ({edge_percentage}% Edges)')
+    ax.set_xlabel('Number of Vertices')
+    ax.set_ylabel('Execution Time (ms)')
+    ax.legend()
+    ax.grid(True)
+    ax.set_yscale('log')
+
+    save(fig, f'plots/greedy_vs_exhaustive_{edge_percentage}_percent_edges.png')
+
+
+if __name__ == "__main__":
+    # Times of chromatic.py's latest sweep (see results_store.py), aligned by graph
+    store = open_store('results.db')
+    greedy_times = aligned_results(store, "random", ["greedy_top", "greedy_bottom"], KEY, driver="chromatic.py")
+    exhaustive_times = aligned_results(store, "random", ["greedy_top", "exhaustive"], KEY, driver="chromatic.py")  # Common vertices
+
+    jobs = [
+        (plot_algorithm_times, greedy_times, "greedy_top", "Greedy Top", 'Greedy Algorithm Execution Times (Top Heuristic)',
+         'plots/greedy_top_plot.png', False, {"which": "both", "ls": "--"}),
+        (plot_algorithm_times, greedy_times, "greedy_bottom", "Greedy Bottom", 'Greedy Algorithm Execution Times (Bottom Heuristic)',
+         'plots/greedy_bottom_plot.png', True, {"which": "both", "ls": "--"}),
+        (plot_algorithm_times, exhaustive_times, "exhaustive", "Exhaustive", 'Exhaustive Algorithm Execution Times vs Number of Vertices',
+         'plots/exhaustive_algorithm_plot.png', False, {}),
+    ]
+    for edge_percentage, subset in exhaustive_times.groupby("density"):
+        jobs.append((plot_comparison_for_edge_percentage, subset, f"{edge_percentage:g}"))
+    render(jobs)
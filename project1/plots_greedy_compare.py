@@ -15,10 +15,12 @@ def plot_greedy_comparison():
     # Load data for both greedy algorithms
     headers, top_data = load_data('exec_times/greedy_top_times.csv')
     _, bottom_data = load_data('exec_times/greedy_bottom_times.csv')
+    _, smallest_last_data = load_data('exec_times/greedy_smallest_last_times.csv')
 
     # Use only the first 100 points and select every 5th row (interval of 5)
     top_data_sampled = top_data[:600:80]
     bottom_data_sampled = bottom_data[:600:80]
+    smallest_last_data_sampled = smallest_last_data[:600:80]
 
     # Vertices / Edge %
     x_labels = [f"{row[0]}" for row in top_data_sampled]
@@ -30,13 +32,15 @@ def plot_greedy_comparison():
     for i, edge_percentage in enumerate(edge_percentages, start=1):
         top_times = [row[i] for row in top_data_sampled]
         bottom_times = [row[i] for row in bottom_data_sampled]
+        smallest_last_times = [row[i] for row in smallest_last_data_sampled]
 
         plt.plot(x_labels, top_times, marker='o', label=f'Greedy Top ({edge_percentage}%)')
         plt.plot(x_labels, bottom_times, marker='s', linestyle='--', label=f'Greedy Bottom ({edge_percentage}%)')
+        plt.plot(x_labels, smallest_last_times, marker='^', linestyle=':', label=f'Greedy Smallest Last ({edge_percentage}%)')
 
     plt.xlabel("Number of vertices")
     plt.ylabel("Average Execution Time (ms)")
-    plt.title("Comparison of Greedy Top and Bottom Algorithms")
+    plt.title("Comparison of Greedy Top, Bottom and Smallest Last Algorithms")
     plt.grid(True, which="both", ls="--")
     plt.legend()
     plt.tight_layout()
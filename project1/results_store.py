@@ -0,0 +1,126 @@
+import sqlite3
+import time
+import numpy as np
+
+# RESULTS STORE: every result row of every driver in one SQLite table with typed columns
+#
+#   runs(run, started, driver)      one per driver run, results are only ever appended
+#   results(run, dataset, graph, algorithm, vertices, edges, density, trial, chromatic_number, exec_time, ...)
+#
+#   dataset is "random" for the random graph sweep and "facebook" / "sw" for the web graphs, graph the
+#   web graph's file. density is the edge % of the graph (nominal for the random sweep, measured for the web
+#   graphs). The CSVs stay as they are; the drivers also append the same rows here, with numbers as numbers,
+#   and the analysis scripts read them back with query(), by default from the latest run of each dataset.
+#   In a shared store, the sweeps of different drivers on the same dataset are told apart by the driver's name.
+
+FIELDS = [
+    ("run", "INTEGER"), ("dataset", "TEXT"), ("graph", "TEXT"), ("algorithm", "TEXT"),
+    ("vertices", "INTEGER"), ("edges", "INTEGER"), ("density", "REAL"), ("trial", "INTEGER"),
+    ("chromatic_number", "INTEGER"), ("exec_time", "REAL"), ("min_time", "REAL"), ("time_iqr", "REAL"),
+    ("samples", "INTEGER"), ("basic_operations", "INTEGER"), ("configurations_tested", "INTEGER"),
+    ("precision", "INTEGER"), ("lower_bound", "INTEGER"), ("core_vertices", "INTEGER"),
+    ("iterations", "INTEGER"), ("degeneracy", "INTEGER"),
+]
+
+# Results CSV header -> store field
+CSV_FIELDS = {
+    'Vertices': "vertices", 'Edges': "edges", 'Chromatic Number': "chromatic_number",
+    'Exec Time': "exec_time", 'Avg Time (ms)': "exec_time", 'Min Time': "min_time", 'Time IQR': "time_iqr",
+    'Samples': "samples", 'Basic Operations': "basic_operations", 'Configurations Tested': "configurations_tested",
+    'Precision': "precision", 'Lower Bound': "lower_bound", 'Core Vertices': "core_vertices",
+    'Iterations': "iterations", 'Degeneracy': "degeneracy",
+}
+
+NUMPY_TYPES = {"INTEGER": np.float64, "REAL": np.float64, "TEXT": object}  # Missing numbers (NULL, None) are NaN
+
+
+def open_store(path):
+    """
+    Open (or create) a results store.
+
+    :return: sqlite3 connection.
+    """
+    store = sqlite3.connect(path)
+    with store:
+        store.execute("CREATE TABLE IF NOT EXISTS runs (run INTEGER PRIMARY KEY, started REAL, driver TEXT)")
+        store.execute(f"CREATE TABLE IF NOT EXISTS results ({', '.join(f'{name} {kind}' for name, kind in FIELDS)})")
+        store.execute("CREATE INDEX IF NOT EXISTS results_lookup ON results (dataset, run, algorithm, density, vertices)")
+    return store
+
+
+def start_run(store, driver):
+    """
+    :return: Id of a new run, given to append_results.
+    """
+    with store:
+        return store.execute("INSERT INTO runs (started, driver) VALUES (?, ?)", (time.time(), driver)).lastrowid
+
+
+def plain(value):
+    # Empty CSV columns are missing values, NumPy scalars become Python numbers
+    if value == "" or value is None:
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def formatted_edges(value):
+    # 'Edge %' column of the random sweep: "1234 (12.5%)"
+    return int(value.split(" (")[0])
+
+
+def append_results(store, run, dataset, rows, headers, density, graph=None, trial=0):
+    """
+    Append the results CSV rows of one graph, in one transaction.
+
+    :param rows: {algorithm: CSV row, or None when the algorithm didn't run}.
+    :param headers: {algorithm: CSV header of its rows}; the columns without a store field are left out.
+    :param density: Edge % of the graph.
+    """
+    with store:
+        for algorithm, row in rows.items():
+            if row is None:
+                continue
+            header = headers[algorithm]
+            columns = [(i, CSV_FIELDS[name], plain) for i, name in enumerate(header) if name in CSV_FIELDS]
+            if 'Edge %' in header:
+                columns.append((header.index('Edge %'), "edges", formatted_edges))
+
+            fields = ["run", "dataset", "graph", "algorithm", "density", "trial"] + [field for _, field, _ in columns]
+            store.execute(f"INSERT INTO results ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+                          [run, dataset, graph, algorithm, density, trial] + [convert(row[i]) for i, _, convert in columns])
+
+
+def latest_run(store, dataset, driver=None):
+    if driver is None:
+        return store.execute("SELECT MAX(run) FROM results WHERE dataset = ?", (dataset,)).fetchone()[0]
+    return store.execute("SELECT MAX(run) FROM results JOIN runs USING (run) WHERE dataset = ? AND driver = ?",
+                         (dataset, driver)).fetchone()[0]
+
+
+def query(store, dataset, algorithm=None, density=None, min_vertices=None, max_vertices=None, run=None, driver=None):
+    """
+    Results of a dataset, filtered in SQL, ordered by density, vertices, graph and trial.
+
+    :param algorithm: An algorithm or a list of them (None: all).
+    :param density: An edge % or a list of them (None: all).
+    :param run: Run id (None: the latest run of the dataset, or of the dataset by that driver).
+    :return: {field: NumPy array} (numbers as float64, NaN where missing; text as object arrays).
+    """
+    conditions = ["dataset = ?", "run = ?"]
+    parameters = [dataset, latest_run(store, dataset, driver) if run is None else run]
+    for field, values in (("algorithm", algorithm), ("density", density)):
+        if values is not None:
+            values = values if isinstance(values, (list, tuple)) else [values]
+            conditions.append(f"{field} IN ({', '.join('?' * len(values))})")
+            parameters += values
+    if min_vertices is not None:
+        conditions.append("vertices >= ?")
+        parameters.append(min_vertices)
+    if max_vertices is not None:
+        conditions.append("vertices <= ?")
+        parameters.append(max_vertices)
+
+    rows = store.execute(f"SELECT * FROM results WHERE {' AND '.join(conditions)} "
+                         "ORDER BY density, vertices, graph, trial", parameters).fetchall()
+    columns = list(zip(*rows)) if rows else [()] * len(FIELDS)
+    return {name: np.array(column, dtype=NUMPY_TYPES[kind]) for (name, kind), column in zip(FIELDS, columns)}
@@ -0,0 +1,25 @@
+from concurrent.futures import ProcessPoolExecutor
+
+# SWEEP CELLS: the cells of a sweep, run in order on a pool of processes or in this process
+#   Shared by the sweep drivers. A cell is (vertices, edge %), or (vertices, graph file) in the web graph sweep.
+
+
+def cell_seed(seed, num_vertices, edge_percentage):
+    # Depends only on the cell, so results don't depend on which worker runs it or when
+    return f"{seed}-{num_vertices}-{edge_percentage}"
+
+
+def map_cells(function, cells, settings, workers):
+    """
+    Yield function(num_vertices, edge_percentage, settings) for every cell, in cell order, running
+    the cells on a pool of `workers` processes (or in this process when workers is 1).
+    settings is shared by every cell, or a list with the settings of each cell.
+    """
+    cell_settings = settings if isinstance(settings, list) else [settings] * len(cells)
+    if workers == 1:
+        for (num_vertices, edge_percentage), settings in zip(cells, cell_settings):
+            yield function(num_vertices, edge_percentage, settings)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, *zip(*cells), cell_settings)
@@ -1,9 +1,25 @@
+import argparse
+import math
+import os
 import random
-import time
 import csv
 import networkx as nx
+import numpy as np
+from contextlib import nullcontext
 from itertools import product
-from graph_utils import generate_random_graph, save_graph, load_graph
+from graph_utils import generate_random_graph, save_graph, load_graph, graph_to_csr, csr_degrees, csr_greedy_coloring, csr_batch_greedy_coloring
+from dsatur import dsatur_chromatic_number
+from inclusion_exclusion import inclusion_exclusion_chromatic_number
+from max_clique import maximum_clique
+from tabucol import tabucol_chromatic_number
+from benchmark import measure_counts, sample_rows, time_column, timing_columns, MODES, TIMING_HEADERS, RAW_HEADERS
+from exhaustive import parallel_exhaustive_chromatic_number
+from components import component_chromatic_number
+from reduction import reduce_graph, csr_reduced_greedy_coloring
+from graph_corpus import open_corpus, load_corpus_graph
+from results_store import open_store, start_run, append_results
+from checkpoint import open_checkpoint, drop_algorithms, resume_cells
+from sweep import cell_seed, map_cells
 
 
 # studentN = 103199
@@ -23,19 +39,42 @@ def is_valid_coloring(graph, coloring):
             return False, basic_operations
     return True, basic_operations
 
-def exhaustive_chromatic_number(graph):
+# Same check without counters, for the timed runs
+def is_proper_coloring(edges, coloring):
+    for u, v in edges:
+        if coloring[u] == coloring[v]:
+            return False
+    return True
+
+def exhaustive_chromatic_number(graph, lower_bound=1, upper_bound=None, count=True):
+    # Only colors between a lower bound (a clique size) and an upper bound (a known coloring) are tried
     n = len(graph.nodes())
+    if any(node != i for i, node in enumerate(graph.nodes())):
+        graph = nx.convert_node_labels_to_integers(graph)  # Colorings are indexed by vertex (e.g. components)
+    if not count:
+        return uncounted_exhaustive_chromatic_number(graph, n, lower_bound, upper_bound)
     basic_operations = 0
     configurations_tested = 0   
 
-    for num_colors in range(1, n + 1):
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
         for coloring in product(range(num_colors), repeat=n):
             configurations_tested += 1
             is_valid, edge_operations = is_valid_coloring(graph, coloring)  # Check if valid and get edge operations
             basic_operations += edge_operations    
             if is_valid:                            # If the coloring is valid
                 return num_colors, basic_operations, configurations_tested
-    return n, basic_operations, configurations_tested  # Worst case
+    return n if upper_bound is None else upper_bound, basic_operations, configurations_tested  # Worst case
+
+def uncounted_exhaustive_chromatic_number(graph, n, lower_bound, upper_bound):
+    # The search above without counters (count=False): same colorings in the same order
+    edges = list(graph.edges())
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
+        for coloring in product(range(num_colors), repeat=n):
+            if is_proper_coloring(edges, coloring):
+                return num_colors, None, None
+    return n if upper_bound is None else upper_bound, None, None  # Worst case
 
 
 # GREEDY HEURISTIC with tracking of operations and configurations tested
@@ -61,6 +100,28 @@ def greedy_chromatic_number(graph):
     return chromatic_number, basic_operations, configurations_tested
 
 
+# GREEDY HEURISTIC over the CSR adjacency (same order, colors and counts as greedy_chromatic_number)
+def csr_greedy_chromatic_number(csr):
+    # Descending degree, ties kept in node order (like the stable sorted() above)
+    vertices = np.argsort(-csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested
+
+
+# GREEDY HEURISTIC on the lower_bound-core, the peeled low-degree vertices colored last (see reduction.py)
+def csr_reduced_greedy_chromatic_number(csr, lower_bound):
+    colors, _ = csr_reduced_greedy_coloring(csr, lower_bound, lambda core: np.argsort(-csr_degrees(core), kind='stable'))
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested
+
+
 # RANDOM GREEDY with tracking of operations and configurations tested
 def random_greedy_chromatic_number(graph, trials=30):
     basic_operations = 0
@@ -99,6 +160,82 @@ def random_greedy_chromatic_number(graph, trials=30):
     return best_chromatic_number, basic_operations, configurations_tested
 
 
+# RANDOM GREEDY over the CSR adjacency (same shuffles, colors and counts as random_greedy_chromatic_number)
+def csr_random_greedy_chromatic_number(csr, trials=30):
+    basic_operations = 0
+    configurations_tested = 0
+
+    best_chromatic_number = float('inf')
+    tested_orders = set()
+    vertices = list(range(len(csr.nodes)))
+
+    for _ in range(trials):
+        while True:
+            random.shuffle(vertices)
+            vertex_order = tuple(vertices)
+            if vertex_order not in tested_orders:
+                tested_orders.add(vertex_order)
+                break
+
+        colors = csr_greedy_coloring(csr, vertices)
+        basic_operations += int(colors.sum())
+        configurations_tested += len(colors)
+
+        chromatic_number = int(colors.max()) + 1
+        best_chromatic_number = min(best_chromatic_number, chromatic_number)
+
+    return best_chromatic_number, basic_operations, configurations_tested
+
+
+
+# BATCHED RANDOM GREEDY (memory-lean: orders are deduplicated by a 64-bit hash, not stored)
+def batch_random_greedy_chromatic_number(csr, trials=30, rng=None, batch_size=64):
+    """
+    Random greedy over `trials` distinct random vertex orders, colored batch_size orders at a time.
+
+    Orders are drawn with a NumPy Generator (one (batch_size, n) block of permutations per pass)
+    and only a 64-bit hash of each tried order is kept, so memory doesn't grow with n and only by
+    one integer per trial. Counts are the same as csr_random_greedy_chromatic_number's per order.
+
+    :param csr: CSRGraph.
+    :param rng: NumPy Generator, by default seeded from the `random` module (so random.seed applies).
+    :return: (best_chromatic_number, basic_operations, configurations_tested)
+    """
+    n = len(csr.nodes)
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    trials = min(trials, math.factorial(n))  # There are only n! distinct orders
+
+    # Hash of an order: sum of order[i] * weights[i] modulo 2**64, with random odd weights
+    weights = rng.integers(0, 2**63, size=n, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    tested_hashes = set()
+
+    basic_operations = 0
+    configurations_tested = 0
+    best_chromatic_number = float('inf')
+    identity = np.arange(n, dtype=np.int64)
+
+    while len(tested_hashes) < trials:
+        orders = rng.permuted(np.tile(identity, (min(batch_size, trials - len(tested_hashes)), 1)), axis=1)
+        hashes = (orders.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64).tolist()
+
+        # Keep the orders never tried before (nor earlier in this batch)
+        fresh = []
+        for row, order_hash in enumerate(hashes):
+            if order_hash not in tested_hashes:
+                tested_hashes.add(order_hash)
+                fresh.append(row)
+        if not fresh:
+            continue
+
+        colors = csr_batch_greedy_coloring(csr, orders[fresh])
+        basic_operations += int(colors.sum())
+        configurations_tested += colors.size
+        # Best order of the batch: the one whose largest color is smallest
+        best_chromatic_number = min(best_chromatic_number, int(colors.max(axis=1).min()) + 1 if n > 0 else 0)
+
+    return best_chromatic_number, basic_operations, configurations_tested
+
 # NETWORKX RANDOM SEQUENTIAL with tracking of operations and configurations tested
 def networkx_random_sequential(graph, trials):
     """
@@ -115,134 +252,286 @@ def networkx_random_sequential(graph, trials):
     return best_chromatic_number
 
 
-def main():
+# ONE (VERTICES, EDGE %) CELL OF THE SWEEP: load or generate the graph and run every algorithm on it
+CHROMATIC_COLUMN = 2  # 'Chromatic Number' in every algorithm's row
+LOWER_BOUND_COLUMN = 7  # 'Lower Bound' in the greedy and random greedy rows
+
+def run_cell(num_vertices, edge_percentage, settings):
+    timing = settings["timing"]  # Benchmark harness options (see benchmark.measure)
+    mode = settings["mode"]
+    # A resumed cell runs only the algorithms it is missing: the stored rows of the others are kept, and their
+    # chromatic numbers and clique bound feed the ones that run (see checkpoint.py)
+    kept = settings.get("kept", {})
+    graph_folder = settings["graph_folder"]
+    exhaustive_max_vertices = settings["exhaustive_max_vertices"]
+    exhaustive_workers = settings["exhaustive_workers"]
+    dsatur_max_vertices = settings["dsatur_max_vertices"]
+    clique_time_budget = settings["clique_time_budget"]
+    # Exact searches run per connected component (see components.py) unless split_components is off
+    split = settings["split_components"]
+    component_workers = settings["component_workers"]
+    reduce = settings["reduce"]  # Low-degree reduction in front of them (see reduction.py)
+    corpus = open_corpus(settings["corpus_path"]) if os.path.exists(settings["corpus_path"]) else None
+
+    random.seed(cell_seed(settings["seed"], num_vertices, edge_percentage))
+    rows = {"exhaustive": None, "dsatur": None, "raw": []}
+    if settings["inclusion_exclusion"]:
+        rows["inclusion_exclusion"] = None
+
+    # Graph filename based on parameters
+    graph_filename = f"graph_{num_vertices}_vertices_{int(edge_percentage)}_edges.pkl"
+    G = load_corpus_graph(corpus, num_vertices, edge_percentage) if corpus is not None else None
+    if G is None:
+        G = load_graph(graph_folder, graph_filename)  # Try loading the graph
+
+    if G is None:
+        G = generate_random_graph(num_vertices, edge_percentage / 100)  # Generate the graph
+        save_graph(G, graph_folder, graph_filename)  # Save the graph
+
+
+    num_edges = G.number_of_edges()  # Get the number of edges
+    csr = graph_to_csr(G)  # Compact adjacency used by the greedy kernels
+    edges_formatted = f"{num_edges} ({edge_percentage}%)"
+
+    # Greedy Heuristic 
+    if "greedy" in kept:
+        chromatic_num_greedy = kept["greedy"][CHROMATIC_COLUMN]
+    else:
+        (chromatic_num_greedy, greedy_ops, greedy_configs), greedy_timing = measure_counts(
+            csr_greedy_chromatic_number, csr, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("greedy", num_vertices, edges_formatted, greedy_timing)
+
+    # Clique lower bound: when it reaches the greedy colors, greedy is optimal and the exact searches stop at once.
+    # DSatur starts from the clique itself, the other algorithms only need its size, kept in the stored rows
+    runs_dsatur = "dsatur" not in kept and num_vertices <= dsatur_max_vertices
+    bound_row = next((kept[name] for name in ("greedy", "random_greedy") if name in kept), None)
+    if bound_row is None or runs_dsatur:
+        clique, _ = maximum_clique(csr, clique_time_budget, upper_bound=chromatic_num_greedy)
+        lower_bound = len(clique)
+    else:
+        lower_bound = bound_row[LOWER_BOUND_COLUMN]
+
+
+    # Random Greedy Heuristic 
+    if "random_greedy" not in kept:
+        (chromatic_num_random_greedy, random_greedy_ops, random_greedy_configs), random_greedy_timing = measure_counts(
+            batch_random_greedy_chromatic_number, csr, min(500, 6*num_vertices), mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("random_greedy", num_vertices, edges_formatted, random_greedy_timing)
+
+    # TabuCol local search from the greedy coloring (optional, it runs until its budget is spent)
+    chromatic_num_tabucol = None
+    if "tabucol" in kept:
+        chromatic_num_tabucol = kept["tabucol"][CHROMATIC_COLUMN]
+    elif settings["tabucol"]:
+        (chromatic_num_tabucol, tabucol_ops, tabucol_configs, tabucol_iterations), tabucol_timing = measure_counts(
+            tabucol_chromatic_number, csr, settings["tabucol_time_budget"], settings["tabucol_max_iterations"],
+            lower_bound, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("tabucol", num_vertices, edges_formatted, tabucol_timing)
+
+    # Greedy on the clique bound's core (optional), the removed vertices colored last
+    runs_reduced_greedy = settings["reduced_greedy"] and "reduced_greedy" not in kept
+    if runs_reduced_greedy:
+        (chromatic_num_reduced_greedy, reduced_greedy_ops, reduced_greedy_configs), reduced_greedy_timing = measure_counts(
+            csr_reduced_greedy_chromatic_number, csr, lower_bound, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("reduced_greedy", num_vertices, edges_formatted, reduced_greedy_timing)
+
+    # Vertices left for the exact searches once the ones of degree below the clique bound are peeled
+    core_vertices = reduce_graph(G, lower_bound)[2]["core_vertices"] if reduce else num_vertices
+
+    # NetworkX Random Sequential 
+    if "nx_random_sequential" not in kept:
+        chromatic_num_nx_random_sequential, nx_random_sequential_timing = measure_counts(
+            networkx_random_sequential, G, min(500, 6*num_vertices), mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("nx_random_sequential", num_vertices, edges_formatted, nx_random_sequential_timing)
+
+
+    # Exhaustive Search (only for smaller instances)
+    if "exhaustive" not in kept and num_vertices <= exhaustive_max_vertices:
+        (chromatic_num_exhaustive, exhaustive_ops, exhaustive_configs), exhaustive_timing = measure_counts(
+            component_chromatic_number, G, parallel_exhaustive_chromatic_number, lower_bound, component_workers, split, reduce,
+            workers=exhaustive_workers, upper_bound=chromatic_num_greedy, mode=mode, timing=timing)
+        rows["raw"] += sample_rows("exhaustive", num_vertices, edges_formatted, exhaustive_timing)
+        rows["exhaustive"] = ([num_vertices, edges_formatted, chromatic_num_exhaustive, time_column(exhaustive_timing), exhaustive_ops, exhaustive_configs, lower_bound]
+                              + timing_columns(exhaustive_timing) + [core_vertices])
+
+
+    # DSatur Branch and Bound (exact, reaches far beyond exhaustive search)
+    chromatic_num_exact = None
+    if "dsatur" in kept:
+        chromatic_num_exact = kept["dsatur"][CHROMATIC_COLUMN] if kept["dsatur"] is not None else None
+    elif runs_dsatur:
+        (chromatic_num_exact, dsatur_ops, dsatur_configs), dsatur_timing = measure_counts(
+            component_chromatic_number, G, dsatur_chromatic_number, lower_bound, component_workers, split, reduce,
+            clique=[csr.nodes[i] for i in clique], mode=mode, timing=timing)
+        rows["raw"] += sample_rows("dsatur", num_vertices, edges_formatted, dsatur_timing)
+        rows["dsatur"] = ([num_vertices, edges_formatted, chromatic_num_exact, time_column(dsatur_timing), dsatur_ops, dsatur_configs, lower_bound]
+                          + timing_columns(dsatur_timing) + [core_vertices])
+
+
+    # Inclusion-exclusion (optional, exact in 2^n steps whatever the density, see inclusion_exclusion.py)
+    if "inclusion_exclusion" in kept:
+        if chromatic_num_exact is None and kept["inclusion_exclusion"] is not None:
+            chromatic_num_exact = kept["inclusion_exclusion"][CHROMATIC_COLUMN]
+    elif settings["inclusion_exclusion"] and num_vertices <= settings["inclusion_exclusion_max_vertices"]:
+        (chromatic_num_inclusion_exclusion, inclusion_exclusion_ops, inclusion_exclusion_configs), inclusion_exclusion_timing = measure_counts(
+            component_chromatic_number, G, inclusion_exclusion_chromatic_number, lower_bound, component_workers, split, reduce,
+            upper_bound=chromatic_num_greedy, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("inclusion_exclusion", num_vertices, edges_formatted, inclusion_exclusion_timing)
+        rows["inclusion_exclusion"] = ([num_vertices, edges_formatted, chromatic_num_inclusion_exclusion, time_column(inclusion_exclusion_timing), inclusion_exclusion_ops, inclusion_exclusion_configs, lower_bound]
+                                       + timing_columns(inclusion_exclusion_timing) + [core_vertices])
+        if chromatic_num_exact is None:
+            chromatic_num_exact = chromatic_num_inclusion_exclusion
+
+
+    # Greedy (or TabuCol) meeting the clique bound is optimal too
+    if chromatic_num_exact is None and lower_bound in (chromatic_num_greedy, chromatic_num_tabucol):
+        chromatic_num_exact = lower_bound
+
+    # Precision against the exact chromatic number (not applicable when no exact search was run)
+    def precision(chromatic_num):
+        return abs(chromatic_num_exact - chromatic_num) if chromatic_num_exact is not None else None
+
+
+    # Results, one row per CSV (Exec Time is the median of the timed runs), for the algorithms that ran
+    if "greedy" not in kept:
+        rows["greedy"] = ([num_vertices, edges_formatted, chromatic_num_greedy, time_column(greedy_timing), greedy_ops, greedy_configs, precision(chromatic_num_greedy), lower_bound]
+                          + timing_columns(greedy_timing))
+    if "random_greedy" not in kept:
+        rows["random_greedy"] = ([num_vertices, edges_formatted, chromatic_num_random_greedy, time_column(random_greedy_timing), random_greedy_ops, random_greedy_configs, precision(chromatic_num_random_greedy), lower_bound]
+                                 + timing_columns(random_greedy_timing))
+    if "nx_random_sequential" not in kept:
+        rows["nx_random_sequential"] = ([num_vertices, edges_formatted, chromatic_num_nx_random_sequential, time_column(nx_random_sequential_timing), precision(chromatic_num_nx_random_sequential), lower_bound]
+                                        + timing_columns(nx_random_sequential_timing))
+    if chromatic_num_tabucol is not None and "tabucol" not in kept:
+        rows["tabucol"] = ([num_vertices, edges_formatted, chromatic_num_tabucol, time_column(tabucol_timing), tabucol_ops, tabucol_configs, precision(chromatic_num_tabucol), lower_bound, tabucol_iterations]
+                           + timing_columns(tabucol_timing))
+    if runs_reduced_greedy:
+        rows["reduced_greedy"] = ([num_vertices, edges_formatted, chromatic_num_reduced_greedy, time_column(reduced_greedy_timing), reduced_greedy_ops, reduced_greedy_configs, precision(chromatic_num_reduced_greedy), lower_bound]
+                                  + timing_columns(reduced_greedy_timing) + [core_vertices])
+
+    return rows
+
+
+def main(workers=1, tabucol=False, mode="both", split_components=True, component_workers=1, reduce=True,
+         reduced_greedy=False, checkpoint_path=None, rerun=(), store_path="results.db", inclusion_exclusion=False):
     edges = [12.5, 25, 50, 75]
-    trials = 1
     maxVertices = 500
-    graph_folder = "graphs"  
-    exhaustive_max_vertices = 11
+    settings = {
+        "timing": {"warmup": 1, "min_time": 0.05, "min_repeats": 3},  # Per algorithm and graph (see benchmark.py)
+        "mode": mode,  # "timing" leaves the counts empty, "counts" the times
+        "seed": 103199,  # Every cell is seeded from this and its (vertices, edge %)
+        "graph_folder": "graphs",
+        "corpus_path": "graphs.corpus",  # Packed graphs (see graph_corpus.py), preferred over the pickles
+        "exhaustive_max_vertices": 12,  # Batched search, 12 vertices take seconds
+        # Processes sharing each counted exhaustive search (the sweep itself is spread over the workers otherwise);
+        # the timed runs stay in process (see exhaustive.py)
+        "exhaustive_workers": os.cpu_count() if workers == 1 else 1,
+        "dsatur_max_vertices": 60,  # Exact DSatur branch and bound, used for precision when available
+        "clique_time_budget": 1.0,  # Seconds of maximum clique search per graph (lower bound)
+        "split_components": split_components,  # Exact searches per connected component
+        "component_workers": component_workers,  # Processes solving the components of a graph
+        "reduce": reduce,  # Peel the vertices of degree below the clique bound before the exact searches
+        "reduced_greedy": reduced_greedy,  # Also run greedy on the peeled graph (results/reduced_greedy_results.csv)
+        "tabucol": tabucol,  # Also run TabuCol (results/tabucol_results.csv)
+        # Also run inclusion-exclusion (results/inclusion_exclusion_results.csv), 2^n time and memory: 20 vertices take a second
+        "inclusion_exclusion": inclusion_exclusion,
+        "inclusion_exclusion_max_vertices": 20,
+        "tabucol_time_budget": 2.0,  # Seconds of TabuCol per graph
+        "tabucol_max_iterations": 100000,
+    }
+
+    # Every run's rows are also appended to the results store, read by results.py (see results_store.py)
+    store = open_store(store_path)
+    run = start_run(store, "chromatic.py")
+
+    # With a checkpoint, finished cells are skipped and the CSVs rewritten from it (see checkpoint.py)
+    checkpoint = open_checkpoint(checkpoint_path, {"seed": settings["seed"], "mode": mode}) if checkpoint_path else None
+    if checkpoint is not None and rerun:
+        drop_algorithms(checkpoint, rerun)
 
     with open('results/greedy_results.csv', mode='w', newline='') as greedy_file, \
          open('results/exhaustive_results.csv', mode='w', newline='') as exhaustive_file, \
+         open('results/dsatur_results.csv', mode='w', newline='') as dsatur_file, \
          open('results/random_greedy_results.csv', mode='w', newline='') as random_greedy_file, \
-         open('results/nx_random_sequential_results.csv', mode='w', newline='') as nx_random_sequential_file:
+         open('results/nx_random_sequential_results.csv', mode='w', newline='') as nx_random_sequential_file, \
+         (open('results/tabucol_results.csv', mode='w', newline='') if tabucol else nullcontext()) as tabucol_file, \
+         (open('results/reduced_greedy_results.csv', mode='w', newline='') if reduced_greedy else nullcontext()) as reduced_greedy_file, \
+         (open('results/inclusion_exclusion_results.csv', mode='w', newline='') if inclusion_exclusion else nullcontext()) as inclusion_exclusion_file, \
+         open('results/raw_times.csv', mode='w', newline='') as raw_file:
         
-        greedy_writer = csv.writer(greedy_file)
-        exhaustive_writer = csv.writer(exhaustive_file)
-        random_greedy_writer = csv.writer(random_greedy_file)
-        nx_random_sequential_writer = csv.writer(nx_random_sequential_file)
+        writers = {
+            "greedy": csv.writer(greedy_file),
+            "exhaustive": csv.writer(exhaustive_file),
+            "dsatur": csv.writer(dsatur_file),
+            "random_greedy": csv.writer(random_greedy_file),
+            "nx_random_sequential": csv.writer(nx_random_sequential_file),
+            "raw": csv.writer(raw_file),  # Every timed run (see benchmark.py)
+        }
 
         # CSV headers
         headers = ['Vertices', 'Edge %', 'Chromatic Number', 'Exec Time', 
                    'Basic Operations', 'Configurations Tested', 'Precision']
-        greedy_writer.writerow(headers)
-        exhaustive_writer.writerow(headers[:-1])  # Exhaustive doesn't need precision
-        random_greedy_writer.writerow(headers)
-        nx_random_sequential_writer.writerow(headers[:-3] + headers[-1:])
-
-
-        for num_vertices in range(4, maxVertices + 1):
-            print("Vertices: "+str(num_vertices))
-            
-            for edge_percentage in edges:
-
-                # Graph filename based on parameters
-                graph_filename = f"graph_{num_vertices}_vertices_{int(edge_percentage)}_edges.pkl"
-                G = load_graph(graph_folder, graph_filename)  # Try loading the graph
-
-                if G is None:
-                    G = generate_random_graph(num_vertices, edge_percentage / 100)  # Generate the graph
-                    save_graph(G, graph_folder, graph_filename)  # Save the graph
-
-
-                num_edges = G.number_of_edges()  # Get the number of edges
-                edges_formatted = f"{num_edges} ({edge_percentage}%)"
-
-                # Greedy Heuristic 
-                greedy_times = []
-                greedy_basic_ops = 0
-                greedy_configs = 0
-                chromatic_num_greedy = None
-                
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_greedy, basic_ops_greedy, configs_greedy = greedy_chromatic_number(G)
-                    end = time.time()
-                    greedy_times.append((end - start) * 10**3)
-                    greedy_basic_ops += basic_ops_greedy
-                    greedy_configs += configs_greedy
-                
-                avg_greedy_time = sum(greedy_times) / trials
-                avg_greedy_ops = greedy_basic_ops // trials
-                avg_greedy_configs = greedy_configs // trials
-
-
-                # Random Greedy Heuristic 
-                random_greedy_times = []
-                random_greedy_basic_ops = 0
-                random_greedy_configs = 0
-                chromatic_num_random_greedy = None
-                
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_random_greedy, basic_ops_random_greedy, configs_random_greedy = random_greedy_chromatic_number(G, min(500, 6*num_vertices))
-                    end = time.time()
-                    random_greedy_times.append((end - start) * 10**3)
-                    random_greedy_basic_ops += basic_ops_random_greedy
-                    random_greedy_configs += configs_random_greedy
-                
-                avg_random_greedy_time = sum(random_greedy_times) / trials
-                avg_random_greedy_ops = random_greedy_basic_ops // trials
-                avg_random_greedy_configs = random_greedy_configs // trials
-
-                # NetworkX Random Sequential 
-                nx_random_sequential_times = []
-                chromatic_num_nx_random_sequential = None
-
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_nx_random_sequential = networkx_random_sequential(G, min(500, 6*num_vertices))
-                    end = time.time()
-                    nx_random_sequential_times.append((end - start) * 10**3)
-
-                avg_nx_random_sequential_time = sum(nx_random_sequential_times) / trials
-
-
-                # Exhaustive Search (only for smaller instances)
-                if num_vertices <= exhaustive_max_vertices:
-                    exhaustive_times = []
-                    exhaustive_basic_ops = 0
-                    exhaustive_configs = 0
-                    chromatic_num_exhaustive = None
-
-                    for _ in range(trials):
-                        start = time.time()
-                        chromatic_num_exhaustive, basic_ops_exhaustive, configs_exhaustive = exhaustive_chromatic_number(G)
-                        end = time.time()
-                        exhaustive_times.append((end - start) * 10**3)
-                        exhaustive_basic_ops += basic_ops_exhaustive
-                        exhaustive_configs += configs_exhaustive
-
-                    avg_exhaustive_time = sum(exhaustive_times) / trials
-                    avg_exhaustive_ops = exhaustive_basic_ops // trials
-                    avg_exhaustive_configs = exhaustive_configs // trials
-                    exhaustive_writer.writerow([num_vertices, edges_formatted, chromatic_num_exhaustive, f"{avg_exhaustive_time:.4f}", avg_exhaustive_ops, avg_exhaustive_configs])
-
-                    # Calculate precision
-                    greedy_precision = abs(chromatic_num_exhaustive - chromatic_num_greedy)
-                    random_greedy_precision = abs(chromatic_num_exhaustive - chromatic_num_random_greedy)
-                    nx_random_sequential_precision = abs(chromatic_num_exhaustive - chromatic_num_nx_random_sequential)
-                else:
-                    greedy_precision = None         # Precision not applicable when exhaustive not run
-                    random_greedy_precision = None  # Precision not applicable when exhaustive not run
-                    nx_random_sequential_precision = None  # Precision not applicable when exhaustive not run
-
-
-                # Write results 
-                greedy_writer.writerow([num_vertices, edges_formatted, chromatic_num_greedy, f"{avg_greedy_time:.4f}", avg_greedy_ops, avg_greedy_configs, greedy_precision])
-                random_greedy_writer.writerow([num_vertices, edges_formatted, chromatic_num_random_greedy, f"{avg_random_greedy_time:.4f}", avg_random_greedy_ops, avg_random_greedy_configs, random_greedy_precision])
-                nx_random_sequential_writer.writerow([num_vertices, edges_formatted, chromatic_num_nx_random_sequential, f"{avg_nx_random_sequential_time:.4f}", nx_random_sequential_precision])
+        algorithm_headers = {
+            "greedy": headers + ['Lower Bound'] + TIMING_HEADERS,
+            "exhaustive": headers[:-1] + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices'],  # Exhaustive doesn't need precision
+            "dsatur": headers[:-1] + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices'],  # DSatur is exact as well
+            "random_greedy": headers + ['Lower Bound'] + TIMING_HEADERS,
+            "nx_random_sequential": headers[:-3] + headers[-1:] + ['Lower Bound'] + TIMING_HEADERS,
+        }
+        if tabucol:
+            writers["tabucol"] = csv.writer(tabucol_file)
+            algorithm_headers["tabucol"] = headers + ['Lower Bound', 'Iterations'] + TIMING_HEADERS
+        if reduced_greedy:
+            writers["reduced_greedy"] = csv.writer(reduced_greedy_file)
+            algorithm_headers["reduced_greedy"] = headers + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices']
+        if inclusion_exclusion:
+            writers["inclusion_exclusion"] = csv.writer(inclusion_exclusion_file)
+            algorithm_headers["inclusion_exclusion"] = headers[:-1] + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices']  # Exact
+        for name, header in algorithm_headers.items():
+            writers[name].writerow(header)
+        writers["raw"].writerow(RAW_HEADERS)
+
+        algorithms = list(algorithm_headers)
+
+        cells = [(num_vertices, edge_percentage) for num_vertices in range(4, maxVertices + 1) for edge_percentage in edges]
+        for (num_vertices, edge_percentage), rows in zip(cells, resume_cells(map_cells, run_cell, cells, settings, workers,
+                                                                            checkpoint, algorithms)):
+            if edge_percentage == edges[0]:
+                print("Vertices: "+str(num_vertices))
+
+            # Rows come back in cell order, whatever order the workers finish them in
+            writers["raw"].writerows(rows.pop("raw"))
+            for name, row in rows.items():
+                if row is not None:
+                    writers[name].writerow(row)
+            append_results(store, run, "random", rows, algorithm_headers, edge_percentage)  # Same rows, typed
+
+    store.close()
+    if checkpoint is not None:
+        checkpoint.close()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Run the random graph sweep and write the results CSVs.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes running sweep cells in parallel")
+    parser.add_argument("--tabucol", action="store_true", help="Also run the TabuCol local search")
+    parser.add_argument("--mode", choices=MODES, default="both",
+                        help="Timed runs (without counters), operation counts, or both")
+    parser.add_argument("--whole-graph", action="store_true",
+                        help="Run the exact searches on the whole graph instead of per connected component")
+    parser.add_argument("--component-workers", type=int, default=1,
+                        help="Processes solving the connected components of a graph in parallel")
+    parser.add_argument("--no-reduction", action="store_true",
+                        help="Don't peel the vertices of degree below the clique bound before the exact searches")
+    parser.add_argument("--reduced-greedy", action="store_true",
+                        help="Also run greedy on the peeled graph, the removed vertices colored last")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file: store every finished cell there and skip the stored ones (resume)")
+    parser.add_argument("--rerun", action="append", default=[],
+                        help="Run an algorithm again on every cell of the checkpoint (e.g. greedy), keeping the others")
+    parser.add_argument("--store", default="results.db", help="Results store the rows are appended to")
+    parser.add_argument("--inclusion-exclusion", action="store_true",
+                        help="Also run the inclusion-exclusion exact search (up to 20 vertices, as fast on dense graphs)")
+    args = parser.parse_args()
+    main(args.workers, args.tabucol, args.mode, not args.whole_graph, args.component_workers, not args.no_reduction,
+         args.reduced_greedy, args.checkpoint, args.rerun, args.store, args.inclusion_exclusion)
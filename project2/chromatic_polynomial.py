@@ -0,0 +1,286 @@
+import argparse
+import csv
+import os
+from benchmark import measure_counts, time_column, timing_columns, TIMING_HEADERS
+from graph_corpus import open_corpus, load_corpus_graph
+from graph_utils import load_graph, load_webgraph
+from graph_index import update_index, select_graphs
+
+# CHROMATIC POLYNOMIAL: P(G, k), the number of proper colorings of G with k colors, for every k at once
+#   Deletion-contraction: for an edge uv, P(G) = P(G - uv) - P(G / uv) (the colorings of G - uv where u and v
+#   differ, minus the ones where they share a color, which are the colorings of G with u and v merged). On dense
+#   graphs the same identity is used the other way round for a missing edge, P(G) = P(G + uv) + P(G / uv), which
+#   heads for complete graphs instead of empty ones. Graphs are solved once each: every subgraph is relabeled
+#   to a canonical form (vertices sorted by color refinement, see canonical) and memoized, so the many
+#   isomorphic graphs met by the recursion are mostly expanded once. Color refinement isn't a full isomorphism
+#   test, so some isomorphic graphs get different forms and are solved twice, never wrongly.
+#   Components are solved separately (P is the product of theirs), and empty graphs (k^n), complete graphs
+#   (k (k-1) ... (k-n+1)) and trees (k (k-1)^(n-1)) need no recursion; a simplicial vertex (its neighbors a
+#   clique, e.g. a vertex of degree 1) takes any of the k - degree colors its neighbors leave, so it is
+#   dropped with a factor (k - degree).
+#
+#   Graphs are tuples of neighbor bitmasks (bit v: vertex v), polynomials lists of exact integer
+#   coefficients, the coefficient of k^i at index i.
+
+
+# POLYNOMIALS (coefficient lists, lowest degree first)
+def poly_add(a, b, sign=1):
+    result = list(a) + [0] * (len(b) - len(a))
+    for i, coefficient in enumerate(b):
+        result[i] += sign * coefficient
+    while len(result) > 1 and result[-1] == 0:
+        result.pop()
+    return result
+
+
+def poly_mul(a, b):
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return result
+
+
+def evaluate(coefficients, k):
+    """
+    P(G, k) from the coefficients of chromatic_polynomial.
+    """
+    value = 0
+    for coefficient in reversed(coefficients):
+        value = value * k + coefficient
+    return value
+
+
+def falling_factorial(n):
+    # k (k-1) ... (k-n+1): the complete graph on n vertices
+    result = [1]
+    for i in range(n):
+        result = poly_mul(result, [-i, 1])
+    return result
+
+
+def power(base, exponent):
+    result = [1]
+    for _ in range(exponent):
+        result = poly_mul(result, base)
+    return result
+
+
+# GRAPHS (tuples of neighbor bitmasks)
+def drop_vertex(adjacency, v):
+    # Graph without vertex v, the vertices above it shifted down by one
+    low = (1 << v) - 1
+    return tuple((mask & low) | ((mask >> (v + 1)) << v) for u, mask in enumerate(adjacency) if u != v)
+
+
+def contract(adjacency, u, v):
+    # Graph with v merged into u (u < v); the merged vertex keeps the neighbors of both
+    merged = list(adjacency)
+    merged[u] = (adjacency[u] | adjacency[v]) & ~(1 << u) & ~(1 << v)
+    for w in range(len(adjacency)):
+        if w != u and adjacency[w] >> v & 1:
+            merged[w] |= 1 << u
+    return drop_vertex(merged, v)
+
+
+def toggle_edge(adjacency, u, v):
+    toggled = list(adjacency)
+    toggled[u] ^= 1 << v
+    toggled[v] ^= 1 << u
+    return tuple(toggled)
+
+
+def components(adjacency):
+    # Vertex bitmask of every connected component
+    remaining = (1 << len(adjacency)) - 1
+    result = []
+    while remaining:
+        component = frontier = remaining & -remaining
+        while frontier:
+            reached = 0
+            while frontier:
+                vertex = frontier & -frontier
+                reached |= adjacency[vertex.bit_length() - 1]
+                frontier ^= vertex
+            frontier = reached & ~component
+            component |= frontier
+        result.append(component)
+        remaining &= ~component
+    return result
+
+
+def induced(adjacency, vertices):
+    # Subgraph induced by a vertex bitmask, its vertices renumbered in order
+    order = [v for v in range(len(adjacency)) if vertices >> v & 1]
+    position = {v: i for i, v in enumerate(order)}
+    return tuple(sum(1 << position[w] for w in order if adjacency[v] >> w & 1) for v in order)
+
+
+def simplicial_vertex(adjacency):
+    # A vertex whose neighbors form a clique (e.g. of degree 1), or None
+    for v, neighbors in enumerate(adjacency):
+        rest = neighbors
+        while rest:
+            w = rest & -rest
+            w_index = w.bit_length() - 1
+            if (adjacency[w_index] | w) & neighbors != neighbors:
+                break
+            rest ^= w
+        else:
+            return v
+    return None
+
+
+def canonical(adjacency):
+    """
+    The graph relabeled with its vertices sorted by color refinement, which is the memo key: graphs with the
+    same key are the same graph up to relabeling. Vertices are classed by degree, then by their class and the
+    sorted classes of their neighbors until the classes stop splitting; a class keeps its place among the
+    others when it splits, so the vertices stay sorted by degree (ties left in their order).
+    """
+    n = len(adjacency)
+    neighbors = [[w for w in range(n) if mask >> w & 1] for mask in adjacency]
+    classes = [len(adjacent) for adjacent in neighbors]
+    num_classes = len(set(classes))
+    while num_classes < n:
+        signatures = [(classes[v], tuple(sorted(classes[w] for w in neighbors[v]))) for v in range(n)]
+        ranks = {signature: i for i, signature in enumerate(sorted(set(signatures)))}
+        if len(ranks) == num_classes:
+            break
+        classes, num_classes = [ranks[signature] for signature in signatures], len(ranks)
+
+    order = sorted(range(n), key=classes.__getitem__)
+    position = [0] * n
+    for i, v in enumerate(order):
+        position[v] = i
+    return tuple(sum(1 << position[w] for w in neighbors[v]) for v in order)
+
+
+# DELETION-CONTRACTION with tracking of operations (recursion steps) and configurations (graphs solved)
+def graph_polynomial(adjacency, cache, state):
+    key = canonical(adjacency)
+    if key in cache:
+        return cache[key]
+    state["configurations_tested"] += 1
+    adjacency = key
+
+    n = len(adjacency)
+    degrees = [mask.bit_count() for mask in adjacency]
+    num_edges = sum(degrees) // 2
+
+    parts = components(adjacency) if num_edges else []
+    if num_edges == 0:
+        result = [0] * n + [1]  # k^n
+    elif len(parts) > 1:
+        result = [1]
+        for part in parts:
+            result = poly_mul(result, graph_polynomial(induced(adjacency, part), cache, state))
+    elif num_edges == n * (n - 1) // 2:
+        result = falling_factorial(n)
+    elif num_edges == n - 1:
+        result = poly_mul([0, 1], power([-1, 1], n - 1))  # Tree: k (k-1)^(n-1)
+    elif (v := simplicial_vertex(adjacency)) is not None:
+        # Its neighbors all have different colors, so it takes any of the other k - degree
+        result = poly_mul([-degrees[v], 1], graph_polynomial(drop_vertex(adjacency, v), cache, state))
+    else:
+        state["basic_operations"] += 1
+        if 2 * num_edges > n * (n - 1) // 2:
+            # Dense: add a missing edge at the vertex of highest degree (canonical order: the last one)
+            u = n - 1
+            while degrees[u] == n - 1:
+                u -= 1
+            v = max((w for w in range(n) if w != u and not adjacency[u] >> w & 1), key=degrees.__getitem__)
+            result = poly_add(graph_polynomial(toggle_edge(adjacency, u, v), cache, state),
+                              graph_polynomial(contract(adjacency, min(u, v), max(u, v)), cache, state))
+        else:
+            # Sparse: delete an edge at the vertex of lowest degree (the first one)
+            u = 0
+            v = max((w for w in range(n) if adjacency[u] >> w & 1), key=degrees.__getitem__)
+            result = poly_add(graph_polynomial(toggle_edge(adjacency, u, v), cache, state),
+                              graph_polynomial(contract(adjacency, u, v), cache, state), sign=-1)
+
+    cache[key] = result
+    return result
+
+
+def to_adjacency(graph):
+    index = {node: i for i, node in enumerate(graph.nodes())}
+    adjacency = [0] * len(index)
+    for u, v in graph.edges():
+        if u != v:
+            adjacency[index[u]] |= 1 << index[v]
+            adjacency[index[v]] |= 1 << index[u]
+    return tuple(adjacency)
+
+
+def chromatic_polynomial(graph, cache=None, state=None):
+    """
+    Chromatic polynomial of a NetworkX graph.
+
+    :param cache: Memo {canonical graph: coefficients}, e.g. shared by the graphs of a sweep (a fresh one by default).
+    :param state: Optional dict whose "basic_operations" and "configurations_tested" counters are increased.
+    :return: Integer coefficients, the coefficient of k^i at index i (length: vertices + 1).
+    """
+    state = state if state is not None else {"basic_operations": 0, "configurations_tested": 0}
+    return graph_polynomial(to_adjacency(graph), {} if cache is None else cache, state)
+
+
+def polynomial_chromatic_number(graph, lower_bound=1, cache=None):
+    """
+    Exact chromatic number as the smallest k with P(G, k) > 0.
+
+    Basic operations are the deletion-contraction steps, and each graph whose polynomial is expanded
+    (not found in the memo) is a configuration.
+
+    :param lower_bound: Known lower bound (e.g. a clique size): smaller k aren't evaluated.
+    :return: (chromatic_number, basic_operations, configurations_tested, coefficients)
+    """
+    state = {"basic_operations": 0, "configurations_tested": 0}
+    coefficients = chromatic_polynomial(graph, cache, state)
+    n = len(coefficients) - 1
+    k = min(max(lower_bound, 1), n)
+    while evaluate(coefficients, k) == 0:
+        k += 1
+    return k, state["basic_operations"], state["configurations_tested"], coefficients
+
+
+# SWEEP: the polynomials of chromatic.py's small random graphs and of the small SW graphs
+def main(max_vertices=20, graph_folder="graphs", corpus_path="graphs.corpus", webgraph_folder="graphs_web"):
+    edges = [12.5, 25, 50, 75]
+    timing = {"warmup": 1, "min_time": 0.05, "min_repeats": 3}  # See benchmark.py
+    corpus = open_corpus(corpus_path) if os.path.exists(corpus_path) else None
+
+    graphs = []
+    for num_vertices in range(4, max_vertices + 1):
+        for edge_percentage in edges:
+            G = load_corpus_graph(corpus, num_vertices, edge_percentage) if corpus is not None else None
+            if G is None:
+                G = load_graph(graph_folder, f"graph_{num_vertices}_vertices_{int(edge_percentage)}_edges.pkl")
+            if G is None:
+                print(f"Graph of {num_vertices} vertices and {edge_percentage}% edges not found (run chromatic.py first)")
+                continue
+            graphs.append((f"random {edge_percentage}%", G))
+    for _, graph_filename in select_graphs(update_index(f"{webgraph_folder}/sw", webgraph_folder), None, max_vertices):
+        graphs.append((graph_filename, load_webgraph(webgraph_folder, graph_filename)))
+
+    with open('results/chromatic_polynomials.csv', mode='w', newline='') as polynomial_file:
+        writer = csv.writer(polynomial_file)
+        writer.writerow(['Graph', 'Vertices', 'Edges', 'Chromatic Number', 'Exec Time', 'Basic Operations',
+                         'Configurations Tested'] + TIMING_HEADERS + ['Colorings', 'Coefficients'])
+
+        for name, G in graphs:
+            # A fresh memo per timed run, so every graph is timed from scratch
+            (chromatic_number, basic_operations, configurations_tested, coefficients), polynomial_timing = measure_counts(
+                polynomial_chromatic_number, G, timing=timing, counted=False)
+            # Colorings with the fewest colors, and the coefficients from k^n down to the constant term
+            writer.writerow([name, G.number_of_nodes(), G.number_of_edges(), chromatic_number, time_column(polynomial_timing),
+                             basic_operations, configurations_tested] + timing_columns(polynomial_timing)
+                            + [evaluate(coefficients, chromatic_number), " ".join(map(str, reversed(coefficients)))])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chromatic polynomials of the small random and SW graphs.")
+    parser.add_argument("--max-vertices", type=int, default=20)
+    args = parser.parse_args()
+    main(args.max_vertices)
@@ -1,10 +1,24 @@
+import argparse
+import math
 import os
 import random
-import time
 import csv
 import networkx as nx
+import numpy as np
+from contextlib import nullcontext
 from itertools import product
-from graph_utils import load_webgraph
+from graph_utils import load_webgraph, graph_to_csr, csr_degrees, csr_greedy_coloring, csr_batch_greedy_coloring
+from dsatur import dsatur_chromatic_number
+from max_clique import maximum_clique
+from tabucol import tabucol_chromatic_number
+from exhaustive import parallel_exhaustive_chromatic_number
+from graph_index import update_index, select_graphs
+from components import component_chromatic_number
+from reduction import reduce_graph, csr_reduced_greedy_coloring
+from results_store import open_store, start_run, append_results
+from benchmark import measure_counts, sample_rows, time_column, timing_columns, MODES, TIMING_HEADERS, RAW_HEADERS
+from checkpoint import open_checkpoint, drop_algorithms, resume_cells
+from sweep import map_cells
 
 # EXHAUSTIVE SEARCH with tracking of operations and configurations tested
 def is_valid_coloring(graph, coloring):
@@ -15,19 +29,42 @@ def is_valid_coloring(graph, coloring):
             return False, basic_operations
     return True, basic_operations
 
-def exhaustive_chromatic_number(graph):
+# Same check without counters, for the timed runs
+def is_proper_coloring(edges, coloring):
+    for u, v in edges:
+        if coloring[u] == coloring[v]:
+            return False
+    return True
+
+def exhaustive_chromatic_number(graph, lower_bound=1, upper_bound=None, count=True):
+    # Only colors between a lower bound (a clique size) and an upper bound (a known coloring) are tried
     n = len(graph.nodes())
+    if any(node != i for i, node in enumerate(graph.nodes())):
+        graph = nx.convert_node_labels_to_integers(graph)  # Colorings are indexed by vertex (e.g. components)
+    if not count:
+        return uncounted_exhaustive_chromatic_number(graph, n, lower_bound, upper_bound)
     basic_operations = 0
     configurations_tested = 0   
 
-    for num_colors in range(1, n + 1):
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
         for coloring in product(range(num_colors), repeat=n):
             configurations_tested += 1
             is_valid, edge_operations = is_valid_coloring(graph, coloring)  # Check if valid and get edge operations
             basic_operations += edge_operations    
             if is_valid:                            # If the coloring is valid
                 return num_colors, basic_operations, configurations_tested
-    return n, basic_operations, configurations_tested  # Worst case
+    return n if upper_bound is None else upper_bound, basic_operations, configurations_tested  # Worst case
+
+def uncounted_exhaustive_chromatic_number(graph, n, lower_bound, upper_bound):
+    # The search above without counters (count=False): same colorings in the same order
+    edges = list(graph.edges())
+    last = n if upper_bound is None else upper_bound - 1
+    for num_colors in range(max(lower_bound, 1), last + 1):
+        for coloring in product(range(num_colors), repeat=n):
+            if is_proper_coloring(edges, coloring):
+                return num_colors, None, None
+    return n if upper_bound is None else upper_bound, None, None  # Worst case
 
 
 # GREEDY HEURISTIC with tracking of operations and configurations tested
@@ -53,6 +90,28 @@ def greedy_chromatic_number(graph):
     return chromatic_number, basic_operations, configurations_tested
 
 
+# GREEDY HEURISTIC over the CSR adjacency (same order, colors and counts as greedy_chromatic_number)
+def csr_greedy_chromatic_number(csr):
+    # Descending degree, ties kept in node order (like the stable sorted() above)
+    vertices = np.argsort(-csr_degrees(csr), kind='stable')
+    colors = csr_greedy_coloring(csr, vertices)
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested
+
+
+# GREEDY HEURISTIC on the lower_bound-core, the peeled low-degree vertices colored last (see reduction.py)
+def csr_reduced_greedy_chromatic_number(csr, lower_bound):
+    colors, _ = csr_reduced_greedy_coloring(csr, lower_bound, lambda core: np.argsort(-csr_degrees(core), kind='stable'))
+
+    chromatic_number = int(colors.max()) + 1
+    basic_operations = int(colors.sum())  # The color search advances once per color skipped
+    configurations_tested = len(colors)  # Each assignment is considered a configuration
+    return chromatic_number, basic_operations, configurations_tested
+
+
 # RANDOM GREEDY with tracking of operations and configurations tested
 def random_greedy_chromatic_number(graph, trials):
     basic_operations = 0
@@ -91,6 +150,81 @@ def random_greedy_chromatic_number(graph, trials):
     return best_chromatic_number, basic_operations, configurations_tested
 
 
+# RANDOM GREEDY over the CSR adjacency (same shuffles, colors and counts as random_greedy_chromatic_number)
+def csr_random_greedy_chromatic_number(csr, trials):
+    basic_operations = 0
+    configurations_tested = 0
+
+    best_chromatic_number = float('inf')
+    tested_orders = set()
+    vertices = list(range(len(csr.nodes)))
+
+    for _ in range(trials):
+        while True:
+            random.shuffle(vertices)
+            vertex_order = tuple(vertices)
+            if vertex_order not in tested_orders:
+                tested_orders.add(vertex_order)
+                break
+
+        colors = csr_greedy_coloring(csr, vertices)
+        basic_operations += int(colors.sum())
+        configurations_tested += len(colors)
+
+        chromatic_number = int(colors.max()) + 1
+        best_chromatic_number = min(best_chromatic_number, chromatic_number)
+
+    return best_chromatic_number, basic_operations, configurations_tested
+
+
+# BATCHED RANDOM GREEDY (memory-lean: orders are deduplicated by a 64-bit hash, not stored)
+def batch_random_greedy_chromatic_number(csr, trials=30, rng=None, batch_size=64):
+    """
+    Random greedy over `trials` distinct random vertex orders, colored batch_size orders at a time.
+
+    Orders are drawn with a NumPy Generator (one (batch_size, n) block of permutations per pass)
+    and only a 64-bit hash of each tried order is kept, so memory doesn't grow with n and only by
+    one integer per trial. Counts are the same as csr_random_greedy_chromatic_number's per order.
+
+    :param csr: CSRGraph.
+    :param rng: NumPy Generator, by default seeded from the `random` module (so random.seed applies).
+    :return: (best_chromatic_number, basic_operations, configurations_tested)
+    """
+    n = len(csr.nodes)
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    trials = min(trials, math.factorial(n))  # There are only n! distinct orders
+
+    # Hash of an order: sum of order[i] * weights[i] modulo 2**64, with random odd weights
+    weights = rng.integers(0, 2**63, size=n, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    tested_hashes = set()
+
+    basic_operations = 0
+    configurations_tested = 0
+    best_chromatic_number = float('inf')
+    identity = np.arange(n, dtype=np.int64)
+
+    while len(tested_hashes) < trials:
+        orders = rng.permuted(np.tile(identity, (min(batch_size, trials - len(tested_hashes)), 1)), axis=1)
+        hashes = (orders.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64).tolist()
+
+        # Keep the orders never tried before (nor earlier in this batch)
+        fresh = []
+        for row, order_hash in enumerate(hashes):
+            if order_hash not in tested_hashes:
+                tested_hashes.add(order_hash)
+                fresh.append(row)
+        if not fresh:
+            continue
+
+        colors = csr_batch_greedy_coloring(csr, orders[fresh])
+        basic_operations += int(colors.sum())
+        configurations_tested += colors.size
+        # Best order of the batch: the one whose largest color is smallest
+        best_chromatic_number = min(best_chromatic_number, int(colors.max(axis=1).min()) + 1 if n > 0 else 0)
+
+    return best_chromatic_number, basic_operations, configurations_tested
+
 # NETWORKX RANDOM SEQUENTIAL with tracking of operations and configurations tested
 def networkx_random_sequential(graph, trials):
     """
@@ -109,146 +243,228 @@ def networkx_random_sequential(graph, trials):
 
 
 
-def main():
-    trials = 1
+# ONE WEB GRAPH: run every algorithm on it, like chromatic.py's run_cell (cells keyed by vertices and graph file)
+CHROMATIC_COLUMN = 2  # 'Chromatic Number' in every algorithm's row
+LOWER_BOUND_COLUMN = 6  # 'Lower Bound' in the greedy and random greedy rows
+
+def run_graph(num_vertices, graph_filename, settings):
+    timing = settings["timing"]  # Benchmark harness options (see benchmark.measure)
+    mode = settings["mode"]
+    # A resumed graph runs only the algorithms it is missing: the stored rows of the others are kept, and their
+    # chromatic numbers and clique bound feed the ones that run (see checkpoint.py)
+    kept = settings.get("kept", {})
+    # The exact searches run per connected component (see components.py) unless split_components is off,
+    # on the graph left once the vertices of degree below the clique bound are peeled (see reduction.py) unless reduce is off
+    split = settings["split_components"]
+    component_workers = settings["component_workers"]
+    reduce = settings["reduce"]
+
+    rows = dict.fromkeys(["greedy", "exhaustive", "dsatur", "random_greedy", "nx_random_sequential"]
+                         + ["tabucol"] * settings["tabucol"] + ["reduced_greedy"] * settings["reduced_greedy"])
+    rows["raw"] = []
+
+    G = load_webgraph(settings["graph_folder"], graph_filename)
+    if G is None:
+        print(f"Graph {graph_filename} not found!")
+        return rows
+
+    num_edges = G.number_of_edges()
+    csr = graph_to_csr(G)  # Compact adjacency used by the greedy kernels
+
+    # Greedy Heuristic 
+    if "greedy" in kept:
+        chromatic_num_greedy = kept["greedy"][CHROMATIC_COLUMN]
+    else:
+        (chromatic_num_greedy, greedy_ops, greedy_configs), greedy_timing = measure_counts(
+            csr_greedy_chromatic_number, csr, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("greedy", num_vertices, num_edges, greedy_timing)
+
+    # Clique lower bound: when it reaches the greedy colors, greedy is optimal and the exact searches stop at once.
+    # DSatur starts from the clique itself, the other algorithms only need its size, kept in the stored rows
+    runs_dsatur = "dsatur" not in kept and num_vertices <= settings["dsatur_max_vertices"]
+    bound_row = next((kept[name] for name in ("greedy", "random_greedy") if name in kept), None)
+    if bound_row is None or runs_dsatur:
+        clique, _ = maximum_clique(csr, settings["clique_time_budget"], upper_bound=chromatic_num_greedy)
+        lower_bound = len(clique)
+    else:
+        lower_bound = bound_row[LOWER_BOUND_COLUMN]
+
+    # Random Greedy Heuristic 
+    if "random_greedy" not in kept:
+        (chromatic_num_random_greedy, random_greedy_ops, random_greedy_configs), random_greedy_timing = measure_counts(
+            batch_random_greedy_chromatic_number, csr, min(500, 6*num_vertices), mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("random_greedy", num_vertices, num_edges, random_greedy_timing)
+        rows["random_greedy"] = ([num_vertices, num_edges, chromatic_num_random_greedy, time_column(random_greedy_timing), random_greedy_ops, random_greedy_configs, lower_bound]
+                                 + timing_columns(random_greedy_timing))
+
+    # TabuCol local search from the greedy coloring (optional, it runs until its budget is spent)
+    if settings["tabucol"] and "tabucol" not in kept:
+        (chromatic_num_tabucol, tabucol_ops, tabucol_configs, tabucol_iterations), tabucol_timing = measure_counts(
+            tabucol_chromatic_number, csr, settings["tabucol_time_budget"], settings["tabucol_max_iterations"], lower_bound,
+            mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("tabucol", num_vertices, num_edges, tabucol_timing)
+        rows["tabucol"] = ([num_vertices, num_edges, chromatic_num_tabucol, time_column(tabucol_timing),
+                            tabucol_ops, tabucol_configs, lower_bound, tabucol_iterations]
+                           + timing_columns(tabucol_timing))
+
+    # Vertices left for the exact searches once the ones of degree below the clique bound are peeled
+    core_vertices = reduce_graph(G, lower_bound)[2]["core_vertices"] if reduce else num_vertices
+
+    # Greedy on the clique bound's core (optional), the removed vertices colored last
+    if settings["reduced_greedy"] and "reduced_greedy" not in kept:
+        (chromatic_num_reduced_greedy, reduced_greedy_ops, reduced_greedy_configs), reduced_greedy_timing = measure_counts(
+            csr_reduced_greedy_chromatic_number, csr, lower_bound, mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("reduced_greedy", num_vertices, num_edges, reduced_greedy_timing)
+        rows["reduced_greedy"] = ([num_vertices, num_edges, chromatic_num_reduced_greedy, time_column(reduced_greedy_timing),
+                                   reduced_greedy_ops, reduced_greedy_configs, lower_bound]
+                                  + timing_columns(reduced_greedy_timing) + [core_vertices])
+
+    # NetworkX Random Sequential 
+    if "nx_random_sequential" not in kept:
+        chromatic_num_nx_random_sequential, nx_random_sequential_timing = measure_counts(
+            networkx_random_sequential, G, min(500, 6*num_vertices), mode=mode, timing=timing, counted=False)
+        rows["raw"] += sample_rows("nx_random_sequential", num_vertices, num_edges, nx_random_sequential_timing)
+        rows["nx_random_sequential"] = ([num_vertices, num_edges, chromatic_num_nx_random_sequential, time_column(nx_random_sequential_timing), "", "", lower_bound]
+                                        + timing_columns(nx_random_sequential_timing))
+
+
+    # Exhaustive Search (only for smaller instances)
+    if "exhaustive" not in kept and num_vertices <= settings["exhaustive_max_vertices"]:
+        (chromatic_num_exhaustive, exhaustive_ops, exhaustive_configs), exhaustive_timing = measure_counts(
+            component_chromatic_number, G, parallel_exhaustive_chromatic_number, lower_bound,
+            component_workers, split, reduce, workers=settings["exhaustive_workers"],
+            upper_bound=chromatic_num_greedy, mode=mode, timing=timing)
+        rows["raw"] += sample_rows("exhaustive", num_vertices, num_edges, exhaustive_timing)
+        rows["exhaustive"] = ([num_vertices, num_edges, chromatic_num_exhaustive, 
+                               time_column(exhaustive_timing), exhaustive_ops, exhaustive_configs, lower_bound]
+                              + timing_columns(exhaustive_timing) + [core_vertices])
+
+
+    # DSatur Branch and Bound (exact, reaches far beyond exhaustive search)
+    if runs_dsatur:
+        (chromatic_num_exact, dsatur_ops, dsatur_configs), dsatur_timing = measure_counts(
+            component_chromatic_number, G, dsatur_chromatic_number, lower_bound,
+            component_workers, split, reduce, clique=[csr.nodes[i] for i in clique],
+            mode=mode, timing=timing)
+        rows["raw"] += sample_rows("dsatur", num_vertices, num_edges, dsatur_timing)
+        rows["dsatur"] = ([num_vertices, num_edges, chromatic_num_exact,
+                           time_column(dsatur_timing), dsatur_ops, dsatur_configs, lower_bound]
+                          + timing_columns(dsatur_timing) + [core_vertices])
+
+    # Exec Time is the median of the timed runs
+    if "greedy" not in kept:
+        rows["greedy"] = ([num_vertices, num_edges, chromatic_num_greedy, time_column(greedy_timing), greedy_ops, greedy_configs, lower_bound]
+                          + timing_columns(greedy_timing))
+
+    return rows
+
+
+def main(min_vertices=None, max_vertices=None, tabucol=False, mode="both", split_components=True, component_workers=1,
+         reduce=True, reduced_greedy=False, store_path="results.db", checkpoint_path=None, rerun=()):
     graph_folder = "graphs_web"  
     facebook_folder = "graphs_web/facebook"
     sw_folder = "graphs_web/sw"
-    exhaustive_max_vertices = 11
+    settings = {
+        "timing": {"warmup": 1, "min_time": 0.05, "min_repeats": 3},  # Per algorithm and graph (see benchmark.py)
+        "mode": mode,  # "timing" leaves the counts empty, "counts" the times
+        "graph_folder": graph_folder,
+        "exhaustive_max_vertices": 11,
+        "exhaustive_workers": os.cpu_count(),  # Processes sharing each counted exhaustive search (timed runs: in process)
+        "dsatur_max_vertices": 60,  # Exact DSatur branch and bound, used for precision when available
+        "clique_time_budget": 1.0,  # Seconds of maximum clique search per graph (lower bound)
+        "split_components": split_components,  # Exact searches per connected component
+        "component_workers": component_workers,  # Processes solving the components of a graph
+        "reduce": reduce,  # Peel the vertices of degree below the clique bound before the exact searches
+        "reduced_greedy": reduced_greedy,  # Also run greedy on the peeled graph
+        "tabucol": tabucol,  # Also run TabuCol
+        "tabucol_time_budget": 2.0,  # Seconds of TabuCol per graph, when enabled
+        "tabucol_max_iterations": 100000,
+    }
+
+    # Every run's rows are also appended to the results store, read by results_webgraphs.py (see results_store.py)
+    store = open_store(store_path)
+    run = start_run(store, "chromatic_webgraphs.py")
+
+    # With a checkpoint, finished graphs are skipped and the CSVs rewritten from it (see checkpoint.py)
+    checkpoint = open_checkpoint(checkpoint_path, {"mode": mode}) if checkpoint_path else None
+    if checkpoint is not None and rerun:
+        drop_algorithms(checkpoint, rerun)
 
     # Open the CSV files for saving the results
     with open('results_webgraphs/facebook/greedy_results.csv', mode='w', newline='') as facebook_greedy_file, \
          open('results_webgraphs/facebook/exhaustive_results.csv', mode='w', newline='') as facebook_exhaustive_file, \
+         open('results_webgraphs/facebook/dsatur_results.csv', mode='w', newline='') as facebook_dsatur_file, \
          open('results_webgraphs/facebook/random_greedy_results.csv', mode='w', newline='') as facebook_random_greedy_file, \
          open('results_webgraphs/facebook/nx_random_sequential_results.csv', mode='w', newline='') as facebook_nx_random_sequential_file, \
          open('results_webgraphs/sw/greedy_results.csv', mode='w', newline='') as sw_greedy_file, \
          open('results_webgraphs/sw/exhaustive_results.csv', mode='w', newline='') as sw_exhaustive_file, \
+         open('results_webgraphs/sw/dsatur_results.csv', mode='w', newline='') as sw_dsatur_file, \
          open('results_webgraphs/sw/random_greedy_results.csv', mode='w', newline='') as sw_random_greedy_file, \
-         open('results_webgraphs/sw/nx_random_sequential_results.csv', mode='w', newline='') as sw_nx_random_sequential_file:
+         open('results_webgraphs/sw/nx_random_sequential_results.csv', mode='w', newline='') as sw_nx_random_sequential_file, \
+         (open('results_webgraphs/facebook/tabucol_results.csv', mode='w', newline='') if tabucol else nullcontext()) as facebook_tabucol_file, \
+         (open('results_webgraphs/sw/tabucol_results.csv', mode='w', newline='') if tabucol else nullcontext()) as sw_tabucol_file, \
+         (open('results_webgraphs/facebook/reduced_greedy_results.csv', mode='w', newline='') if reduced_greedy else nullcontext()) as facebook_reduced_greedy_file, \
+         (open('results_webgraphs/sw/reduced_greedy_results.csv', mode='w', newline='') if reduced_greedy else nullcontext()) as sw_reduced_greedy_file, \
+         open('results_webgraphs/facebook/raw_times.csv', mode='w', newline='') as facebook_raw_file, \
+         open('results_webgraphs/sw/raw_times.csv', mode='w', newline='') as sw_raw_file:
         
         # Create CSV writers for both folders
         facebook_writers = {
             "greedy": csv.writer(facebook_greedy_file),
             "exhaustive": csv.writer(facebook_exhaustive_file),
+            "dsatur": csv.writer(facebook_dsatur_file),
             "random_greedy": csv.writer(facebook_random_greedy_file),
             "nx_random_sequential": csv.writer(facebook_nx_random_sequential_file),
         }
+        facebook_raw_writer = csv.writer(facebook_raw_file)  # Every timed run (see benchmark.py)
         sw_writers = {
             "greedy": csv.writer(sw_greedy_file),
             "exhaustive": csv.writer(sw_exhaustive_file),
+            "dsatur": csv.writer(sw_dsatur_file),
             "random_greedy": csv.writer(sw_random_greedy_file),
             "nx_random_sequential": csv.writer(sw_nx_random_sequential_file),
         }
+        sw_raw_writer = csv.writer(sw_raw_file)
 
         headers = ['Vertices', 'Edges', 'Chromatic Number', 'Exec Time', 
                    'Basic Operations', 'Configurations Tested', 'Precision']
-        for writer in facebook_writers.values():
-            writer.writerow(headers[:-1])
-        for writer in sw_writers.values():
-            writer.writerow(headers[:-1])
+        # The exact searches also report the vertices left to them by the reduction
+        algorithm_headers = {name: headers[:-1] + ['Lower Bound'] + TIMING_HEADERS
+                                   + (['Core Vertices'] if name in ("exhaustive", "dsatur") else [])
+                             for name in facebook_writers}
+        if tabucol:
+            facebook_writers["tabucol"] = csv.writer(facebook_tabucol_file)
+            sw_writers["tabucol"] = csv.writer(sw_tabucol_file)
+            algorithm_headers["tabucol"] = headers[:-1] + ['Lower Bound', 'Iterations'] + TIMING_HEADERS
+        if reduced_greedy:
+            facebook_writers["reduced_greedy"] = csv.writer(facebook_reduced_greedy_file)
+            sw_writers["reduced_greedy"] = csv.writer(sw_reduced_greedy_file)
+            algorithm_headers["reduced_greedy"] = headers[:-1] + ['Lower Bound'] + TIMING_HEADERS + ['Core Vertices']
+        for writers in (facebook_writers, sw_writers):
+            for name, header in algorithm_headers.items():
+                writers[name].writerow(header)
+        facebook_writers["raw"] = facebook_raw_writer
+        sw_writers["raw"] = sw_raw_writer
+        for writer in (facebook_raw_writer, sw_raw_writer):
+            writer.writerow(RAW_HEADERS)
+
+        algorithms = list(algorithm_headers)
 
         def process_directory(folder, writers):
-            graph_files = [f for f in os.listdir(folder) if f.endswith(".edges") or f.endswith(".txt")]
-            sorted_graph_files = []
-
-            for graph_filename in graph_files:
-                G = load_webgraph(graph_folder, graph_filename)  
-                if G is not None:
-                    num_vertices = len(G.nodes())
-                    sorted_graph_files.append((num_vertices, graph_filename))
-                else:
-                    print(f"Failed to load graph: {graph_filename}")
-
-            sorted_graph_files.sort(key=lambda x: x[0])
-
-            for num_vertices, graph_filename in sorted_graph_files:
-                G = load_webgraph(graph_folder, graph_filename)
-
-                if G is None:
-                    print(f"Graph {graph_filename} not found!")
-                    continue
-
-                num_edges = G.number_of_edges()
-
-                # Greedy Heuristic 
-                greedy_times = []
-                greedy_basic_ops = 0
-                greedy_configs = 0
-                chromatic_num_greedy = None
-
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_greedy, basic_ops_greedy, configs_greedy = greedy_chromatic_number(G)
-                    end = time.time()
-                    greedy_times.append((end - start) * 10**3)
-                    greedy_basic_ops += basic_ops_greedy
-                    greedy_configs += configs_greedy
-
-                avg_greedy_time = sum(greedy_times) / trials
-                avg_greedy_ops = greedy_basic_ops // trials
-                avg_greedy_configs = greedy_configs // trials
-
-                # Random Greedy Heuristic 
-                random_greedy_times = []
-                random_greedy_basic_ops = 0
-                random_greedy_configs = 0
-                chromatic_num_random_greedy = None
-
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_random_greedy, basic_ops_random_greedy, configs_random_greedy = random_greedy_chromatic_number(G, min(500, 6*num_vertices))
-                    end = time.time()
-                    random_greedy_times.append((end - start) * 10**3)
-                    random_greedy_basic_ops += basic_ops_random_greedy
-                    random_greedy_configs += configs_random_greedy
-
-                avg_random_greedy_time = sum(random_greedy_times) / trials
-                avg_random_greedy_ops = random_greedy_basic_ops // trials
-                avg_random_greedy_configs = random_greedy_configs // trials
-
-                # NetworkX Random Sequential 
-                nx_random_sequential_times = []
-                chromatic_num_nx_random_sequential = None
-
-                for _ in range(trials):
-                    start = time.time()
-                    chromatic_num_nx_random_sequential = networkx_random_sequential(G, min(500, 6*num_vertices))
-                    end = time.time()
-                    nx_random_sequential_times.append((end - start) * 10**3)
-
-                avg_nx_random_sequential_time = sum(nx_random_sequential_times) / trials
-
-
-                # Exhaustive Search (only for smaller instances)
-                if num_vertices <= exhaustive_max_vertices:
-                    exhaustive_times = []
-                    exhaustive_basic_ops = 0
-                    exhaustive_configs = 0
-                    chromatic_num_exhaustive = None
-
-                    for _ in range(trials):
-                        start = time.time()
-                        chromatic_num_exhaustive, basic_ops_exhaustive, configs_exhaustive = exhaustive_chromatic_number(G)
-                        end = time.time()
-                        exhaustive_times.append((end - start) * 10**3)
-                        exhaustive_basic_ops += basic_ops_exhaustive
-                        exhaustive_configs += configs_exhaustive
-
-                    avg_exhaustive_time = sum(exhaustive_times) / trials
-                    avg_exhaustive_ops = exhaustive_basic_ops // trials
-                    avg_exhaustive_configs = exhaustive_configs // trials
-                    writers["exhaustive"].writerow([num_vertices, num_edges, chromatic_num_exhaustive, 
-                                                    f"{avg_exhaustive_time:.4f}", avg_exhaustive_ops, avg_exhaustive_configs])
-
-                    greedy_precision = abs(chromatic_num_exhaustive - chromatic_num_greedy)
-                    random_greedy_precision = abs(chromatic_num_exhaustive - chromatic_num_random_greedy)
-                else:
-                    greedy_precision = None
-                    random_greedy_precision = None
-
-                writers["greedy"].writerow([num_vertices, num_edges, chromatic_num_greedy, f"{avg_greedy_time:.4f}", avg_greedy_ops, avg_greedy_configs])
-                writers["random_greedy"].writerow([num_vertices, num_edges, chromatic_num_random_greedy, f"{avg_random_greedy_time:.4f}", avg_random_greedy_ops, avg_random_greedy_configs])
-                writers["nx_random_sequential"].writerow([num_vertices, num_edges, chromatic_num_nx_random_sequential, f"{avg_nx_random_sequential_time:.4f}", "", ""])
+            # Sorted and filtered from the directory's metadata index, each graph is loaded once
+            graphs = select_graphs(update_index(folder, graph_folder), min_vertices, max_vertices)
+
+            for (num_vertices, graph_filename), rows in zip(graphs, resume_cells(map_cells, run_graph, graphs, settings, 1,
+                                                                               checkpoint, algorithms)):
+                writers["raw"].writerows(rows.pop("raw"))
+                if rows["greedy"] is None:
+                    continue  # Not loaded
+                for name, row in rows.items():
+                    if row is not None:
+                        writers[name].writerow(row)
+                num_edges = rows["greedy"][1]
+                density = 100 * num_edges / (num_vertices * (num_vertices - 1) / 2) if num_vertices > 1 else 0
+                append_results(store, run, os.path.basename(folder), rows, algorithm_headers, density, graph_filename)
 
         # Process Facebook graphs
         process_directory(facebook_folder, facebook_writers)
@@ -256,5 +472,30 @@ def main():
         # Process SW graphs
         process_directory(sw_folder, sw_writers)
 
+    store.close()
+    if checkpoint is not None:
+        checkpoint.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run every algorithm on the Facebook and SW web graphs.")
+    parser.add_argument("--min-vertices", type=int, default=None, help="Skip graphs with fewer vertices")
+    parser.add_argument("--max-vertices", type=int, default=None, help="Skip graphs with more vertices")
+    parser.add_argument("--tabucol", action="store_true", help="Also run the TabuCol local search")
+    parser.add_argument("--mode", choices=MODES, default="both",
+                        help="Timed runs (without counters), operation counts, or both")
+    parser.add_argument("--whole-graph", action="store_true",
+                        help="Run the exact searches on the whole graph instead of per connected component")
+    parser.add_argument("--component-workers", type=int, default=1,
+                        help="Processes solving the connected components of a graph in parallel")
+    parser.add_argument("--no-reduction", action="store_true",
+                        help="Don't peel the vertices of degree below the clique bound before the exact searches")
+    parser.add_argument("--reduced-greedy", action="store_true",
+                        help="Also run greedy on the peeled graph, the removed vertices colored last")
+    parser.add_argument("--store", default="results.db", help="Results store the rows are appended to")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file: store every finished graph there and skip the stored ones (resume)")
+    parser.add_argument("--rerun", action="append", default=[],
+                        help="Run an algorithm again on every graph of the checkpoint (e.g. greedy), keeping the others")
+    args = parser.parse_args()
+    main(args.min_vertices, args.max_vertices, args.tabucol, args.mode, not args.whole_graph, args.component_workers,
+         not args.no_reduction, args.reduced_greedy, args.store, args.checkpoint, args.rerun)
\ No newline at end of file
@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import networkx as nx
+from reduction import reduce_graph
+
+# CONNECTED COMPONENTS (the chromatic number of a graph is the largest chromatic number of its components)
+#   The components are solved one by one, largest first, each as a graph of its own: an exact search
+#   on two 8-vertex components is far cheaper than on the 16-vertex graph. A component can't need
+#   more colors than its vertices or than its largest degree + 1, so once the best chromatic number so
+#   far reaches that bound the component is skipped (and every smaller one once its size is reached).
+#   The solver gets the best so far as its lower bound, so it only has to tell whether a component needs more.
+#   The graph is first reduced to its lower_bound-core (see reduction.py), which often splits it further.
+
+
+def connected_components(graph):
+    """
+    Vertex lists of the components of a NetworkX graph, largest first (ties: the component whose
+    first vertex comes first), each in the graph's node order.
+    """
+    position = {node: i for i, node in enumerate(graph.nodes())}
+    components = [sorted(component, key=position.__getitem__) for component in nx.connected_components(graph)]
+    components.sort(key=lambda component: (-len(component), position[component[0]]))
+    return components
+
+
+def color_bound(graph, component):
+    # Colors a component can need at most: one per vertex, and never more than its largest degree + 1
+    return min(len(component), max(graph.degree[node] for node in component) + 1)
+
+
+def add_counts(total, counts):
+    # Counts of solvers run without counters are None, and so is their sum
+    if total is None or counts is None:
+        return None
+    return total + counts
+
+
+def component_chromatic_number(graph, solver, lower_bound=1, component_workers=1, split=True, reduce=True,
+                               **solver_kwargs):
+    """
+    Chromatic number of a graph from the chromatic numbers of its connected components.
+
+    With component_workers > 1 the components are solved on a process pool (the solver has to be a module level
+    function); each gets only the initial lower bound, and the ones not started yet are dropped once
+    the best result makes them irrelevant, so the counts depend on the order the components finish in.
+
+    :param solver: solver(graph, lower_bound=..., **solver_kwargs) returning (chromatic_number,
+                   basic_operations, configurations_tested), e.g. exhaustive_chromatic_number. Its answer
+                   may be raised to the lower bound (or capped at an upper bound of the whole graph).
+    :param lower_bound: Known lower bound for the whole graph (e.g. a clique size).
+    :param split: False hands the whole graph to the solver (to compare with the split search).
+    :param reduce: False skips the low-degree reduction.
+    :return: (chromatic_number, basic_operations, configurations_tested), counts summed over the
+             components solved.
+    """
+    if reduce and graph.number_of_nodes():
+        graph, _, _ = reduce_graph(graph, lower_bound)
+        if graph.number_of_nodes() == 0:
+            return lower_bound, 0, 0  # Every vertex peeled: lower_bound colors are enough
+
+    components = connected_components(graph) if split else []
+    if len(components) <= 1:
+        # Nothing to split (the core's answer may be below the bound the peeling relied on)
+        chromatic_number, basic_operations, configurations_tested = solver(graph, lower_bound=lower_bound, **solver_kwargs)
+        return max(chromatic_number, lower_bound), basic_operations, configurations_tested
+
+    best = lower_bound
+    basic_operations = 0
+    configurations_tested = 0
+
+    if component_workers == 1:
+        for component in components:
+            if len(component) <= best:
+                break  # The remaining components are no larger
+            if color_bound(graph, component) <= best:
+                continue
+
+            chromatic_number, component_operations, component_configurations = solver(
+                graph.subgraph(component).copy(), lower_bound=best, **solver_kwargs)
+            best = max(best, chromatic_number)
+            basic_operations = add_counts(basic_operations, component_operations)
+            configurations_tested = add_counts(configurations_tested, component_configurations)
+        return best, basic_operations, configurations_tested
+
+    with ProcessPoolExecutor(max_workers=component_workers) as executor:
+        futures = {
+            executor.submit(solver, graph.subgraph(component).copy(), lower_bound=best, **solver_kwargs):
+                color_bound(graph, component)
+            for component in components if color_bound(graph, component) > best
+        }
+
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            chromatic_number, component_operations, component_configurations = future.result()
+            best = max(best, chromatic_number)
+            basic_operations = add_counts(basic_operations, component_operations)
+            configurations_tested = add_counts(configurations_tested, component_configurations)
+
+            # Components that can't beat the best any more, if they haven't started yet
+            for other, bound in futures.items():
+                if bound <= best:
+                    other.cancel()
+
+    return best, basic_operations, configurations_tested
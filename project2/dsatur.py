@@ -0,0 +1,112 @@
+import numpy as np
+from graph_utils import graph_to_csr, csr_degrees, csr_greedy_coloring
+from max_clique import adjacency_bitsets, heuristic_clique
+
+
+# DSATUR BRANCH AND BOUND (exact) with tracking of operations and configurations tested
+def dsatur_chromatic_number(graph, clique=None, lower_bound=1, count=True):
+    """
+    Exact chromatic number by DSatur branch and bound.
+
+    The greedy coloring gives the initial upper bound and max_clique's greedy clique the lower bound (its
+    vertices are pre-colored 0..|clique|-1 to break color symmetry). The search always branches on
+    the uncolored vertex with the most distinct neighbor colors (ties: highest degree) and prunes
+    every branch that would need as many colors as the best coloring found so far.
+
+    Basic operations are neighbor updates when a vertex is colored or uncolored, and each
+    (vertex, color) assignment tried by the search is a configuration.
+
+    :param graph: NetworkX graph.
+    :param clique: Optional clique as graph nodes (e.g. from max_clique), used instead of the greedy
+                   one when it is larger. Ignored unless all its nodes are in the graph, so the clique of
+                   a whole graph can be given to the search of each of its components.
+    :param lower_bound: Known lower bound (e.g. the best chromatic number of the other components):
+                        the search stops once it finds a coloring with this many colors.
+    :param count: False runs the search without counters (the counts are returned as None).
+    :return: (chromatic_number, basic_operations, configurations_tested)
+    """
+    csr = graph_to_csr(graph)
+    n = len(csr.nodes)
+    if n == 0:
+        return 0, 0, 0
+
+    offsets = csr.offsets.tolist()
+    neighbors = [csr.neighbors[offsets[v]:offsets[v + 1]].tolist() for v in range(n)]
+    degrees = csr_degrees(csr).tolist()
+
+    # Upper bound: greedy coloring in descending degree order
+    order = np.argsort(-csr_degrees(csr), kind='stable')
+    greedy_colors = csr_greedy_coloring(csr, order)
+    upper_bound = int(greedy_colors.max()) + 1
+
+    # Lower bound: any clique needs one color per vertex (max_clique's greedy one, over the same order)
+    order = order.tolist()
+    heuristic = [order[i] for i in heuristic_clique(adjacency_bitsets(csr, order))]
+    index = {node: i for i, node in enumerate(csr.nodes)}
+    if clique is not None and len(clique) > len(heuristic) and all(node in index for node in clique):
+        clique = [index[node] for node in clique]
+    else:
+        clique = heuristic
+    lower_bound = max(lower_bound, len(clique))
+    if lower_bound >= upper_bound:
+        return (upper_bound, 0, 0) if count else (upper_bound, None, None)
+
+    color = [-1] * n
+    color_counts = [[0] * upper_bound for _ in range(n)]  # color_counts[v][c] = neighbors of v colored c
+    saturation = [0] * n  # Number of distinct colors among the neighbors of v
+    # Every assignment but the clique's pre-coloring is a configuration tried by the search
+    state = {"best": upper_bound, "basic_operations": 0, "configurations_tested": -len(clique)}
+
+    def assign(vertex, c):
+        color[vertex] = c
+        for neighbor in neighbors[vertex]:
+            color_counts[neighbor][c] += 1
+            if color_counts[neighbor][c] == 1:
+                saturation[neighbor] += 1
+
+    def unassign(vertex, c):
+        color[vertex] = -1
+        for neighbor in neighbors[vertex]:
+            color_counts[neighbor][c] -= 1
+            if color_counts[neighbor][c] == 0:
+                saturation[neighbor] -= 1
+
+    if count:
+        # Counting wrappers, so the search itself has no counters when count is False
+        uncounted_assign, uncounted_unassign = assign, unassign
+
+        def assign(vertex, c):
+            state["basic_operations"] += len(neighbors[vertex])
+            state["configurations_tested"] += 1
+            uncounted_assign(vertex, c)
+
+        def unassign(vertex, c):
+            state["basic_operations"] += len(neighbors[vertex])
+            uncounted_unassign(vertex, c)
+
+    def search(num_colored, num_colors):
+        if num_colored == n:
+            state["best"] = num_colors  # Strictly better, otherwise the branch was pruned
+            return
+
+        # Most saturated uncolored vertex, ties broken by degree
+        vertex = max((v for v in range(n) if color[v] < 0), key=lambda v: (saturation[v], degrees[v]))
+
+        # Reuse an existing color, or open a new one only if it still beats the best coloring
+        for c in range(min(num_colors + 1, state["best"] - 1)):
+            if color_counts[vertex][c]:
+                continue
+            assign(vertex, c)
+            search(num_colored + 1, max(num_colors, c + 1))
+            unassign(vertex, c)
+
+            if state["best"] <= lower_bound:
+                return  # Optimal, nothing left to improve
+
+    for c, vertex in enumerate(clique):
+        assign(vertex, c)
+    search(len(clique), len(clique))
+
+    if not count:
+        return state["best"], None, None
+    return state["best"], state["basic_operations"], state["configurations_tested"]
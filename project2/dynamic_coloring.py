@@ -0,0 +1,147 @@
+import argparse
+import csv
+import gc
+import time
+from benchmark import summarize, time_column, timing_columns, TIMING_HEADERS
+from graph_utils import nested_vertex_edges
+
+
+# DYNAMIC COLORING: a proper coloring kept up to date while vertices and edges are inserted
+class DynamicColoring:
+    """
+    Greedy coloring of a growing graph.
+
+    A new vertex takes the smallest color not used by its neighbors. A new edge between two
+    vertices of the same color recolors only one endpoint (the one with fewer neighbors) to its
+    smallest free color. The coloring stays proper after every insertion and num_colors is the
+    number of colors in use, without ever recoloring the whole graph.
+
+    Counts follow the greedy functions: each color skipped while looking for a free color is a
+    basic operation, and each color assignment is a configuration.
+    """
+
+    def __init__(self):
+        self.neighbors = []  # neighbors[v] = set of neighbors of v
+        self.colors = []
+        self.class_sizes = []  # class_sizes[c] = vertices colored c
+        self.num_colors = 0  # Colors with at least one vertex
+        self.num_edges = 0
+        self.basic_operations = 0
+        self.configurations_tested = 0
+
+    def smallest_free_color(self, vertex):
+        taken = {self.colors[neighbor] for neighbor in self.neighbors[vertex]}
+        color = 0
+        while color in taken:
+            color += 1
+        self.basic_operations += color
+        return color
+
+    def set_color(self, vertex, color):
+        old = self.colors[vertex]
+        if old >= 0:
+            self.class_sizes[old] -= 1
+            if self.class_sizes[old] == 0:
+                self.num_colors -= 1
+
+        if color == len(self.class_sizes):
+            self.class_sizes.append(0)
+        self.class_sizes[color] += 1
+        if self.class_sizes[color] == 1:
+            self.num_colors += 1
+
+        self.colors[vertex] = color
+        self.configurations_tested += 1
+
+    def add_vertex(self, neighbors=()):
+        """
+        Add a vertex joined to the given existing vertices and color it.
+
+        :return: The new vertex (vertices are numbered 0, 1, ... in insertion order).
+        """
+        vertex = len(self.colors)
+        self.neighbors.append(set(neighbors))
+        for neighbor in self.neighbors[vertex]:
+            self.neighbors[neighbor].add(vertex)
+        self.num_edges += len(self.neighbors[vertex])
+
+        self.colors.append(-1)
+        self.set_color(vertex, self.smallest_free_color(vertex))
+        return vertex
+
+    def add_edge(self, u, v):
+        """
+        Add the edge (u, v), recoloring one endpoint if both have the same color.
+        """
+        if u == v or v in self.neighbors[u]:
+            return
+        self.neighbors[u].add(v)
+        self.neighbors[v].add(u)
+        self.num_edges += 1
+
+        if self.colors[u] == self.colors[v]:
+            vertex = u if len(self.neighbors[u]) < len(self.neighbors[v]) else v
+            self.set_color(vertex, self.smallest_free_color(vertex))
+
+
+# INCREMENTAL GREEDY SWEEP over the nested graphs (see generate_nested_edges)
+def incremental_greedy_sweep(max_vertices, edges, seed, min_vertices=4):
+    """
+    Color every (vertices, edge %) cell of a sweep by growing one coloring per edge percentage,
+    instead of coloring each graph from scratch. The graph of a cell is generate_random_graph(...,
+    nested_seed=seed), so the whole sweep costs about as much as coloring its largest graphs once.
+
+    Steps are timed with perf_counter_ns and the garbage collector off like benchmark.measure, but not
+    by it: a step inserts a vertex into the coloring every later cell of its edge % grows from, so it
+    can't be repeated (a rerun would time another graph), and measure's collection before each call
+    would take far longer than the step. Each cell's Timing is its one sample.
+
+    :return: Generator of (num_vertices, edge_percentage, num_edges, num_colors, basic_operations,
+             configurations_tested, Timing), where the counts and time are those of the cell's step.
+    """
+    colorings = {edge_percentage: DynamicColoring() for edge_percentage in edges}
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for vertex in range(max_vertices):
+            for edge_percentage in edges:
+                coloring = colorings[edge_percentage]
+                basic_operations = coloring.basic_operations
+                configurations_tested = coloring.configurations_tested
+
+                neighbors = nested_vertex_edges(vertex, edge_percentage / 100, seed).tolist()
+                start = time.perf_counter_ns()
+                coloring.add_vertex(neighbors)
+                elapsed = time.perf_counter_ns() - start
+
+                if vertex + 1 >= min_vertices:
+                    yield (vertex + 1, edge_percentage, coloring.num_edges, coloring.num_colors,
+                           coloring.basic_operations - basic_operations,
+                           coloring.configurations_tested - configurations_tested, summarize([elapsed / 1e6]))
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def main(max_vertices=500, seed=103199):
+    edges = [12.5, 25, 50, 75]
+
+    with open('results/incremental_greedy_results.csv', mode='w', newline='') as incremental_file:
+        writer = csv.writer(incremental_file)
+        writer.writerow(['Vertices', 'Edge %', 'Chromatic Number', 'Exec Time',
+                         'Basic Operations', 'Configurations Tested'] + TIMING_HEADERS)
+
+        # One sample per step (see incremental_greedy_sweep): Min Time is the Exec Time and the IQR 0
+        for num_vertices, edge_percentage, num_edges, num_colors, basic_operations, configurations_tested, timing \
+                in incremental_greedy_sweep(max_vertices, edges, seed):
+            writer.writerow([num_vertices, f"{num_edges} ({edge_percentage}%)", num_colors,
+                             time_column(timing), basic_operations, configurations_tested] + timing_columns(timing))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Greedy sweep over nested random graphs, one growing coloring per edge %.")
+    parser.add_argument("--max-vertices", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=103199, help="Seed of the nested edge sets")
+    args = parser.parse_args()
+    main(args.max_vertices, args.seed)
@@ -0,0 +1,305 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from multiprocessing import Value
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def edge_arrays(graph):
+    """
+    Vertex count and edge endpoints as index arrays, in graph.edges() order.
+
+    :param graph: NetworkX graph.
+    :return: (n, edges_u, edges_v) where vertex i is the i-th node of the graph.
+    """
+    index = {node: i for i, node in enumerate(graph.nodes())}
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.intp).reshape(-1, 2)
+    return len(index), edges[:, 0], edges[:, 1]
+
+
+def to_digits(value, base, length):
+    digits = [0] * length
+    for position in range(length - 1, -1, -1):
+        value, digits[position] = divmod(value, base)
+    return digits
+
+
+def count_edge_checks(colorings, edges_u, edges_v):
+    """
+    Edges checked by is_valid_coloring for each row of a coloring matrix (it stops at the first
+    conflicting edge), and whether each row is a valid coloring.
+    """
+    if len(edges_u) == 0:
+        return np.zeros(len(colorings), dtype=np.int64), np.ones(len(colorings), dtype=bool)
+
+    conflicts = colorings[:, edges_u] == colorings[:, edges_v]
+    has_conflict = conflicts.any(axis=1)
+    return np.where(has_conflict, conflicts.argmax(axis=1) + 1, len(edges_u)), ~has_conflict
+
+
+def search_coloring_range(edges_u, edges_v, n, num_colors, start, stop, block_size=2**16, should_stop=None,
+                          count=True):
+    """
+    Check the colorings start..stop-1 with num_colors colors, in itertools.product order
+    (coloring i is i written in base num_colors, one digit per vertex, last vertex fastest).
+
+    The colorings are split in blocks that share the colors of the first vertices (the prefix) and
+    go through every combination of the last ones (the suffix), so a block is one precomputed
+    uint8 table of suffix colorings. For each edge, the rows of the block that don't conflict on it
+    are a packed bitset, and the rows still alive after an edge are the ones that check the next
+    edge, which gives the exact counts of the one-at-a-time search: a coloring costs one basic
+    operation per edge checked up to (and including) its first conflicting edge.
+
+    :param should_stop: Optional callable checked before each block, the search gives up when it
+                        returns True (the counts then only cover the blocks searched).
+    :param count: False skips the operation counts (the popcounts per edge and the recount of the
+                  block holding the valid coloring), and both counts are returned as 0.
+    :return: (index of the first valid coloring or None, basic_operations, configurations_tested)
+    """
+    if start >= stop:
+        return None, 0, 0
+
+    # Longest suffix whose colorings fit in one block
+    suffix_length = 0
+    while suffix_length < n and num_colors ** (suffix_length + 1) <= block_size:
+        suffix_length += 1
+    prefix_length = n - suffix_length
+    block_rows = num_colors ** suffix_length
+
+    suffix_colorings = (np.arange(block_rows, dtype=np.int64)[:, None]
+                        // num_colors ** np.arange(suffix_length - 1, -1, -1, dtype=np.int64)
+                        % num_colors).astype(np.uint8)
+
+    def pack(rows_mask):
+        return np.packbits(rows_mask, bitorder='little')
+
+    # Rows that don't conflict on each edge: prefix-prefix edges depend only on the block,
+    # prefix-suffix edges on the prefix vertex color, suffix-suffix edges on nothing else
+    edge_checks = []
+    for u, v in zip(edges_u.tolist(), edges_v.tolist()):
+        if u < prefix_length and v < prefix_length:
+            edge_checks.append((0, u, v))
+        elif u < prefix_length or v < prefix_length:
+            prefix_vertex, suffix_vertex = (u, v) if u < prefix_length else (v, u)
+            column = suffix_colorings[:, suffix_vertex - prefix_length]
+            edge_checks.append((1, prefix_vertex, [pack(column != c) for c in range(num_colors)]))
+        else:
+            edge_checks.append((2, None, pack(suffix_colorings[:, u - prefix_length] != suffix_colorings[:, v - prefix_length])))
+
+    full_block = pack(np.ones(block_rows, dtype=bool))
+    basic_operations = 0
+    configurations_tested = 0
+
+    for block in range(start // block_rows, (stop - 1) // block_rows + 1):
+        if should_stop is not None and should_stop():
+            break
+
+        block_start = block * block_rows
+        low = max(start, block_start) - block_start
+        high = min(stop, block_start + block_rows) - block_start
+        prefix = to_digits(block, num_colors, prefix_length)
+
+        if low == 0 and high == block_rows:
+            alive = full_block.copy()
+        else:
+            rows_mask = np.zeros(block_rows, dtype=bool)
+            rows_mask[low:high] = True
+            alive = pack(rows_mask)
+
+        block_operations = 0
+        for kind, a, b in edge_checks:
+            if count:
+                block_operations += int(POPCOUNT[alive].sum())
+            if kind == 0:
+                if prefix[a] == prefix[b]:
+                    alive[:] = 0
+            elif kind == 1:
+                alive &= b[prefix[a]]
+            else:
+                alive &= b
+            if not alive.any():
+                break
+
+        if alive.any():
+            # A valid coloring in this block: recount the rows up to it one by one
+            first_valid = int(np.unpackbits(alive, bitorder='little', count=block_rows).argmax())
+            if not count:
+                return block_start + first_valid, 0, 0
+            rows = suffix_colorings[low:first_valid + 1]
+            colorings = np.hstack((np.tile(np.array(prefix, dtype=np.uint8), (len(rows), 1)), rows))
+            checks, _ = count_edge_checks(colorings, edges_u, edges_v)
+
+            basic_operations += int(checks.sum())
+            configurations_tested += len(rows)
+            return block_start + first_valid, basic_operations, configurations_tested
+
+        if count:
+            basic_operations += block_operations
+            configurations_tested += high - low
+
+    return None, basic_operations, configurations_tested
+
+
+def color_range(n, lower_bound, upper_bound):
+    """
+    Numbers of colors left to try between a lower bound (e.g. a clique size) and an upper bound
+    (the number of colors of a known coloring, e.g. greedy's), and the answer if none works.
+    """
+    if upper_bound is None:
+        return range(max(lower_bound, 1), n + 1), n  # Worst case
+    return range(max(lower_bound, 1), upper_bound), upper_bound
+
+
+def counted_result(num_colors, basic_operations, configurations_tested, count):
+    # Searches run with count=False report no counts rather than zeros
+    if not count:
+        return num_colors, None, None
+    return num_colors, basic_operations, configurations_tested
+
+
+# BATCHED EXHAUSTIVE SEARCH (same colorings, result and counts as exhaustive_chromatic_number)
+def batch_exhaustive_chromatic_number(graph, block_size=2**16, lower_bound=1, upper_bound=None, count=True):
+    n, edges_u, edges_v = edge_arrays(graph)
+    basic_operations = 0
+    configurations_tested = 0
+    num_colors_range, fallback = color_range(n, lower_bound, upper_bound)
+
+    for num_colors in num_colors_range:
+        found, range_operations, range_configurations = search_coloring_range(
+            edges_u, edges_v, n, num_colors, 0, num_colors ** n, block_size, count=count)
+        basic_operations += range_operations
+        configurations_tested += range_configurations
+        if found is not None:
+            return counted_result(num_colors, basic_operations, configurations_tested, count)
+    return counted_result(fallback, basic_operations, configurations_tested, count)
+
+
+# PARALLEL EXHAUSTIVE SEARCH (same result and counts as exhaustive_chromatic_number, on a process pool)
+#   For each number of colors the colorings are split in chunks that fix the colors of the first
+#   vertices, i.e. contiguous index ranges. Workers share the index of the earliest chunk known to hold a
+#   valid coloring, and chunks after it stop (or never start). Chunks before it always run to the end,
+#   so merging the counts in chunk order gives exactly the counts of the sequential search.
+#   Without counts (count=False, the timed runs) the search runs in this process: it stops at the first valid
+#   coloring, which on the sweeps' graphs comes long before shipping chunks to a pool pays off (an 11-vertex
+#   50% graph takes ~25 ms in process, several times that through the pool), so the timings measure the search.
+
+earliest_hit = None  # Shared between the workers of a pool
+
+
+def init_search_worker(shared_earliest_hit):
+    global earliest_hit
+    earliest_hit = shared_earliest_hit
+
+
+# Pool of each number of workers, created on first use and kept for every later search of the process: starting
+# the processes costs far more than searching a small graph, and it would be paid by every timed run
+search_pools = {}
+
+
+def search_pool(workers):
+    """
+    :return: (ProcessPoolExecutor, shared earliest hit Value) for searches on `workers` processes.
+    """
+    if workers not in search_pools:
+        shared_earliest_hit = Value('q', 0)  # Created with the pool: the first shared Value maps a new arena
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_search_worker,
+                                       initargs=(shared_earliest_hit,))
+        search_pools[workers] = (executor, shared_earliest_hit)
+    return search_pools[workers]
+
+
+def search_chunk(chunk, edges_u, edges_v, n, num_colors, start, stop, block_size, count=True):
+    found, basic_operations, configurations_tested = search_coloring_range(
+        edges_u, edges_v, n, num_colors, start, stop, block_size,
+        should_stop=lambda: earliest_hit.value < chunk, count=count)
+
+    if found is not None:
+        with earliest_hit.get_lock():
+            earliest_hit.value = min(earliest_hit.value, chunk)
+    return chunk, found, basic_operations, configurations_tested
+
+
+def parallel_exhaustive_chromatic_number(graph, workers=None, chunks_per_worker=8, block_size=2**16,
+                                         lower_bound=1, upper_bound=None, count=True):
+    """
+    :param lower_bound: Start the search at this many colors (e.g. the size of a clique).
+    :param upper_bound: Number of colors of a known coloring (e.g. greedy's): only fewer colors are
+                        searched, and it is the answer if none of them works.
+    :param count: False for the search without operation counts (returned as None), the one to time. It
+                  runs in this process whatever `workers` is (see above).
+    """
+    n, edges_u, edges_v = edge_arrays(graph)
+    workers = (workers or os.cpu_count()) if count else 1
+    basic_operations = 0
+    configurations_tested = 0
+    num_colors_range, fallback = color_range(n, lower_bound, upper_bound)
+
+    executor = None
+    futures = {}
+
+    try:
+        for num_colors in num_colors_range:
+            total = num_colors ** n
+
+            # Small spaces aren't worth shipping to the pool
+            if workers == 1 or total <= block_size * workers:
+                found, range_operations, range_configurations = search_coloring_range(
+                    edges_u, edges_v, n, num_colors, 0, total, block_size, count=count)
+                basic_operations += range_operations
+                configurations_tested += range_configurations
+                if found is not None:
+                    return counted_result(num_colors, basic_operations, configurations_tested, count)
+                continue
+
+            if executor is None:
+                executor, shared_earliest_hit = search_pool(workers)
+
+            # Fix the colors of the first prefix_length vertices, one chunk per prefix
+            prefix_length = 1
+            while prefix_length < n and num_colors ** prefix_length < workers * chunks_per_worker:
+                prefix_length += 1
+            num_chunks = num_colors ** prefix_length
+            chunk_size = num_colors ** (n - prefix_length)
+            shared_earliest_hit.value = num_chunks
+
+            futures = {
+                executor.submit(search_chunk, chunk, edges_u, edges_v, n, num_colors,
+                                chunk * chunk_size, (chunk + 1) * chunk_size, block_size, count): chunk
+                for chunk in range(num_chunks)
+            }
+
+            results = {}
+            first_hit = num_chunks
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                chunk, found, chunk_operations, chunk_configurations = future.result()
+                results[chunk] = (found, chunk_operations, chunk_configurations)
+
+                if found is not None and chunk < first_hit:
+                    first_hit = chunk
+                    # Chunks after the hit can't change the answer, drop the ones not started yet
+                    for other, other_chunk in futures.items():
+                        if other_chunk > first_hit:
+                            other.cancel()
+
+                if all(c in results for c in range(first_hit)) and first_hit in results:
+                    break  # Everything before the first hit is accounted for
+
+            # Merge in chunk order, up to and including the first hit
+            for chunk in range(min(first_hit + 1, num_chunks)):
+                found, chunk_operations, chunk_configurations = results[chunk]
+                basic_operations += chunk_operations
+                configurations_tested += chunk_configurations
+            if first_hit < num_chunks:
+                return counted_result(num_colors, basic_operations, configurations_tested, count)
+
+        return counted_result(fallback, basic_operations, configurations_tested, count)
+    finally:
+        # The pool outlives the search: drop its chunks not started yet and let the running ones stop
+        # (on the shared hit) before the next search resets the hit
+        for future in futures:
+            future.cancel()
+        wait(futures)
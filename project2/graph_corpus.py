@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import re
+import networkx as nx
+import numpy as np
+from graph_utils import load_graph
+
+# GRAPH CORPUS: every random graph of a sweep packed in a single file
+#
+#   magic (8 bytes) | header length (uint64) | JSON header | padding to 8 bytes
+#   edges:     int32 (total_edges, 2), the edges of every graph one after the other
+#   positions: int32 (total_vertices, 2), the point of every vertex of every graph
+#
+#   The header maps each (vertices, edge %, seed) key to its slice of both arrays. Both arrays
+#   are opened with numpy.memmap, so reading a graph only touches its own bytes.
+
+CORPUS_MAGIC = b"GCORPUS1"
+
+
+def write_corpus(corpus_path, graphs):
+    """
+    Write a corpus file.
+
+    :param corpus_path: File to (over)write.
+    :param graphs: Iterable of ((num_vertices, edge_percentage, seed), edges, positions), where edges
+                   is an (m, 2) array over vertices 0..n-1 and positions an (n, 2) array.
+    """
+    entries = []
+    all_edges = []
+    all_positions = []
+    total_edges = 0
+    total_vertices = 0
+
+    for (num_vertices, edge_percentage, seed), edges, positions in graphs:
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        positions = np.asarray(positions, dtype=np.int32).reshape(-1, 2)
+        entries.append([int(num_vertices), float(edge_percentage), int(seed),
+                        total_edges, len(edges), total_vertices])
+        all_edges.append(edges)
+        all_positions.append(positions)
+        total_edges += len(edges)
+        total_vertices += len(positions)
+
+    header = json.dumps({"entries": entries, "total_edges": total_edges,
+                         "total_vertices": total_vertices}).encode()
+    data_start = -(-(len(CORPUS_MAGIC) + 8 + len(header)) // 8) * 8
+
+    temp_path = corpus_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(CORPUS_MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+        for edges in all_edges:
+            f.write(edges.tobytes())
+        for positions in all_positions:
+            f.write(positions.tobytes())
+    os.replace(temp_path, corpus_path)  # Never leave a half-written corpus behind
+
+
+def open_corpus(corpus_path):
+    """
+    Open a corpus file without reading its graphs.
+
+    :return: Dict with the "index" ({(vertices, edge %, seed): (edge offset, edges, vertex offset)})
+             and the memory-mapped "edges" and "positions" arrays.
+    """
+    with open(corpus_path, 'rb') as f:
+        if f.read(len(CORPUS_MAGIC)) != CORPUS_MAGIC:
+            raise ValueError(f"{corpus_path} is not a graph corpus")
+        header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(header_length))
+
+    data_start = -(-(len(CORPUS_MAGIC) + 8 + header_length) // 8) * 8
+    total_edges, total_vertices = header["total_edges"], header["total_vertices"]
+
+    def mapped(offset, rows):
+        if rows == 0:
+            return np.empty((0, 2), dtype=np.int32)  # memmap can't map zero bytes
+        return np.memmap(corpus_path, dtype=np.int32, mode='r', offset=offset, shape=(rows, 2))
+
+    return {
+        "index": {(n, edge_percentage, seed): (edge_offset, num_edges, vertex_offset)
+                  for n, edge_percentage, seed, edge_offset, num_edges, vertex_offset in header["entries"]},
+        "edges": mapped(data_start, total_edges),
+        "positions": mapped(data_start + total_edges * 8, total_vertices),
+    }
+
+
+def load_corpus_edges(corpus, num_vertices, edge_percentage, seed=0):
+    """
+    :return: (edges, positions) views into the corpus, or None if the graph isn't in it.
+    """
+    entry = corpus["index"].get((num_vertices, float(edge_percentage), seed))
+    if entry is None:
+        return None
+    edge_offset, num_edges, vertex_offset = entry
+    return (corpus["edges"][edge_offset:edge_offset + num_edges],
+            corpus["positions"][vertex_offset:vertex_offset + num_vertices])
+
+
+def load_corpus_graph(corpus, num_vertices, edge_percentage, seed=0):
+    """
+    Rebuild the NetworkX graph of a corpus entry (same nodes, positions and edge order as the
+    graph that was stored), or None if the graph isn't in the corpus.
+    """
+    stored = load_corpus_edges(corpus, num_vertices, edge_percentage, seed)
+    if stored is None:
+        return None
+    edges, positions = stored
+
+    G = nx.Graph()
+    for i, (x, y) in enumerate(positions.tolist()):
+        G.add_node(i, pos=(x, y))
+    G.add_edges_from(edges.tolist())
+    return G
+
+
+def convert_pickle_folder(graph_folder, corpus_path, edges=(12.5, 25, 50, 75), seed=0):
+    """
+    Pack the pickled graphs saved by chromatic.py (graph_<n>_vertices_<int(edge %)>_edges.pkl)
+    into a corpus file. The pickles were generated without a seed, they are stored under `seed`.
+    """
+    edge_percentages = {int(edge_percentage): edge_percentage for edge_percentage in edges}
+    pattern = re.compile(r"graph_(\d+)_vertices_(\d+)_edges\.pkl$")
+
+    keys = []
+    for filename in os.listdir(graph_folder):
+        match = pattern.match(filename)
+        if match and int(match.group(2)) in edge_percentages:
+            keys.append((int(match.group(1)), edge_percentages[int(match.group(2))], filename))
+    keys.sort()
+
+    def graphs():
+        for num_vertices, edge_percentage, filename in keys:
+            G = load_graph(graph_folder, filename)
+            if G is None:
+                continue
+            # Stored in G.edges() order, which the rebuilt graph reproduces
+            positions = [G.nodes[i]['pos'] for i in range(num_vertices)]
+            yield (num_vertices, edge_percentage, seed), list(G.edges()), positions
+
+    write_corpus(corpus_path, graphs())
+    return len(keys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the pickled sweep graphs into one corpus file.")
+    parser.add_argument("graph_folder", nargs="?", default="graphs")
+    parser.add_argument("corpus_path", nargs="?", default="graphs.corpus")
+    args = parser.parse_args()
+
+    converted = convert_pickle_folder(args.graph_folder, args.corpus_path)
+    print(f"Packed {converted} graphs from {args.graph_folder} into {args.corpus_path}")
@@ -0,0 +1,115 @@
+import argparse
+import hashlib
+import json
+import os
+from graph_utils import load_webgraph, csr_degrees, csr_degeneracy
+
+# GRAPH INDEX: metadata of every graph of a dataset directory, in a sidecar file of that directory
+#
+#   {"version": 1, "graphs": {filename: {"mtime_ns", "size", "vertices", "edges", "max_degree",
+#                                        "degeneracy", "sha256"}}}
+#
+#   An entry is only recomputed (which loads the graph) when the file's mtime or size changed, so
+#   drivers can sort and filter a directory without loading its graphs.
+
+INDEX_FILENAME = ".graph_index.json"
+INDEX_VERSION = 1
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def graph_metadata(graph_folder, folder, filename):
+    """
+    Metadata of one graph file, or None if it can't be loaded.
+    """
+    csr = load_webgraph(graph_folder, filename, as_csr=True)
+    if csr is None:
+        return None
+
+    path = os.path.join(folder, filename)
+    stat = os.stat(path)
+    degrees = csr_degrees(csr)
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "vertices": len(csr.nodes),
+        "edges": int(degrees.sum()) // 2,
+        "max_degree": int(degrees.max()) if len(degrees) else 0,
+        "degeneracy": csr_degeneracy(csr),
+        "sha256": file_hash(path),
+    }
+
+
+def load_index(folder):
+    index_path = os.path.join(folder, INDEX_FILENAME)
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return index.get("graphs", {}) if index.get("version") == INDEX_VERSION else {}
+
+
+def save_index(folder, graphs):
+    index_path = os.path.join(folder, INDEX_FILENAME)
+    temp_path = index_path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump({"version": INDEX_VERSION, "graphs": graphs}, f, indent=1, sort_keys=True)
+    os.replace(temp_path, index_path)  # Never leave a half-written index behind
+
+
+def update_index(folder, graph_folder, extensions=(".edges", ".txt")):
+    """
+    Bring the index of a dataset directory up to date and return it.
+
+    :param folder: Dataset directory (e.g. graphs_web/facebook), where the index file is kept.
+    :param graph_folder: Folder given to load_webgraph for the graphs of `folder`.
+    :return: {filename: metadata} of every graph of the directory that could be loaded.
+    """
+    cached = load_index(folder)
+    graphs = {}
+
+    for filename in sorted(os.listdir(folder)):
+        if not filename.endswith(extensions):
+            continue
+        stat = os.stat(os.path.join(folder, filename))
+        entry = cached.get(filename)
+
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            entry = graph_metadata(graph_folder, folder, filename)
+            if entry is None:
+                print(f"Failed to load graph: {filename}")
+                continue
+        graphs[filename] = entry
+
+    if graphs != cached:
+        save_index(folder, graphs)
+    return graphs
+
+
+def select_graphs(graphs, min_vertices=None, max_vertices=None):
+    """
+    Graphs of an index within a vertex count range, by vertex count (ties by filename).
+
+    :return: List of (num_vertices, filename).
+    """
+    return sorted((entry["vertices"], filename) for filename, entry in graphs.items()
+                  if (min_vertices is None or entry["vertices"] >= min_vertices)
+                  and (max_vertices is None or entry["vertices"] <= max_vertices))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or refresh the metadata index of the web graph directories.")
+    parser.add_argument("graph_folder", nargs="?", default="graphs_web")
+    args = parser.parse_args()
+
+    for dataset in ("facebook", "sw"):
+        folder = os.path.join(args.graph_folder, dataset)
+        for num_vertices, filename in select_graphs(update_index(folder, args.graph_folder)):
+            print(f"{dataset}/{filename}: {num_vertices} vertices")
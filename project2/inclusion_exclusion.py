@@ -0,0 +1,96 @@
+import numpy as np
+
+# INCLUSION-EXCLUSION (Björklund, Husfeldt and Koivisto): exact chromatic number in O*(2^n) time and space
+#   A graph is k-colorable iff its vertices can be covered by k independent sets. With i(S) the number of
+#   independent sets inside the vertex subset S (the empty one included), the number of ordered k-tuples of
+#   independent sets covering every vertex is
+#       c_k = sum over every subset S of (-1)^(n - |S|) * i(S)^k
+#   so the chromatic number is the smallest k with c_k > 0. The i(S) table is built once for every subset,
+#   then each k costs one pass over it, whatever the density: dense graphs, where branch and bound degrades,
+#   take as long as sparse ones. Subsets are bitmasks of the graph's node order (bit v: the v-th node).
+#
+#   i(S) <= 2^n fits the table, but i(S)^k doesn't, so the powers and sums are taken modulo two primes below
+#   2^31 (products stay below 2^62). c_k is nonzero modulo a prime only if it is nonzero, so a k found
+#   colorable is; a k is taken as not colorable when c_k vanishes modulo both, which a positive c_k would
+#   only do if it were a multiple of their ~2^62 product.
+
+PRIMES = (2147483647, 2147483629)  # Largest primes below 2^31
+
+
+def independent_set_counts(adjacency, n):
+    """
+    i(S) for every subset S of the n vertices, by the recurrence i(S) = i(S - {v}) + i(S - N[v]) on the
+    highest vertex v of S: the subsets containing v are the ones below 2^v with v added, so each vertex
+    fills its half of the table in one vectorized step.
+
+    :param adjacency: Neighbors of each vertex as a bitmask.
+    :return: int64 array of length 2^n.
+    """
+    counts = np.empty(1 << n, dtype=np.int64)
+    counts[0] = 1
+    subsets = np.arange(1 << n, dtype=np.int64)
+    for v in range(n):
+        low = 1 << v
+        below = subsets[:low]
+        counts[low:2 * low] = counts[:low] + counts[below & ~adjacency[v]]  # Neighbors above v aren't in below
+    return counts
+
+
+def odd_complements(n):
+    # Whether n - |S| is odd, for every subset S (the sign of its term)
+    odd = np.empty(1 << n, dtype=bool)
+    odd[0] = n % 2 == 1
+    for v in range(n):
+        low = 1 << v
+        odd[low:2 * low] = ~odd[:low]
+    return odd
+
+
+def inclusion_exclusion_chromatic_number(graph, lower_bound=1, upper_bound=None):
+    """
+    Exact chromatic number by inclusion-exclusion over the vertex subsets.
+
+    Tries k = lower_bound, lower_bound + 1, ... until the k-cover count is nonzero. The counts follow the
+    table: every subset's independent set count is a basic operation, and so is every update of a subset's
+    power (k of them per subset to reach i(S)^k); each k tried sums every subset, each a configuration.
+
+    :param graph: NetworkX graph.
+    :param lower_bound: Known lower bound (e.g. a clique size): smaller k aren't tried.
+    :param upper_bound: Known upper bound (e.g. the greedy colors), returned without trying it.
+    :return: (chromatic_number, basic_operations, configurations_tested)
+    """
+    index = {node: i for i, node in enumerate(graph.nodes())}
+    n = len(index)
+    if n == 0:
+        return 0, 0, 0
+
+    adjacency = [0] * n
+    for u, v in graph.edges():
+        adjacency[index[u]] |= 1 << index[v]
+        adjacency[index[v]] |= 1 << index[u]
+
+    counts = independent_set_counts(adjacency, n)
+    odd = odd_complements(n)
+    basic_operations = 1 << n
+    configurations_tested = 0
+
+    # Powers i(S)^power_k of every subset, modulo each prime (i(S) <= 2^n is already below them)
+    powers = [np.ones(1 << n, dtype=np.int64) for _ in PRIMES]
+    power_k = 0
+    k = max(lower_bound, 1)
+    stop = n if upper_bound is None else min(upper_bound, n)
+    while k < stop:
+        while power_k < k:
+            for power, prime in zip(powers, PRIMES):
+                np.multiply(power, counts, out=power)
+                np.remainder(power, prime, out=power)
+            power_k += 1
+            basic_operations += 1 << n
+        configurations_tested += 1 << n
+
+        # Sum of the even terms minus the odd ones, each sum below 2^(n + 31)
+        if any((power.sum() - 2 * power[odd].sum()) % prime for power, prime in zip(powers, PRIMES)):
+            return k, basic_operations, configurations_tested
+        k += 1
+
+    return stop, basic_operations, configurations_tested  # n colors always suffice
@@ -0,0 +1,136 @@
+import time
+import numpy as np
+from graph_utils import csr_degrees
+
+# MAXIMUM CLIQUE (lower bound for the chromatic number: a clique needs one color per vertex)
+#   Branch and bound in the style of Tomita's MCQ, over Python ints used as bitsets. Vertices are
+#   relabeled by descending degree (bit i is the i-th vertex of that order). At every node the
+#   candidates are greedily colored, and a candidate whose color number plus the current clique
+#   size can't beat the best clique is pruned, with everything colored before it.
+
+
+def adjacency_bitsets(csr, order):
+    """
+    Neighbors of every vertex as a bitset over the positions of `order`.
+    """
+    offsets = csr.offsets.tolist()
+    neighbors = csr.neighbors.tolist()
+    position = [0] * len(order)
+    for i, vertex in enumerate(order):
+        position[vertex] = i
+
+    bitsets = []
+    for vertex in order:
+        bits = 0
+        for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]:
+            if neighbor != vertex:
+                bits |= 1 << position[neighbor]
+        bitsets.append(bits)
+    return bitsets
+
+
+def heuristic_clique(bitsets):
+    """
+    Greedy clique: grow a clique from every vertex, always adding the candidate of highest degree
+    (the lowest bit, vertices being in descending degree order).
+
+    :return: List of positions.
+    """
+    best = []
+    for start, adjacent in enumerate(bitsets):
+        if bin(adjacent).count("1") < len(best):
+            continue  # Cliques grown from here can't be larger than the best one
+
+        clique = [start]
+        candidates = adjacent
+        while candidates:
+            chosen = (candidates & -candidates).bit_length() - 1
+            clique.append(chosen)
+            candidates &= bitsets[chosen]
+
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def color_candidates(candidates, bitsets):
+    """
+    Greedy coloring of the candidate set: each color class is a maximal independent set taken in
+    bit order.
+
+    :return: (vertices, colors) lists, sorted by color (color numbers start at 1).
+    """
+    vertices = []
+    colors = []
+    color = 0
+    while candidates:
+        color += 1
+        available = candidates
+        while available:
+            bit = available & -available
+            vertex = bit.bit_length() - 1
+            vertices.append(vertex)
+            colors.append(color)
+            candidates &= ~bit
+            available &= ~bit & ~bitsets[vertex]
+    return vertices, colors
+
+
+def maximum_clique(csr, time_budget=None, upper_bound=None):
+    """
+    Maximum clique of a CSR graph.
+
+    The heuristic clique comes first. It is already optimal when it reaches `upper_bound` (e.g. the
+    greedy coloring's number of colors), and then no search is done.
+
+    :param time_budget: Seconds after which the search stops with the best clique found so far.
+    :param upper_bound: Known upper bound on the clique size (any coloring's number of colors).
+    :return: (clique as a list of vertex indices, whether it is proven maximum)
+    """
+    n = len(csr.nodes)
+    if n == 0:
+        return [], True
+
+    order = np.argsort(-csr_degrees(csr), kind='stable').tolist()
+    bitsets = adjacency_bitsets(csr, order)
+
+    state = {"best": heuristic_clique(bitsets), "timed_out": False, "nodes": 0}
+    if upper_bound is not None and len(state["best"]) >= upper_bound:
+        return [order[i] for i in state["best"]], True
+
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    def expand(clique, candidates):
+        state["nodes"] += 1
+        if deadline is not None and state["nodes"] % 1024 == 0 and time.perf_counter() > deadline:
+            state["timed_out"] = True
+        if state["timed_out"]:
+            return
+
+        vertices, colors = color_candidates(candidates, bitsets)
+        for vertex, color in zip(reversed(vertices), reversed(colors)):
+            if len(clique) + color <= len(state["best"]):
+                return  # Every remaining candidate has a color number this small or smaller
+
+            clique.append(vertex)
+            remaining = candidates & bitsets[vertex]
+            if remaining:
+                expand(clique, remaining)
+            elif len(clique) > len(state["best"]):
+                state["best"] = list(clique)
+            clique.pop()
+
+            candidates &= ~(1 << vertex)
+            if state["timed_out"] or (upper_bound is not None and len(state["best"]) >= upper_bound):
+                return
+
+    expand([], (1 << n) - 1)
+    return [order[i] for i in state["best"]], not state["timed_out"]
+
+
+def clique_lower_bound(csr, time_budget=1.0, upper_bound=None):
+    """
+    Size of the largest clique found within the time budget, a lower bound on the chromatic number.
+    """
+    clique, _ = maximum_clique(csr, time_budget, upper_bound)
+    return len(clique)
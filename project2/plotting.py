@@ -0,0 +1,54 @@
+import matplotlib
+matplotlib.use("Agg")  # Files only: figures can be drawn in worker processes, without a display
+import matplotlib.pyplot as plt
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from results_store import query
+
+# PLOTTING PIPELINE
+#   The rows of every algorithm are loaded in one query and aligned once, keyed by graph (edge % and vertices for the
+#   random sweep, the file for the web graphs): one row per graph, one column per (field, algorithm), only the graphs
+#   every algorithm ran on. Differences between algorithms are then plain column arithmetic, and the figures,
+#   independent of each other, are drawn on a process pool.
+
+
+def aligned_results(store, dataset, algorithms, key, driver=None):
+    """
+    Results of some algorithms side by side.
+
+    :param key: Store fields identifying a graph, e.g. ["density", "vertices", "trial"] or ["graph", "vertices", "edges"].
+    :return: DataFrame with the key fields as columns and a (field, algorithm) column for every other numeric field,
+             with only the graphs all the algorithms have a chromatic number for.
+    """
+    results = pd.DataFrame(query(store, dataset, algorithm=list(algorithms), driver=driver))
+    fields = [field for field in results.columns if results[field].dtype.kind == "f" and field not in key and field != "run"]
+    wide = results.pivot(index=list(key), columns="algorithm", values=fields)
+    wide = wide.dropna(subset=[("chromatic_number", algorithm) for algorithm in algorithms]).reset_index()
+    wide.columns = [field if not algorithm else (field, algorithm) for field, algorithm in wide.columns]  # "density", ("exec_time", "greedy")
+    return wide
+
+
+def downsample(frame, num_samples, by):
+    """
+    About num_samples rows of every `by` group, evenly spaced, in order (like x.iloc[::len(x) // num_samples] per group).
+    """
+    group = frame.groupby(by, sort=False)
+    position = group.cumcount().to_numpy()
+    step = (group[by].transform("size").to_numpy() // num_samples).clip(min=1)
+    return frame[position % step == 0]
+
+
+def render(jobs, workers=None):
+    """
+    Run every (figure function, *arguments) job on a process pool; each function saves and closes its figure.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, *arguments) for function, *arguments in jobs]
+        for future in futures:
+            future.result()  # Errors of the workers surface here
+
+
+def save(fig, path):
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
@@ -0,0 +1,126 @@
+import numpy as np
+from graph_utils import graph_to_csr, csr_degrees, csr_greedy_coloring
+
+# LOW-DEGREE REDUCTION (needs a known lower bound of k colors)
+#   A vertex with fewer than k neighbors can be removed and colored last: whatever colors its neighbors
+#   get, one of the first k is free for it, so it never raises the color count above k. Removing it can
+#   lower its neighbors' degrees below k too, so vertices are peeled until only the k-core is left
+#   (every vertex keeping at least k neighbors), which is what the solvers see:
+#       chromatic number of the graph = max(chromatic number of the k-core, k)
+#   Replaying the removed vertices in reverse removal order, each with its smallest free color,
+#   turns a coloring of the core into one of the whole graph.
+
+
+def csr_low_degree_peeling(csr, k):
+    """
+    k-core of a CSR graph, by peeling the vertices of degree < k (O(n + m)): the vertices of low
+    degree wait in a queue (the bucket of degrees below k) and every removal lowers its neighbors'
+    degrees, pushing the ones that drop below k.
+
+    :return: (mask of the core vertices, removed vertices in removal order)
+    """
+    offsets = csr.offsets.tolist()
+    neighbors = csr.neighbors.tolist()
+    degrees = csr_degrees(csr).tolist()
+    in_core = [True] * len(degrees)
+
+    queue = [vertex for vertex, degree in enumerate(degrees) if degree < k]
+    for vertex in queue:
+        in_core[vertex] = False
+
+    # The queue grows while it is read, it is the removal order
+    for vertex in queue:
+        for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]:
+            degrees[neighbor] -= 1
+            if in_core[neighbor] and degrees[neighbor] < k:
+                in_core[neighbor] = False
+                queue.append(neighbor)
+
+    return np.array(in_core, dtype=bool), queue
+
+
+def csr_replay_removed(csr, colors, removed):
+    """
+    Color the removed vertices (colors[v] == -1) in reverse removal order, each with the smallest
+    color none of its colored neighbors has. colors is changed in place and returned.
+    """
+    offsets = csr.offsets.tolist()
+    neighbors = csr.neighbors.tolist()
+    replayed = colors.tolist()
+    for vertex in reversed(removed):
+        taken = {replayed[neighbor] for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]}
+        color = 0
+        while color in taken:
+            color += 1
+        replayed[vertex] = color
+    colors[:] = replayed
+    return colors
+
+
+def reduction_stats(csr, in_core):
+    """
+    How much the reduction removed: vertices and edges of the graph and of its core.
+    """
+    core = np.flatnonzero(in_core)
+    sources = np.repeat(np.arange(len(in_core)), np.diff(csr.offsets))
+    core_edges = int(np.count_nonzero(in_core[sources] & in_core[csr.neighbors])) // 2
+    return {
+        "vertices": len(in_core),
+        "edges": len(csr.neighbors) // 2,
+        "core_vertices": len(core),
+        "core_edges": core_edges,
+        "removed": len(in_core) - len(core),
+    }
+
+
+def reduce_graph(graph, k):
+    """
+    k-core of a NetworkX graph (a subgraph keeping the node labels and order).
+
+    :return: (core graph, removed nodes in removal order, reduction_stats)
+    """
+    csr = graph_to_csr(graph)
+    in_core, removed = csr_low_degree_peeling(csr, k)
+    core = graph.subgraph([node for node, kept in zip(csr.nodes, in_core) if kept]).copy()
+    return core, [csr.nodes[vertex] for vertex in removed], reduction_stats(csr, in_core)
+
+
+def replay_coloring(graph, coloring, removed):
+    """
+    Extend a coloring of the core (dict node -> color) to the removed nodes, in reverse removal order.
+    """
+    coloring = dict(coloring)
+    for node in reversed(removed):
+        taken = {coloring[neighbor] for neighbor in graph.neighbors(node) if neighbor in coloring}
+        color = 0
+        while color in taken:
+            color += 1
+        coloring[node] = color
+    return coloring
+
+
+def csr_reduced_greedy_coloring(csr, k, order_core):
+    """
+    Greedy coloring of the k-core, then of the removed vertices by replay: the coloring never needs
+    more than max(greedy colors of the core, k) colors.
+
+    :param order_core: order_core(core_csr) giving the greedy order of the core's vertices (e.g. by degree).
+    :return: (colors, reduction_stats)
+    """
+    in_core, removed = csr_low_degree_peeling(csr, k)
+    colors = np.full(len(in_core), -1, dtype=np.int64)
+
+    core = np.flatnonzero(in_core)
+    if len(core):
+        # Core as a CSR graph of its own (vertex i is core[i])
+        position = np.full(len(in_core), -1, dtype=np.int64)
+        position[core] = np.arange(len(core))
+        sources = np.repeat(np.arange(len(in_core)), np.diff(csr.offsets))
+        kept = in_core[sources] & in_core[csr.neighbors]
+        counts = np.bincount(position[sources[kept]], minlength=len(core))
+        offsets = np.zeros(len(core) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        core_csr = type(csr)(offsets, position[csr.neighbors[kept]].astype(np.int32), [csr.nodes[v] for v in core])
+        colors[core] = csr_greedy_coloring(core_csr, order_core(core_csr))
+
+    return csr_replay_removed(csr, colors, removed), reduction_stats(csr, in_core)
@@ -1,127 +1,89 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
+from results_store import open_store
+from plotting import aligned_results, render, save
 
 # Ensure 'plots' directory exists
 if not os.path.exists('plots'):
     os.makedirs('plots')
 
-# Load CSV files
-def load_and_process_csv(file_path):
-    df = pd.read_csv(file_path)
-    return df
+# Algorithms compared, with their legend label, marker, color and line style (execution times)
+ALGORITHMS = {
+    "greedy": ("Greedy", "o", "blue", "-"),
+    "random_greedy": ("Random Greedy", "X", "red", "--"),
+    "nx_random_sequential": ("NetworkX Random Sequential", "*", "green", "-."),
+}
 
-# Plot Chromatic Numbers
-def plot_chromatic_numbers(df_greedy, df_random_greedy, df_nx_random, repo):
-    plt.figure(figsize=(10, 6))
-
-    # Plot Greedy Algorithm's Chromatic Numbers
-    plt.plot(df_greedy["Vertices"], df_greedy["Chromatic Number"], label="Greedy", marker="o", color="blue", linestyle=" ", markersize=12)
+# Load the latest run on a web graph dataset (see results_store.py), one row per graph every algorithm ran on
+def load_results(store, repo):
+    return aligned_results(store, repo, ALGORITHMS, ["graph", "vertices", "edges"]).sort_values(["vertices", "graph"])
 
-    # Plot Random Greedy Algorithm's Chromatic Numbers
-    plt.plot(df_random_greedy["Vertices"], df_random_greedy["Chromatic Number"], label="Random Greedy", marker="X", color="red", linestyle=" ", markersize=12)
+# Plot Chromatic Numbers
+def plot_chromatic_numbers(results, repo):
+    fig, ax = plt.subplots(figsize=(10, 6))
 
-    # Plot NetworkX Random Sequential's Chromatic Numbers
-    plt.plot(df_nx_random["Vertices"], df_nx_random["Chromatic Number"], label="NetworkX Random Sequential", marker="*", color="green", linestyle=" ", markersize=12)
+    # Chromatic number of every algorithm on every graph
+    for algorithm, (label, marker, color, _) in ALGORITHMS.items():
+        ax.plot(results["vertices"], results[("chromatic_number", algorithm)], label=label, marker=marker, color=color, linestyle=" ", markersize=12)
 
     # Labels and title
-    plt.title(f"Chromatic Number Comparison between Greedy, Random Greedy, and NetworkX ({repo})")
-    plt.xlabel("Number of Vertices")
-    plt.ylabel("Chromatic Number")
-    plt.legend()
+    ax.set_title(f"Chromatic Number Comparison between Greedy, Random Greedy, and NetworkX ({repo})")
+    ax.set_xlabel("Number of Vertices")
+    ax.set_ylabel("Chromatic Number")
+    ax.legend()
 
-    # Save plot to file
-    plot_path = f"plots/chromatic_numbers_{repo}.png"
-    plt.tight_layout()
-    plt.savefig(plot_path)
-    plt.close()
+    save(fig, f"plots/chromatic_numbers_{repo}.png")
 
 # Plot Execution Times
-def plot_execution_times(df_greedy, df_random_greedy, df_nx_random, repo):
-    plt.figure(figsize=(10, 6))
-
-    # Plot Greedy Algorithm's Execution Times
-    plt.plot(df_greedy["Vertices"], df_greedy["Exec Time"], label="Execution Time (Greedy)", marker="o", color="blue", linestyle="-", markersize=6)
-
-    # Plot Random Greedy Algorithm's Execution Times
-    plt.plot(df_random_greedy["Vertices"], df_random_greedy["Exec Time"], label="Execution Time (Random Greedy)", marker="x", color="red", linestyle="--", markersize=6)
+def plot_execution_times(results, repo):
+    fig, ax = plt.subplots(figsize=(10, 6))
 
-    # Plot NetworkX Random Sequential's Execution Times
-    plt.plot(df_nx_random["Vertices"], df_nx_random["Exec Time"], label="Execution Time (NetworkX Random Sequential)", marker="*", color="green", linestyle="-.", markersize=6)
+    # Execution time of every algorithm on every graph
+    for algorithm, (label, marker, color, linestyle) in ALGORITHMS.items():
+        ax.plot(results["vertices"], results[("exec_time", algorithm)], label=f"Execution Time ({label})", marker=marker, color=color, linestyle=linestyle, markersize=6)
 
     # Labels and title
-    plt.title(f"Execution Time Comparison among Greedy, Random Greedy, and NetworkX ({repo})")
-    plt.xlabel("Number of Vertices")
-    plt.ylabel("Execution Time (ms)")
-    plt.yscale("log")
-    plt.legend()
-
-    # Save plot to file
-    plot_path = f"plots/execution_times_{repo}.png"
-    plt.tight_layout()
-    plt.savefig(plot_path)
-    plt.close()
-
-# Compute differences and count wins
-def compare_algorithms(df_greedy, df_random_greedy, df_nx_random):
-    merged = pd.merge(
-        pd.merge(
-            df_greedy, df_random_greedy,
-            on=["Vertices", "Edges"],
-            suffixes=("_greedy", "_random_greedy")
-        ),
-        df_nx_random,
-        on=["Vertices", "Edges"]
-    )
-    merged.rename(columns={"Chromatic Number": "Chromatic Number_nx_random"}, inplace=True)
-
-    results = {
-        "Greedy Wins": (
-            (merged["Chromatic Number_greedy"] < merged["Chromatic Number_random_greedy"]) &
-            (merged["Chromatic Number_greedy"] < merged["Chromatic Number_nx_random"])
-        ).sum(),
-        "Random Greedy Wins": (
-            (merged["Chromatic Number_random_greedy"] < merged["Chromatic Number_greedy"]) &
-            (merged["Chromatic Number_random_greedy"] < merged["Chromatic Number_nx_random"])
-        ).sum(),
-        "NetworkX Wins": (
-            (merged["Chromatic Number_nx_random"] < merged["Chromatic Number_greedy"]) &
-            (merged["Chromatic Number_nx_random"] < merged["Chromatic Number_random_greedy"])
-        ).sum(),
-        "Ties": (
-            (merged["Chromatic Number_greedy"] == merged["Chromatic Number_random_greedy"]) &
-            (merged["Chromatic Number_greedy"] == merged["Chromatic Number_nx_random"])
-        ).sum(),
+    ax.set_title(f"Execution Time Comparison among Greedy, Random Greedy, and NetworkX ({repo})")
+    ax.set_xlabel("Number of Vertices")
+    ax.set_ylabel("Execution Time (ms)")
+    ax.set_yscale("log")
+    ax.legend()
+
+    save(fig, f"plots/execution_times_{repo}.png")
+
+# Count wins (rows are already aligned by graph)
+def compare_algorithms(results):
+    greedy = results[("chromatic_number", "greedy")]
+    random_greedy = results[("chromatic_number", "random_greedy")]
+    nx_random = results[("chromatic_number", "nx_random_sequential")]
+
+    return {
+        "Greedy Wins": ((greedy < random_greedy) & (greedy < nx_random)).sum(),
+        "Random Greedy Wins": ((random_greedy < greedy) & (random_greedy < nx_random)).sum(),
+        "NetworkX Wins": ((nx_random < greedy) & (nx_random < random_greedy)).sum(),
+        "Ties": ((greedy == random_greedy) & (greedy == nx_random)).sum(),
     }
-    
-    return results
 
 # Main function
 if __name__ == "__main__":
     repos = ["facebook", "sw"]
+    store = open_store("results.db")
 
+    jobs = []
     for repo in repos:
-        # Replace with paths to your CSVs
-        greedy_csv = f"results_webgraphs/{repo}/greedy_results.csv"
-        random_greedy_csv = f"results_webgraphs/{repo}/random_greedy_results.csv"
-        nx_random_csv = f"results_webgraphs/{repo}/nx_random_sequential_results.csv"
-
-        df_greedy = load_and_process_csv(greedy_csv)
-        df_random_greedy = load_and_process_csv(random_greedy_csv)
-        df_nx_random = load_and_process_csv(nx_random_csv)
+        results = load_results(store, repo)
 
         # Compare the algorithms
-        results = compare_algorithms(df_greedy, df_random_greedy, df_nx_random)
-        
+        wins = compare_algorithms(results)
+
         # Print the results
         print(f"Comparison Results ({repo}):")
-        print(f"Greedy Wins: {results['Greedy Wins']}")
-        print(f"Random Greedy Wins: {results['Random Greedy Wins']}")
-        print(f"NetworkX Wins: {results['NetworkX Wins']}")
-        print(f"Ties: {results['Ties']}\n")
-
-        # Plot Chromatic Numbers
-        plot_chromatic_numbers(df_greedy, df_random_greedy, df_nx_random, repo)
-        
-        # Plot Execution Times
-        plot_execution_times(df_greedy, df_random_greedy, df_nx_random, repo)
+        print(f"Greedy Wins: {wins['Greedy Wins']}")
+        print(f"Random Greedy Wins: {wins['Random Greedy Wins']}")
+        print(f"NetworkX Wins: {wins['NetworkX Wins']}")
+        print(f"Ties: {wins['Ties']}\n")
+
+        # Chromatic numbers and execution times, drawn together below
+        jobs += [(plot_chromatic_numbers, results, repo), (plot_execution_times, results, repo)]
+
+    render(jobs)
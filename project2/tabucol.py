@@ -0,0 +1,112 @@
+import random
+import time
+import numpy as np
+from graph_utils import csr_degrees, csr_greedy_coloring
+
+# TABUCOL (local search, Hertz & de Werra): start from the greedy coloring with k colors and
+#   repeatedly look for a coloring with k - 1 colors, by minimizing the number of conflicting edges.
+#
+#   gamma[v, c] is the number of neighbors of v colored c, so moving v from its color to c changes
+#   the conflicts by gamma[v, c] - gamma[v, color[v]], read in O(1). Applying a move only updates the
+#   rows of v's neighbors. Moving v back to the color it left is tabu for a few iterations (tenure
+#   random(0..9) + 0.6 * conflicting vertices), unless the move beats the best conflict count so far.
+
+
+def tabucol_search(offsets, neighbors, colors, num_colors, rng, deadline, max_iterations, counts):
+    """
+    Look for a proper coloring with num_colors colors, starting from `colors` (changed in place).
+
+    :param counts: Dict with "basic_operations", "configurations_tested" and "iterations", updated.
+    :return: True if a proper coloring was found (in `colors`), False when the budget ran out.
+    """
+    n = len(colors)
+    rows = np.arange(n)
+    gamma = np.zeros((n, num_colors), dtype=np.int64)
+    sources = np.repeat(rows, np.diff(offsets))
+    np.add.at(gamma, (sources, colors[neighbors]), 1)
+
+    tabu = np.zeros((n, num_colors), dtype=np.int64)  # Iteration until which a (vertex, color) is tabu
+    conflicts = int(gamma[rows, colors].sum()) // 2
+    best_conflicts = conflicts
+
+    while conflicts > 0:
+        if counts["iterations"] >= max_iterations or (deadline is not None and time.perf_counter() > deadline):
+            return False
+        counts["iterations"] += 1
+        iteration = counts["iterations"]
+
+        # Candidate moves: every conflicting vertex to every other color
+        conflicting = np.flatnonzero(gamma[rows, colors] > 0)
+        own = gamma[conflicting, colors[conflicting]]
+        delta = gamma[conflicting] - own[:, None]
+        delta[np.arange(len(conflicting)), colors[conflicting]] = n * n  # Staying put isn't a move
+        counts["basic_operations"] += delta.size
+
+        allowed = (tabu[conflicting] <= iteration) | (conflicts + delta < best_conflicts)
+        delta = np.where(allowed, delta, n * n)
+        best_delta = delta.min()
+        if best_delta >= n * n:
+            continue  # Every move is tabu, wait for the tenures to expire
+
+        # Random move among the best ones
+        candidates = np.flatnonzero(delta.ravel() == best_delta)
+        choice = candidates[rng.integers(len(candidates))]
+        vertex = int(conflicting[choice // num_colors])
+        new_color = int(choice % num_colors)
+        old_color = int(colors[vertex])
+
+        adjacent = neighbors[offsets[vertex]:offsets[vertex + 1]]
+        gamma[adjacent, old_color] -= 1
+        gamma[adjacent, new_color] += 1
+        colors[vertex] = new_color
+        conflicts += int(best_delta)
+        best_conflicts = min(best_conflicts, conflicts)
+        counts["configurations_tested"] += 1
+
+        tabu[vertex, old_color] = iteration + int(rng.integers(10)) + int(0.6 * len(conflicting))
+
+    return True
+
+
+def tabucol_chromatic_number(csr, time_budget=2.0, max_iterations=100000, lower_bound=1, rng=None):
+    """
+    Chromatic number upper bound by TabuCol: greedy colors first, then one color less at a time until
+    the budget runs out or the lower bound is reached.
+
+    Each candidate move evaluated is a basic operation and each move made is a configuration.
+
+    :param time_budget: Seconds for the whole search (None for no time limit).
+    :param max_iterations: Moves (tabu search iterations) for the whole search.
+    :param lower_bound: Known lower bound (e.g. a clique size), the search stops when it is reached.
+    :param rng: NumPy Generator, by default seeded from the `random` module (so random.seed applies).
+    :return: (chromatic_number, basic_operations, configurations_tested, iterations)
+    """
+    n = len(csr.nodes)
+    if n == 0:
+        return 0, 0, 0, 0
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    offsets = csr.offsets
+    neighbors = csr.neighbors
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    counts = {"basic_operations": 0, "configurations_tested": 0, "iterations": 0}
+
+    best = csr_greedy_coloring(csr, np.argsort(-csr_degrees(csr), kind='stable')).astype(np.int64)
+    counts["basic_operations"] += int(best.sum())
+    counts["configurations_tested"] += n
+    num_colors = int(best.max()) + 1
+
+    lower_bound = max(lower_bound, 2 if len(neighbors) else 1)  # Any edge needs two colors
+    while num_colors > lower_bound:
+        # Drop the last color: its vertices take a random one of the others
+        colors = best.copy()
+        dropped = colors == num_colors - 1
+        colors[dropped] = rng.integers(num_colors - 1, size=int(dropped.sum()))
+
+        if not tabucol_search(offsets, neighbors, colors, num_colors - 1, rng, deadline, max_iterations, counts):
+            break
+        best = colors
+        num_colors -= 1
+
+    return num_colors, counts["basic_operations"], counts["configurations_tested"], counts["iterations"]